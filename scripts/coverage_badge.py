@@ -13,20 +13,25 @@ def main() -> int:
     output_dir = Path(".lisa")
     output_dir.mkdir(exist_ok=True)
     coverage_json = output_dir / "coverage.json"
+    pytest_log = output_dir / "coverage-pytest.log"
 
-    result = subprocess.run(
-        [
-            "python",
-            "-m",
-            "pytest",
-            "tests/",
-            "--cov",
-            f"--cov-report=json:{coverage_json}",
-            "-q",
-        ],
-        capture_output=True,
-        text=True,
-    )
+    # Stream pytest output to a log file rather than buffering it in memory
+    with open(pytest_log, "wb") as log:
+        result = subprocess.run(
+            [
+                "python",
+                "-m",
+                "pytest",
+                "tests/",
+                "--cov",
+                f"--cov-report=json:{coverage_json}",
+                "-q",
+            ],
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    if result.returncode != 0:
+        print(f"pytest exited with code {result.returncode}, see {pytest_log}")
 
     try:
         with open(coverage_json) as f:
@@ -1,23 +1,28 @@
 """OAuth PKCE browser login for Linear."""
 
+import atexit
 import base64
 import hashlib
+import hmac
+import http.client
 import json
 import os
 import secrets
+import threading
 import time
-import urllib.error
-import urllib.request
-import webbrowser
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from typing import Optional
-from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.parse import parse_qsl, urlencode
+
+from lisa.utils.connection import StaleConnectionError, https_connection, send_request
 
 # Linear OAuth app - public PKCE client, no secret needed
 CLIENT_ID = "6491511fa2aaf1debb7ed70af823f113"
 AUTH_URL = "https://linear.app/oauth/authorize"
 TOKEN_URL = "https://api.linear.app/oauth/token"
+TOKEN_HOST = "api.linear.app"
+TOKEN_PATH = "/oauth/token"
 REDIRECT_PORT = 19284
 REDIRECT_URI = f"http://localhost:{REDIRECT_PORT}/callback"
 SCOPES = "read,write"
@@ -26,117 +31,240 @@ CALLBACK_TIMEOUT = 120
 TOKEN_DIR = Path.home() / ".config" / "lisa"
 TOKEN_FILE = TOKEN_DIR / "auth.json"
 
+# Authorize URL query params that don't vary per login
+_STATIC_AUTH_PARAMS = urlencode(
+    {
+        "client_id": CLIENT_ID,
+        "redirect_uri": REDIRECT_URI,
+        "response_type": "code",
+        "scope": SCOPES,
+        "code_challenge_method": "S256",
+        "prompt": "consent",
+    }
+)
+
+_sha256 = hashlib.sha256
+
 # Refresh 5 minutes before expiry
 REFRESH_BUFFER = 300
 
+# Parsed token file cache: (path, (mtime_ns, size), tokens). Avoids re-reading
+# auth.json on every get_token() call; invalidated when the file changes.
+_token_cache: Optional[tuple[Path, tuple[int, int], dict]] = None
+_refresh_lock = threading.Lock()
+
 
 def _generate_pkce() -> tuple[str, str]:
     """Generate PKCE code verifier and challenge."""
-    verifier = secrets.token_urlsafe(64)
-    digest = hashlib.sha256(verifier.encode()).digest()
-    challenge = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+    # 32 random bytes -> 43-char verifier, the RFC 7636 minimum length
+    verifier = secrets.token_urlsafe(32)
+    digest = _sha256(verifier.encode("ascii")).digest()
+    # 32-byte digest encodes to 43 chars + one "=" pad; slice instead of rstrip
+    challenge = base64.urlsafe_b64encode(digest)[:43].decode("ascii")
     return verifier, challenge
 
 
 def _save_tokens(data: dict) -> None:
-    """Save tokens to disk with restricted permissions."""
+    """Save tokens to disk with restricted permissions.
+
+    Writes to a temp file and renames it over auth.json so concurrent readers
+    never observe a truncated or partially written file.
+    """
+    import tempfile
+
+    global _token_cache
     TOKEN_DIR.mkdir(parents=True, exist_ok=True)
-    fd = os.open(TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    # mkstemp creates a unique file with mode 0600, so concurrent savers never share it
+    fd, tmp = tempfile.mkstemp(dir=TOKEN_FILE.parent, prefix=".auth-", suffix=".tmp")
     try:
-        os.write(fd, json.dumps(data).encode())
-    finally:
-        os.close(fd)
+        try:
+            payload = json.dumps(data, separators=(",", ":")).encode()
+            while payload:
+                payload = payload[os.write(fd, payload) :]
+            st = os.fstat(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, TOKEN_FILE)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _token_cache = (TOKEN_FILE, (st.st_mtime_ns, st.st_size), data)
 
 
 def _load_tokens() -> Optional[dict]:
-    """Load tokens from disk."""
-    if not TOKEN_FILE.exists():
+    """Load tokens from disk, reusing the cached parse if the file is unchanged."""
+    global _token_cache
+    try:
+        st = TOKEN_FILE.stat()
+    except OSError:
+        _token_cache = None
         return None
+    key = (st.st_mtime_ns, st.st_size)
+    if _token_cache and _token_cache[0] == TOKEN_FILE and _token_cache[1] == key:
+        return _token_cache[2]
     try:
-        return json.loads(TOKEN_FILE.read_text())  # type: ignore[no-any-return]
+        tokens = json.loads(TOKEN_FILE.read_bytes())
     except (json.JSONDecodeError, OSError):
         return None
+    _token_cache = (TOKEN_FILE, key, tokens)
+    return tokens  # type: ignore[no-any-return]
+
+
+def _cached_valid_token() -> Optional[str]:
+    """Return the stored access token if it is not close to expiry.
+
+    Costs one stat: the parse is reused while the file's (path, mtime, size) match, so a
+    token rewritten by another lisa process or `lisa login` is picked up immediately.
+    """
+    tokens = _load_tokens()
+    if (
+        tokens
+        and tokens.get("access_token")
+        and time.time() < tokens.get("expires_at", 0) - REFRESH_BUFFER
+    ):
+        return tokens["access_token"]  # type: ignore[no-any-return]
+    return None
+
+
+# Keep-alive connection to the token endpoint, reused across exchange/refresh calls
+_conn: Optional[http.client.HTTPSConnection] = None
+_conn_lock = threading.Lock()
+
+
+def _close_connection() -> None:
+    """Close the pooled token endpoint connection, if open."""
+    global _conn
+    with _conn_lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+
+atexit.register(_close_connection)
+
+
+def _warm_connection() -> None:
+    """Open the token endpoint connection (TCP + TLS) if none is pooled yet."""
+    global _conn
+    with _conn_lock:
+        if _conn is not None:
+            return
+        conn = https_connection(TOKEN_HOST)
+        try:
+            conn.connect()
+        except OSError:
+            return  # Best effort; the real request will connect on its own
+        _conn = conn
+
+
+def _prewarm_connection() -> None:
+    """Warm the token endpoint connection in the background when LISA_PREWARM=1."""
+    if os.environ.get("LISA_PREWARM") != "1":
+        return
+    threading.Thread(target=_warm_connection, daemon=True).start()
+
+
+def _post_token_request(fields: dict) -> dict:
+    """POST form fields to the token endpoint and return the parsed JSON response.
+
+    Reuses a module-level keep-alive connection. If a previously opened connection had
+    already been dropped by the server, reconnects once; failures after the request may
+    have been processed (e.g. a timeout) are not retried, so a rotating refresh token is
+    never presented twice.
+    """
+    global _conn
+    body = urlencode(fields)
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    with _conn_lock:
+        while True:
+            reused = _conn is not None
+            if _conn is None:
+                _conn = https_connection(TOKEN_HOST)
+            try:
+                resp, payload = send_request(_conn, "POST", TOKEN_PATH, body, headers)
+            except StaleConnectionError:
+                _conn = None
+                if reused:
+                    continue  # Stale keep-alive connection, retry on a fresh one
+                raise
+            except (http.client.HTTPException, OSError):
+                _conn = None
+                raise
+            if resp.status >= 400:
+                raise http.client.HTTPException(f"HTTP {resp.status}: {resp.reason}")
+            return json.loads(payload)  # type: ignore[no-any-return]
 
 
 def _exchange_code(code: str, verifier: str) -> Optional[dict]:
     """Exchange authorization code for tokens."""
-    body = urlencode(
-        {
-            "grant_type": "authorization_code",
-            "client_id": CLIENT_ID,
-            "code": code,
-            "redirect_uri": REDIRECT_URI,
-            "code_verifier": verifier,
-        }
-    ).encode()
-
-    req = urllib.request.Request(
-        TOKEN_URL,
-        data=body,
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-    )
     try:
-        with urllib.request.urlopen(
-            req, timeout=30
-        ) as resp:  # nosemgrep: dynamic-urllib-use-detected
-            return json.loads(resp.read())  # type: ignore[no-any-return]
-    except (urllib.error.URLError, json.JSONDecodeError) as e:
+        return _post_token_request(
+            {
+                "grant_type": "authorization_code",
+                "client_id": CLIENT_ID,
+                "code": code,
+                "redirect_uri": REDIRECT_URI,
+                "code_verifier": verifier,
+            }
+        )
+    except (http.client.HTTPException, OSError, json.JSONDecodeError) as e:
         print(f"Token exchange failed: {e}")
         return None
 
 
 def _refresh_access_token(refresh_token: str) -> Optional[dict]:
     """Refresh an expired access token."""
-    body = urlencode(
-        {
-            "grant_type": "refresh_token",
-            "client_id": CLIENT_ID,
-            "refresh_token": refresh_token,
-        }
-    ).encode()
-
-    req = urllib.request.Request(
-        TOKEN_URL,
-        data=body,
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-    )
     try:
-        with urllib.request.urlopen(
-            req, timeout=30
-        ) as resp:  # nosemgrep: dynamic-urllib-use-detected
-            return json.loads(resp.read())  # type: ignore[no-any-return]
-    except (urllib.error.URLError, json.JSONDecodeError):
+        return _post_token_request(
+            {
+                "grant_type": "refresh_token",
+                "client_id": CLIENT_ID,
+                "refresh_token": refresh_token,
+            }
+        )
+    except (http.client.HTTPException, OSError, json.JSONDecodeError):
         return None
 
 
 class _CallbackHandler(BaseHTTPRequestHandler):
     """HTTP handler that captures the OAuth callback code."""
 
+    # Set TCP_NODELAY on the accepted socket so the response isn't held by Nagle
+    disable_nagle_algorithm = True
+
     auth_code: Optional[str] = None
     error_msg: Optional[str] = None
     expected_state: Optional[str] = None
 
     def do_GET(self) -> None:
-        parsed = urlparse(self.path)
-        if parsed.path != "/callback":
+        path, _, query = self.path.partition("?")
+        if path != "/callback":
             self.send_error(404)
             return
 
-        params = parse_qs(parsed.query)
+        params = dict(parse_qsl(query))
 
         if "error" in params:
-            _CallbackHandler.error_msg = params["error"][0]
+            _CallbackHandler.error_msg = params["error"]
             self._respond("Login failed. You can close this tab.")
             return
 
         # Verify state to prevent CSRF
-        state = params.get("state", [None])[0]
-        if state != _CallbackHandler.expected_state:
+        state = params.get("state")
+        expected = _CallbackHandler.expected_state
+        if (
+            state is None
+            or expected is None
+            or not hmac.compare_digest(state.encode(), expected.encode())
+        ):
             _CallbackHandler.error_msg = "State mismatch — possible CSRF"
             self._respond("Login failed. You can close this tab.")
             return
 
-        code = params.get("code", [None])[0]
+        code = params.get("code")
         if not code:
             _CallbackHandler.error_msg = "No authorization code received"
             self._respond("Login failed. You can close this tab.")
@@ -156,16 +284,23 @@ class _CallbackHandler(BaseHTTPRequestHandler):
         pass  # Suppress request logging
 
 
-def _run_callback_server(expected_state: str) -> Optional[str]:
-    """Start local server, wait for callback, return auth code."""
+def _run_callback_server(expected_state: str, auth_url: str) -> Optional[str]:
+    """Start local server, open the browser once it is listening, return auth code."""
+    import webbrowser  # only the interactive login needs it; keeps get_token() imports lean
+
     _CallbackHandler.auth_code = None
     _CallbackHandler.error_msg = None
     _CallbackHandler.expected_state = expected_state
 
+    # Bind and listen before launching the browser so the redirect can't race the server
     server = HTTPServer(("localhost", REDIRECT_PORT), _CallbackHandler)
     server.timeout = CALLBACK_TIMEOUT
-
-    server.handle_request()
+    try:
+        webbrowser.open(auth_url)
+        print(f"Waiting for authorization (timeout: {CALLBACK_TIMEOUT}s)...")
+        server.handle_request()
+    finally:
+        server.server_close()
 
     if _CallbackHandler.error_msg:
         print(f"OAuth error: {_CallbackHandler.error_msg}")
@@ -179,25 +314,14 @@ def run_login_flow() -> bool:
     verifier, challenge = _generate_pkce()
     state = secrets.token_urlsafe(32)
 
-    params = urlencode(
-        {
-            "client_id": CLIENT_ID,
-            "redirect_uri": REDIRECT_URI,
-            "response_type": "code",
-            "scope": SCOPES,
-            "code_challenge": challenge,
-            "code_challenge_method": "S256",
-            "state": state,
-            "prompt": "consent",
-        }
-    )
-    auth_url = f"{AUTH_URL}?{params}"
+    params = urlencode({"code_challenge": challenge, "state": state})
+    auth_url = f"{AUTH_URL}?{_STATIC_AUTH_PARAMS}&{params}"
 
-    print("Opening browser for Linear login...")
-    webbrowser.open(auth_url)
-    print("Waiting for authorization (timeout: 120s)...")
+    # Handshake with the token endpoint while the user authorizes in the browser
+    _prewarm_connection()
 
-    code = _run_callback_server(state)
+    print("Opening browser for Linear login...")
+    code = _run_callback_server(state, auth_url)
     if not code:
         return False
 
@@ -218,35 +342,44 @@ def run_login_flow() -> bool:
 
 def get_token() -> Optional[str]:
     """Get a valid access token, refreshing if needed. Returns None if unavailable."""
-    tokens = _load_tokens()
-    if not tokens or not tokens.get("access_token"):
-        return None
-
-    expires_at = tokens.get("expires_at", 0)
-    if time.time() < expires_at - REFRESH_BUFFER:
-        return tokens["access_token"]  # type: ignore[no-any-return]
-
-    # Token expired or expiring soon — try refresh
-    refresh = tokens.get("refresh_token")
-    if not refresh:
-        return None
-
-    new_data = _refresh_access_token(refresh)
-    if not new_data or "access_token" not in new_data:
-        print("Token expired and refresh failed. Run `lisa login` or set LINEAR_API_KEY.")
-        return None
-
-    _save_tokens(
-        {
-            "access_token": new_data["access_token"],
-            "refresh_token": new_data.get("refresh_token", refresh),
-            "expires_at": time.time() + new_data.get("expires_in", 36000),
-        }
-    )
-    return new_data["access_token"]  # type: ignore[no-any-return]
+    cached = _cached_valid_token()
+    if cached:
+        return cached
+
+    # Slow path is serialized so concurrent callers share a single refresh:
+    # waiters re-read the token file and pick up the freshly saved token.
+    with _refresh_lock:
+        tokens = _load_tokens()
+        if not tokens or not tokens.get("access_token"):
+            return None
+
+        expires_at = tokens.get("expires_at", 0)
+        if time.time() < expires_at - REFRESH_BUFFER:
+            return tokens["access_token"]  # type: ignore[no-any-return]
+
+        # Token expired or expiring soon — try refresh
+        refresh = tokens.get("refresh_token")
+        if not refresh:
+            return None
+
+        new_data = _refresh_access_token(refresh)
+        if not new_data or "access_token" not in new_data:
+            print("Token expired and refresh failed. Run `lisa login` or set LINEAR_API_KEY.")
+            return None
+
+        _save_tokens(
+            {
+                "access_token": new_data["access_token"],
+                "refresh_token": new_data.get("refresh_token", refresh),
+                "expires_at": time.time() + new_data.get("expires_in", 36000),
+            }
+        )
+        return new_data["access_token"]  # type: ignore[no-any-return]
 
 
 def clear_tokens() -> None:
     """Delete stored auth tokens."""
+    global _token_cache
+    _token_cache = None
     if TOKEN_FILE.exists():
         TOKEN_FILE.unlink()
@@ -2,156 +2,99 @@
 
 import argparse
 import atexit
+import functools
 import os
 import signal
 import subprocess
 import sys
 import time
-import uuid
-from importlib.metadata import version as get_version
 from pathlib import Path
-from typing import Optional
-
-try:
-    __version__ = get_version("lisa")
-except Exception:
-    __version__ = "dev"
-
-from lisa.clients.claude import token_tracker
-from lisa.clients.linear import fetch_ticket
-from lisa.constants import EFFORT_QUICK, resolve_effort
-from lisa.git.branch import (
-    create_or_get_branch,
-    determine_branch_name,
-    find_next_suffix,
-    get_base_slug,
-    get_current_branch,
-    get_default_branch,
-    list_branches_matching,
-)
-from lisa.git.commit import get_diff_summary
-from lisa.git.worktree import create_session_worktree, remove_worktree
-from lisa.models.core import Assumption, ExplorationFindings
-from lisa.models.state import RunConfig, WorkContext
-from lisa.phases.conclusion import print_conclusion, run_conclusion_phase
-from lisa.phases.planning import run_planning_phase, sort_by_dependencies
-from lisa.phases.verify import run_preflight, run_review_phase, run_setup
-from lisa.phases.work import process_ticket_work
-from lisa.state.comment import fetch_state, find_state_comment, save_state
-from lisa.state.git import fetch_git_state
-from lisa.ui.assumptions import edit_assumptions_curses
-from lisa.ui.output import (
-    BLUE,
-    GREEN,
-    NC,
-    YELLOW,
-    error,
-    error_with_conclusion,
-    hyperlink,
-    log,
-    success,
-    success_with_conclusion,
-    warn,
-)
-from lisa.ui.timer import LiveTimer
-from lisa.utils.debug import DEBUG_LOG
-from lisa.utils.formatting import fmt_cost, fmt_duration, fmt_tokens
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from lisa.models.state import RunConfig
 
 # Defaults
 DEFAULT_MAX_ITERATIONS = 30
 
+# Horizontal rules for the review report and multi-ticket banners
+_REVIEW_BAR = "━" * 50
+_TICKET_BAR = "═" * 60
+
+# Plan step status icons for dry-run output
+_DONE_ICON = "✓"
+_TODO_ICON = "○"
+
+# Subcommands dispatched in main() before argparse runs
+SUBCOMMANDS = ("login", "logout", "init", "upgrade")
+
+
+def _sniff_mode(argv: list[str]) -> str:
+    """Classify the invocation from argv[1] without building a parser.
+
+    Returns a subcommand name, "version", or "ticket" for everything argparse should
+    handle (including -h/--help, which exits before any lisa packages are imported).
+    """
+    arg = argv[1] if len(argv) > 1 else ""
+    if arg in SUBCOMMANDS:
+        return arg
+    if arg in ("-v", "--version"):
+        return "version"
+    return "ticket"
+
+
+@functools.lru_cache(maxsize=1)
+def _get_version() -> str:
+    """Installed lisa version, resolved on first use (scans dist-info metadata)."""
+    from importlib.metadata import version
+
+    try:
+        return version("lisa")
+    except Exception:
+        return "dev"
+
+
+class _VersionAction(argparse.Action):
+    """Like argparse's version action, but looks the version up only when triggered."""
+
+    def __init__(self, option_strings: list[str], dest: str = argparse.SUPPRESS, **kwargs):
+        kwargs.setdefault("help", "show program's version number and exit")
+        super().__init__(option_strings, dest, default=argparse.SUPPRESS, nargs=0, **kwargs)
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: object,
+        option_string: Optional[str] = None,
+    ) -> None:
+        print(f"{parser.prog} {_get_version()}")
+        parser.exit()
+
+
+def _ticket_help_epilog() -> str:
+    """Read the ticket-mode help epilog shipped alongside the package."""
+    import importlib.resources
 
-def parse_args() -> RunConfig:
-    parser = argparse.ArgumentParser(
+    return "\n" + importlib.resources.files("lisa").joinpath("cli_epilog.txt").read_text()
+
+
+class _TicketParser(argparse.ArgumentParser):
+    """ArgumentParser that only loads its long epilog when help is actually rendered."""
+
+    def format_help(self) -> str:
+        if self.epilog is None:
+            self.epilog = _ticket_help_epilog()
+        return super().format_help()
+
+
+def _build_ticket_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for ticket mode (the only mode that uses argparse)."""
+    from lisa.utils.debug import DEBUG_LOG
+
+    parser = _TicketParser(
         prog="lisa",
         description="Lisa - Looping Implementor Saving Assumptions. Autonomous AI loop driven by Linear tickets.",
-        epilog="""
-Commands:
-  lisa init                         Set up .lisa/ config for this project
-  lisa login                        Authenticate with Linear (OAuth)
-  lisa logout                       Clear stored Linear tokens
-  lisa upgrade                      Upgrade to latest release
-  lisa upgrade --main               Upgrade to latest main snapshot
-  lisa upgrade <version>            Pin to specific version (e.g. 0.4.1)
-
-Examples:
-  %(prog)s ENG-123                    Run with project permissions
-  %(prog)s ENG-123 -n 50              Run 50 iterations
-  %(prog)s ENG-123 --effort medium     Cap effort level (reduce work per session)
-  %(prog)s ENG-123 --skip-plan        Skip planning, use subtasks directly
-  %(prog)s ENG-123 --push             Enable push after each commit
-  %(prog)s ENG-123 --dry-run          Show ticket status without executing
-  %(prog)s ENG-123 --fallback-tools   Use explicit tool allowlist
-  %(prog)s ENG-123 --yolo              Skip all permission checks (unsafe)
-  %(prog)s ENG-123 --skip-verify      Skip test and review phases
-
-How it works:
-  1. Fetches the Linear ticket, subtasks, and blocking relations
-  2. Creates/checks out branch (reuses slug from existing branches)
-  3. Loads state from comment on ticket (🤖 lisa · {branch})
-  4. PLANNING PHASE: Claude analyzes ticket and creates granular step checklist
-  5. Picks the first incomplete step from the plan
-  6. Runs Claude Code to work on that step (effort controlled by --effort)
-  7. When step done: runs tests, code review, fix loop (unless --skip-verify)
-  8. Commits with: type(lisa): [ENG-456] step N - description
-  9. Updates state comment on ticket (checkboxes for each step)
-  10. Repeats until max iterations reached
-
-Planning phase:
-  - Claude reads codebase and creates 5-20 granular steps
-  - Steps are smaller than subtasks (5-15 min each)
-  - Plan is stored in Linear comment with checkboxes
-  - Use --skip-plan to bypass and use subtasks directly
-
-Context management:
-  - --effort low/medium/high controls Claude's work intensity (default: high)
-  - Lower effort = faster but less thorough sessions
-  - Each phase has a default effort that gets capped by the user flag
-
-Verification (after step done):
-  1. TEST: runs configured test commands (see prompts.yaml)
-     - If tests fail, Claude tries to fix and re-test (max 2 attempts)
-  2. REVIEW: checks conventions, security, test quality
-  3. FIX: if review finds issues, fixes and re-tests (max 2 attempts)
-     - After review fixes, tests are re-run with their own fix loop
-  4. COMMIT: only commits if tests pass
-  Use --skip-verify to bypass verification phases
-
-Branch handling:
-  - On ticket branch (eng-123-*): stays on current branch
-  - Not on ticket branch: creates new incremental branch
-  - Example: eng-123-foo exists -> creates eng-123-foo-2
-
-State tracking:
-  - Each branch has its own comment on the ticket
-  - Comment shows plan with checkboxes and progress
-  - Resumes from saved iteration count when re-running
-
-Backwards compatibility:
-  - Reads both Lisa-* and Tralph-* git trailers
-  - Reads both lisa and tralph comment headers
-  - Writes Lisa-* trailers and lisa headers for new state
-
-Safety:
-  - Uses project .claude/settings.json permissions by default
-  - Use --fallback-tools for explicit allowlist if project not configured
-  - Use --yolo to disable all checks (unsafe)
-  - No push by default (use --push to enable)
-
-Linear API:
-  - Run `lisa login` for browser-based OAuth (recommended)
-  - Or set LINEAR_API_KEY env var for API key auth
-  - Run `lisa logout` to clear stored OAuth tokens
-
-Completion signals (Claude outputs JSON with structured schema):
-  {"step_done": N, ...}              Step N complete, move to next step
-  {"blocked": "reason", ...}         Cannot proceed, exit loop with error
-
-Tips:
-  - Create subtasks on your Linear ticket as a checklist
-  - Run in tmux/screen for long-running sessions
-  - Check the lisa comment on your ticket for plan progress
-        """,
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     parser.add_argument(
@@ -198,8 +141,7 @@ Tips:
     parser.add_argument(
         "-v",
         "--version",
-        action="version",
-        version=f"%(prog)s {__version__}",
+        action=_VersionAction,
     )
     parser.add_argument(
         "--verbose",
@@ -267,7 +209,13 @@ Tips:
         action="store_true",
         help="Use git-spice for stacked branches (requires gs)",
     )
-    args = parser.parse_args()
+    return parser
+
+
+def parse_args() -> "RunConfig":
+    from lisa.models.state import RunConfig
+
+    args = _build_ticket_parser().parse_args()
     return RunConfig(
         ticket_ids=args.tickets,
         max_iterations=args.max_iterations,
@@ -296,11 +244,14 @@ def validate_env() -> None:
     if os.environ.get("LINEAR_API_KEY"):
         return
 
-    from lisa.auth import get_token, run_login_flow
+    from lisa.auth import get_token
 
     if get_token():
         return
 
+    from lisa.auth import run_login_flow
+    from lisa.ui.output import error, log, success
+
     # No auth available — prompt user
     log("No Linear authentication found.")
     log("Options: set LINEAR_API_KEY env var or login via browser.")
@@ -321,9 +272,11 @@ def validate_env() -> None:
     sys.exit(1)
 
 
-def log_config(config: RunConfig) -> None:
+def log_config(config: "RunConfig") -> None:
     """Log configuration status."""
-    from lisa.config import get_config, get_config_loaded_sources, get_loaded_sources, get_prompts
+    from lisa.config import get_config_loaded_sources, get_loaded_sources
+    from lisa.ui.output import NC, YELLOW, log, warn
+    from lisa.utils.debug import DEBUG_LOG
 
     if len(config.ticket_ids) > 1:
         ticket_chain = " → ".join(config.ticket_ids)
@@ -332,12 +285,14 @@ def log_config(config: RunConfig) -> None:
         log(f"Starting Lisa for {YELLOW}{config.ticket_ids[0]}{NC}")
     log(f"Max iterations: {config.max_iterations}, effort: {config.effort}, model: {config.model}")
 
-    # Trigger loading so sources are populated
-    get_prompts()
-    get_config()
-    prompt_overrides = [s for s in get_loaded_sources() if s != "defaults"]
-    config_overrides = [s for s in get_config_loaded_sources() if s != "defaults"]
-    all_overrides = list(dict.fromkeys(prompt_overrides + config_overrides))  # dedupe, keep order
+    # Source accessors load (and cache) prompts/config on first access
+    all_overrides: list[str] = []
+    seen = {"defaults"}
+    for sources in (get_loaded_sources(), get_config_loaded_sources()):
+        for source in sources:
+            if source not in seen:
+                seen.add(source)
+                all_overrides.append(source)
     if all_overrides:
         log(f"Config overrides: {', '.join(all_overrides)}")
 
@@ -371,32 +326,44 @@ def show_dry_run_status(
     state_iteration: int,
 ) -> None:
     """Display dry-run status and exit."""
-    from lisa.ui.output import RED
+    from lisa.git.branch import get_current_branch, list_branches_matching
+    from lisa.ui.output import GREEN, NC, RED, YELLOW
 
     title = ticket.get("title", "Unknown")
     description = ticket.get("description", "")
     prefix = ticket_id.lower()
     existing_branches = list_branches_matching(f"{prefix}-*")
 
-    print(f"\n{GREEN}Ticket:{NC} {title}")
     desc_display = f"{description[:200]}..." if len(description) > 200 else description
-    print(f"{GREEN}Description:{NC} {desc_display}")
-    print(f"\n{GREEN}Existing branches:{NC} {existing_branches or 'None'}")
-    print(f"{GREEN}Current branch:{NC} {get_current_branch() or 'N/A'}")
-    print(f"{GREEN}State iteration:{NC} {state_iteration}")
-
-    done_count = sum(1 for s in plan_steps if s.get("done"))
-    print(f"{GREEN}Progress:{NC} {done_count}/{len(plan_steps)} steps done")
-    print(f"\n{GREEN}Plan steps:{NC}")
-
+    out = [
+        f"\n{GREEN}Ticket:{NC} {title}",
+        f"{GREEN}Description:{NC} {desc_display}",
+        f"\n{GREEN}Existing branches:{NC} {existing_branches or 'None'}",
+        f"{GREEN}Current branch:{NC} {get_current_branch() or 'N/A'}",
+        f"{GREEN}State iteration:{NC} {state_iteration}",
+    ]
+
+    op_colors = {"create": GREEN, "modify": YELLOW, "delete": RED}
+
+    # Single pass: count progress, collect incomplete steps and render step lines
+    done_count = 0
+    incomplete = []
+    step_lines = []
     for step in plan_steps:
-        status = "✓" if step.get("done") else "○"
-        marker = " ← current" if step["id"] == current_step else ""
-        ticket_str = f" ({step.get('ticket', '')})" if step.get("ticket") else ""
-        print(f"  {status} {step['id']}{ticket_str}: {step['description']}{marker}")
-        for f in step.get("files", []):
-            op_colors = {"create": GREEN, "modify": YELLOW, "delete": RED}
-            color = op_colors.get(f["op"], "")
+        step_id = step["id"]
+        done = step.get("done")
+        if done:
+            done_count += 1
+        else:
+            incomplete.append(step)
+        status = _DONE_ICON if done else _TODO_ICON
+        marker = " ← current" if step_id == current_step else ""
+        step_ticket = step.get("ticket")
+        ticket_str = f" ({step_ticket})" if step_ticket else ""
+        step_lines.append(f"  {status} {step_id}{ticket_str}: {step['description']}{marker}")
+        for f in step.get("files", ()):
+            op = f["op"]
+            color = op_colors.get(op, "")
             parts = []
             if f.get("template"):
                 parts.append(f"template: {f['template']}")
@@ -404,36 +371,98 @@ def show_dry_run_status(
                 parts.append(f"detail: {f['detail']}")
             extra = ", ".join(parts)
             suffix = f" ({extra})" if extra else ""
-            print(f"      {color}{f['op']}{NC}: {f['path']}{suffix}")
+            step_lines.append(f"      {color}{op}{NC}: {f['path']}{suffix}")
 
-    incomplete = [s for s in plan_steps if not s.get("done")]
     next_step = incomplete[0] if incomplete else None
-    print(f"\n{GREEN}Next step:{NC} {next_step['description'] if next_step else 'All done!'}")
-    print(f"{GREEN}Remaining:{NC} {len(incomplete)} steps")
+    out.append(f"{GREEN}Progress:{NC} {done_count}/{len(plan_steps)} steps done")
+    out.append(f"\n{GREEN}Plan steps:{NC}")
+    out.extend(step_lines)
+    out.append(f"\n{GREEN}Next step:{NC} {next_step['description'] if next_step else 'All done!'}")
+    out.append(f"{GREEN}Remaining:{NC} {len(incomplete)} steps")
+    # One write for the whole report instead of a locked, flushed print per line
+    sys.stdout.write("\n".join(out) + "\n")
     sys.exit(0)
 
 
 def print_review_report(result: dict) -> None:
     """Print structured review report to stdout."""
-    from lisa.ui.output import RED
+    from lisa.ui.output import BLUE, GREEN, NC, RED
 
     status = f"{GREEN}APPROVED{NC}" if result["approved"] else f"{RED}NEEDS_FIXES{NC}"
-    print(f"\n{BLUE}{'━' * 50}{NC}")
-    print(f"Review: {status}")
-    print(f"{BLUE}{'━' * 50}{NC}")
+    out = [f"\n{BLUE}{_REVIEW_BAR}{NC}", f"Review: {status}", f"{BLUE}{_REVIEW_BAR}{NC}"]
 
     if result.get("findings"):
-        print("\nFindings:")
+        out.append("\nFindings:")
         for f in result["findings"]:
             icon = "✓" if f["status"] == "pass" else "✗" if f["status"] == "issue" else "~"
-            print(f"  {icon} [{f['category']}] {f['detail']}")
+            out.append(f"  {icon} [{f['category']}] {f['detail']}")
+
+    out.append(f"\nSummary: {result.get('summary', 'n/a')}")
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+def _start_update_check() -> Callable[..., None]:
+    """Run the release check in a daemon thread so its network call overlaps startup work.
 
-    print(f"\nSummary: {result.get('summary', 'n/a')}")
+    Returns a callable that waits up to timeout seconds for the result and warns if an
+    update exists. It warns at most once, so a check still running after the first call
+    can be polled again later (e.g. at session end); if the thread never finishes, the
+    warning is dropped rather than delaying exit.
+    """
+    import threading
+
+    from lisa.ui.output import warn
+
+    current_version = _get_version()
+    latest: list[str] = []
+    reported = False
+
+    def check() -> None:
+        try:
+            from lisa.update import check_for_update
+
+            found = check_for_update(current_version)
+        except Exception:
+            return
+        if found:
+            latest.append(found)
+
+    thread = threading.Thread(target=check, daemon=True)
+    thread.start()
+
+    def report(timeout: float = 1.0) -> None:
+        nonlocal reported
+        thread.join(timeout=timeout)
+        if latest and not reported:
+            reported = True
+            warn(f"Update available: {current_version} -> {latest[0]}  (run: lisa upgrade)")
+
+    return report
+
+
+def _rename_preflight_branch(preflight_branch: str, branch_name: str) -> bool:
+    """Turn the temp preflight branch into the ticket branch with a single `git branch -M`.
+
+    Gives the same result as checkout -B + branch -D while still on the preflight branch.
+    Returns False if the rename fails (e.g. the preflight branch is gone, or branch_name is
+    checked out in another worktree); the caller then falls back to checkout -B.
+    """
+    result = subprocess.run(
+        ["git", "branch", "-M", preflight_branch, branch_name], capture_output=True, text=True
+    )
+    return result.returncode == 0
 
 
 def main() -> None:
-    # Handle login/logout before argparse (which expects positional ticket IDs)
-    if len(sys.argv) > 1 and sys.argv[1] == "login":
+    mode = _sniff_mode(sys.argv)
+
+    # Answer --version without building the parser or importing lisa packages
+    if mode == "version":
+        print(f"lisa {_get_version()}")
+        sys.exit(0)
+
+    # Handle subcommands before argparse (which expects positional ticket IDs)
+    if mode == "login":
         from lisa.auth import run_login_flow
 
         if run_login_flow():
@@ -443,21 +472,21 @@ def main() -> None:
             sys.exit(1)
         sys.exit(0)
 
-    if len(sys.argv) > 1 and sys.argv[1] == "logout":
+    if mode == "logout":
         from lisa.auth import clear_tokens
 
         clear_tokens()
         print("Logged out. Stored tokens cleared.")
         sys.exit(0)
 
-    if len(sys.argv) > 1 and sys.argv[1] == "init":
+    if mode == "init":
         from lisa.init import run_init
 
         yes = "--yes" in sys.argv or "-y" in sys.argv
         run_init(yes=yes)
         sys.exit(0)
 
-    if len(sys.argv) > 1 and sys.argv[1] == "upgrade":
+    if mode == "upgrade":
         from lisa.update import run_upgrade
 
         main = "--main" in sys.argv or "-m" in sys.argv
@@ -471,20 +500,56 @@ def main() -> None:
         sys.exit(0)
 
     config = parse_args()
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from lisa.clients.claude import token_tracker
+    from lisa.clients.linear import fetch_tickets
+    from lisa.constants import EFFORT_QUICK, resolve_effort
+    from lisa.git.branch import (
+        create_or_get_branch,
+        determine_branch_name,
+        get_base_slug,
+        get_current_branch,
+        get_default_branch,
+        invalidate_branch_cache,
+        scan_ticket_branches,
+    )
+    from lisa.git.commit import get_diff_summary
+    from lisa.git.worktree import create_session_worktree, remove_worktree
+    from lisa.models.core import Assumption, ExplorationFindings
+    from lisa.models.state import WorkContext
+    from lisa.phases.conclusion import print_conclusion, run_conclusion_phase
+    from lisa.phases.planning import run_planning_phase, sort_by_dependencies
+    from lisa.phases.verify import run_preflight, run_review_phase, run_setup
+    from lisa.phases.work import process_ticket_work
+    from lisa.state.comment import fetch_state, find_state_comment, save_state
+    from lisa.state.git import fetch_git_state
+    from lisa.ui.assumptions import edit_assumptions_curses
+    from lisa.ui.output import (
+        BLUE,
+        NC,
+        YELLOW,
+        error,
+        error_with_conclusion,
+        hyperlink,
+        log,
+        success,
+        success_with_conclusion,
+        warn,
+    )
+    from lisa.ui.timer import LiveTimer
+    from lisa.utils.formatting import fmt_cost, fmt_duration, fmt_tokens
+
     validate_env()
     log_config(config)
 
-    if not Path(".lisa/config.yaml").exists():
+    # Read-only modes don't need project config, so skip the check for them
+    read_only = config.dry_run or config.review_only or config.conclusion
+    if not read_only and not Path(".lisa/config.yaml").exists():
         warn("No .lisa/config.yaml found. Run `lisa init` to configure this project.")
 
-    try:
-        from lisa.update import check_for_update
-
-        latest = check_for_update(__version__)
-        if latest:
-            warn(f"Update available: {__version__} -> {latest}  (run: lisa upgrade)")
-    except Exception:
-        pass
+    report_update = _start_update_check()
 
     if config.spice:
         import shutil
@@ -537,13 +602,15 @@ def main() -> None:
         sys.exit(128 + sig)
 
     if config.worktree and not config.dry_run:
+        import secrets
+
         if config.spice:
             base_branch = get_default_branch()
             if not base_branch:
                 error("Could not determine default branch for spice mode")
                 sys.exit(1)
 
-        session_name = "_".join(config.ticket_ids) + "_" + uuid.uuid4().hex[:8]
+        session_name = "_".join(config.ticket_ids) + "_" + secrets.token_hex(4)
         session_worktree_path = create_session_worktree(session_name)
         if not session_worktree_path:
             error("Failed to create session worktree")
@@ -555,24 +622,27 @@ def main() -> None:
         signal.signal(signal.SIGTERM, session_signal_handler)
 
         # Create temp branch (detached HEAD causes issues for some test suites)
-        preflight_branch = f"lisa-preflight-{uuid.uuid4().hex[:8]}"
+        preflight_branch = f"lisa-preflight-{secrets.token_hex(4)}"
         checkout = subprocess.run(
             ["git", "checkout", "-b", preflight_branch], capture_output=True, text=True
         )
         if checkout.returncode == 0:
             session_preflight_branch = preflight_branch
+            invalidate_branch_cache()
 
-        # Setup: install deps in fresh worktree
-        with LiveTimer("Setting up work...", total_start, print_final=False):
+        # Setup (install deps in fresh worktree) and preflight (verify codebase is clean)
+        # share one live timer, relabelled between phases
+        preflight_success = True
+        with LiveTimer("Setting up work...", total_start, print_final=False) as timer:
             setup_success = run_setup()
+            if setup_success and config.preflight:
+                timer.set_label("Running preflight checks...")
+                preflight_success = run_preflight()
         if not setup_success:
             error("Setup failed - cannot continue")
             sys.exit(1)
 
-        # Preflight: verify codebase is clean
         if config.preflight:
-            with LiveTimer("Running preflight checks...", total_start, print_final=False):
-                preflight_success = run_preflight()
             if not preflight_success:
                 error("Preflight failed - fix issues before running lisa")
                 sys.exit(1)
@@ -588,17 +658,24 @@ def main() -> None:
                 sys.exit(1)
             success("Preflight passed")
 
+    # Fetch all tickets up front in a single Linear request
+    label = "Fetching tickets..." if num_tickets > 1 else "Fetching ticket..."
+    with LiveTimer(label, total_start, print_final=False):
+        # Plain dry-run never reads Linear state or URLs, so a narrower selection suffices
+        light = config.dry_run and not (config.review_only or config.conclusion)
+        tickets = fetch_tickets(config.ticket_ids, verbose=config.verbose, light=light)
+    report_update()
+
     # Process tickets serially
     prev_ticket_branch = None
     for ticket_idx, ticket_id in enumerate(config.ticket_ids, 1):
         if num_tickets > 1:
-            print(f"\n{BLUE}{'═' * 60}{NC}")
+            print(f"\n{BLUE}{_TICKET_BAR}{NC}")
             log(f"Starting ticket {ticket_idx}/{num_tickets}: {YELLOW}{ticket_id}{NC}")
-            print(f"{BLUE}{'═' * 60}{NC}")
+            print(f"{BLUE}{_TICKET_BAR}{NC}")
 
-        # 1. Fetch ticket
-        with LiveTimer("Fetching ticket...", total_start, print_final=False):
-            ticket = fetch_ticket(ticket_id, verbose=config.verbose)
+        # 1. Look up ticket (all tickets are fetched in one request before the loop)
+        ticket = tickets.get(ticket_id)
         if not ticket:
             error("Failed to fetch ticket")
             sys.exit(1)
@@ -702,11 +779,11 @@ def main() -> None:
                         ticket_id, title, description
                     )
                     if on_ticket_branch:
+                        # Already on a ticket branch: start the next increment of its base
                         prefix = ticket_id.lower()
-                        existing = list_branches_matching(f"{prefix}-*")
                         base = get_base_slug(branch_name, prefix)
-                        suffix = find_next_suffix(existing, base)
-                        branch_name = f"{base}-{suffix}"
+                        scan = scan_ticket_branches(prefix, base)
+                        branch_name = f"{base}-{(scan[1] if scan else 1) + 1}"
                         log(f"Creating branch {branch_name}")
 
                     # Create branch and checkout in worktree
@@ -721,6 +798,12 @@ def main() -> None:
                             sys.exit(1)
                         success(f"Created spice branch {branch_name}")
                         prev_ticket_branch = branch_name
+                    elif session_preflight_branch and _rename_preflight_branch(
+                        session_preflight_branch, branch_name
+                    ):
+                        session_preflight_branch = None
+                        success(f"Checked out branch {branch_name}")
+                        prev_ticket_branch = branch_name
                     else:
                         checkout = subprocess.run(
                             ["git", "checkout", "-B", branch_name], capture_output=True, text=True
@@ -748,6 +831,10 @@ def main() -> None:
             )
             session_preflight_branch = None
 
+        # Branches were created/renamed above; the next ticket must see the new list
+        if not config.dry_run:
+            invalidate_branch_cache()
+
         # 3. Fetch or initialize state
         state_iteration = 0
         comment_id: Optional[str] = None
@@ -758,11 +845,16 @@ def main() -> None:
         last_review_issues: Optional[str] = None  # Track review issues between iterations
 
         if branch_name and issue_uuid:
-            with LiveTimer("Fetching state...", total_start, print_final=False):
-                # Fetch plan state from Linear comment
-                state = fetch_state(issue_uuid, branch_name)
-                # Fetch test/review state from last commit
-                git_state = fetch_git_state(branch_name)
+            with (
+                LiveTimer("Fetching state...", total_start, print_final=False),
+                ThreadPoolExecutor(max_workers=2) as executor,
+            ):
+                # Plan state from Linear comment and test/review state from last
+                # commit are independent; fetch them concurrently
+                state_future = executor.submit(fetch_state, issue_uuid, branch_name)
+                git_state_future = executor.submit(fetch_git_state, branch_name)
+                state = state_future.result()
+                git_state = git_state_future.result()
 
             if state:
                 state_iteration = state.get("iterations", 0)
@@ -923,6 +1015,9 @@ def main() -> None:
         else:
             success("Stack submitted")
 
+    # Pick up an update check that was still in flight after the ticket fetch
+    report_update(timeout=0)
+
     # Report results
     if failed_tickets:
         if len(failed_tickets) < num_tickets:
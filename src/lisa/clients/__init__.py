@@ -3,7 +3,9 @@
 from lisa.clients.claude import TokenTracker, claude, token_tracker, work_claude
 from lisa.clients.linear import (
     fetch_subtask_details,
+    fetch_subtask_details_many,
     fetch_ticket,
+    fetch_tickets,
     linear_api,
 )
 
@@ -11,7 +13,9 @@ __all__ = [
     # Linear
     "linear_api",
     "fetch_ticket",
+    "fetch_tickets",
     "fetch_subtask_details",
+    "fetch_subtask_details_many",
     # Claude
     "claude",
     "work_claude",
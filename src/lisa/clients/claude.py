@@ -1,8 +1,12 @@
 """Claude CLI client wrapper."""
 
+import functools
 import json
 import os
+import shutil
 import subprocess
+import threading
+from collections import deque
 from typing import Optional
 
 from lisa.models.results import TokenUsage
@@ -15,35 +19,96 @@ DEFAULT_FALLBACK_TOOLS = (
 )
 
 
+# (config dict it was read from, stripped fallback tools); reload_config swaps the dict
+_fallback_tools: tuple[Optional[dict], str] = (None, DEFAULT_FALLBACK_TOOLS)
+
+
 def get_fallback_tools() -> str:
-    """Get fallback tools from config or use default."""
+    """Get fallback tools from config or use default (recomputed only when the config changes)."""
+    global _fallback_tools
     try:
         from lisa.config.settings import get_config
 
         config = get_config()
-        return config.get("fallback_tools", DEFAULT_FALLBACK_TOOLS).strip()  # type: ignore[no-any-return]
+        source, tools = _fallback_tools
+        if source is not config:
+            tools = config.get("fallback_tools", DEFAULT_FALLBACK_TOOLS).strip()
+            _fallback_tools = (config, tools)
+        return tools
     except Exception:
         return DEFAULT_FALLBACK_TOOLS
 
 
 class TokenTracker:
-    """Track token usage across iterations."""
+    """Track token usage across iterations.
+
+    add() only queues the usage; totals are summed when iteration/total are read,
+    so concurrent claude() calls never contend on the lock.
+    """
+
+    __slots__ = ("_iteration", "_total", "_pending", "_lock")
 
     def __init__(self):
-        self.iteration = TokenUsage()
-        self.total = TokenUsage()
+        self._iteration = TokenUsage()
+        self._total = TokenUsage()
+        self._pending: deque[TokenUsage] = deque()  # append/popleft are thread-safe
+        self._lock = threading.Lock()
+
+    @property
+    def iteration(self) -> TokenUsage:
+        self.flush()
+        return self._iteration
+
+    @property
+    def total(self) -> TokenUsage:
+        self.flush()
+        return self._total
 
     def add(self, usage: TokenUsage) -> None:
-        self.iteration = self.iteration + usage
-        self.total = self.total + usage
+        self._pending.append(usage)
+
+    def flush(self) -> None:
+        """Fold queued usage into the iteration and session totals."""
+        if not self._pending:
+            return
+        batch = TokenUsage()
+        try:
+            while True:
+                batch += self._pending.popleft()
+        except IndexError:
+            pass
+        with self._lock:
+            self._iteration += batch
+            self._total += batch
 
     def reset_iteration(self) -> None:
-        self.iteration = TokenUsage()
+        self.flush()
+        with self._lock:
+            self._iteration = TokenUsage()
 
 
 # Global token tracker instance
 token_tracker = TokenTracker()
 
+# Compact --json-schema argument per schema dict. Schemas come from the cached
+# get_schemas() mapping, so the same few dicts are encoded once per session. The dict
+# itself is kept in the value so its id() can't be reused by another object.
+_schema_args: dict[int, tuple[dict, str]] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _claude_executable() -> Optional[str]:
+    """Resolve the claude CLI on PATH once, instead of on every spawn."""
+    return shutil.which("claude")
+
+
+def _schema_arg(json_schema: dict) -> str:
+    cached = _schema_args.get(id(json_schema))
+    if cached is None or cached[0] is not json_schema:
+        cached = (json_schema, json.dumps(json_schema, separators=(",", ":")))
+        _schema_args[id(json_schema)] = cached
+    return cached[1]
+
 
 def claude(
     prompt: str,
@@ -67,23 +132,31 @@ def claude(
     if effort:
         cmd.extend(["--effort", effort])
     if json_schema:
-        cmd.extend(["--json-schema", json.dumps(json_schema)])
+        cmd.extend(["--json-schema", _schema_arg(json_schema)])
 
     env = {**os.environ, "LISA_SESSION": "1"}
-    result = subprocess.run(cmd, input=prompt, capture_output=True, text=True, env=env)
+    # Binary pipes: encode the prompt once and hand stdout bytes straight to json.loads,
+    # skipping the text-mode codec wrappers. stderr is only decoded when it is logged.
+    result = subprocess.run(
+        cmd,
+        input=prompt.encode("utf-8", "replace"),
+        capture_output=True,
+        env=env,
+        executable=_claude_executable(),
+    )
 
     if result.returncode != 0:
         error(f"Claude CLI exited with code {result.returncode}")
         if result.stderr:
-            error(f"stderr: {result.stderr[:500]}")
+            error(f"stderr: {result.stderr[:500].decode('utf-8', 'replace')}")
 
     if verbose and result.stderr:
-        warn(f"Claude stderr: {result.stderr[:200]}")
+        warn(f"Claude stderr: {result.stderr[:200].decode('utf-8', 'replace')}")
 
-    output = result.stdout
+    output: bytes = result.stdout
 
     # Always parse JSON wrapper to extract usage and result
-    if output.strip():
+    if output and not output.isspace():  # isspace() avoids copying the output like strip()
         try:
             wrapper = json.loads(output)
             if isinstance(wrapper, dict):
@@ -103,15 +176,20 @@ def claude(
                 # Return structured_output if json_schema was used
                 if json_schema and "structured_output" in wrapper:
                     structured = wrapper["structured_output"]
-                    return json.dumps(structured) if isinstance(structured, dict) else structured
+                    if isinstance(structured, dict):
+                        # Drop the raw response and the rest of the wrapper before
+                        # re-encoding, so only one copy of a large payload is alive
+                        del result, output, wrapper
+                        return json.dumps(structured, separators=(",", ":"))
+                    return structured  # type: ignore[no-any-return]
 
                 # Return result field (text output)
                 if "result" in wrapper:
                     return wrapper["result"]  # type: ignore[no-any-return]
-        except json.JSONDecodeError:
+        except ValueError:  # JSONDecodeError, or bytes that aren't valid UTF-8
             warn("JSON output extraction failed, using raw output")
 
-    return output
+    return output.decode("utf-8", "replace")
 
 
 def work_claude(
@@ -1,15 +1,55 @@
 """Linear GraphQL API client."""
 
+import atexit
+import gzip
+import hashlib
+import http.client
 import json
 import os
-import urllib.error
-import urllib.request
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from lisa.auth import get_token
 from lisa.ui.output import error, log
+from lisa.utils.connection import StaleConnectionError, https_connection, send_request
 
 LINEAR_API_URL = "https://api.linear.app/graphql"
+LINEAR_API_HOST = "api.linear.app"
+LINEAR_API_PATH = "/graphql"
+
+# Idle keep-alive connections, reused across GraphQL calls (one TCP + TLS handshake each).
+# Concurrent callers each take their own connection; at most _POOL_SIZE are kept open.
+_POOL_SIZE = 4
+_idle: list[http.client.HTTPSConnection] = []
+_pool_lock = threading.Lock()
+
+
+def _close_connection() -> None:
+    """Close all pooled Linear API connections."""
+    with _pool_lock:
+        while _idle:
+            _idle.pop().close()
+
+
+atexit.register(_close_connection)
+
+# Automatic persisted queries (APQ): once a query's text has been sent with its sha256,
+# later calls send only the hash and Linear reuses its cached parse. {query: sha256}
+# Guarded by _apq_lock: batched fetches call linear_api from several threads.
+_query_hashes: dict[str, str] = {}
+_apq_enabled = True  # Turned off for the session if the server rejects APQ
+_apq_confirmed = False  # Set once a hash-only request has succeeded
+_apq_lock = threading.Lock()
+
+
+def _disable_apq() -> None:
+    """Stop using persisted queries for the rest of the session."""
+    global _apq_enabled
+    with _apq_lock:
+        _apq_enabled = False
+        _query_hashes.clear()
 
 
 def _get_auth_header() -> Optional[str]:
@@ -25,44 +65,138 @@ def _get_auth_header() -> Optional[str]:
     return None
 
 
+def _post_graphql(body: bytes, headers: dict[str, str]) -> tuple[int, str, bytes]:
+    """POST a GraphQL body over a pooled keep-alive connection. Returns (status, reason, payload).
+
+    Gzip-encoded responses are decompressed. If a previously opened connection had
+    already been dropped by the server, reconnects once; other failures are raised
+    without resending, since a mutation may already have been applied.
+    """
+    while True:
+        with _pool_lock:
+            conn = _idle.pop() if _idle else None
+        reused = conn is not None
+        if conn is None:
+            conn = https_connection(LINEAR_API_HOST)
+        try:
+            resp, payload = send_request(conn, "POST", LINEAR_API_PATH, body, headers)
+        except StaleConnectionError:
+            if reused:
+                continue  # Stale keep-alive connection, retry on a fresh one
+            raise
+        status, reason = resp.status, resp.reason
+        encoding = resp.getheader("Content-Encoding")
+        with _pool_lock:
+            if len(_idle) < _POOL_SIZE:
+                _idle.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+        if encoding == "gzip":
+            try:
+                payload = gzip.decompress(payload)
+            except (OSError, EOFError, zlib.error) as e:
+                raise http.client.HTTPException(f"Malformed gzip response: {e}") from e
+        return status, reason, payload
+
+
+def _persisted_query_error(result: dict) -> Optional[str]:
+    """Return "not_found" / "not_supported" if the response is an APQ error, else None."""
+    for err in result.get("errors") or ():
+        if not isinstance(err, dict):
+            continue
+        code = (err.get("extensions") or {}).get("code") or err.get("message")
+        if code in ("PERSISTED_QUERY_NOT_FOUND", "PersistedQueryNotFound"):
+            return "not_found"
+        if code in ("PERSISTED_QUERY_NOT_SUPPORTED", "PersistedQueryNotSupported"):
+            return "not_supported"
+    return None
+
+
+def _send_graphql(body: dict, headers: dict[str, str]) -> tuple[int, str, Optional[dict]]:
+    """POST one GraphQL request body. Returns (status, reason, decoded response or None).
+
+    Connection and decode errors are reported here and come back with status 0; HTTP
+    error statuses are left to the caller, which may retry with the full query text.
+    """
+    try:
+        status, reason, payload = _post_graphql(json.dumps(body).encode(), headers)
+    except (http.client.HTTPException, OSError) as e:
+        error(f"Linear API connection error: {e}")
+        return 0, "", None
+    if status >= 400:
+        return status, reason, None
+    try:
+        return status, reason, json.loads(payload)
+    except Exception as e:
+        error(f"Linear API error: {e}")
+        return 0, "", None
+
+
 def linear_api(query: str, variables: Optional[dict] = None) -> Optional[dict]:
-    """Direct GraphQL call to Linear API. Returns None on error."""
+    """Direct GraphQL call to Linear API. Returns None on error.
+
+    Repeated queries are sent as persisted-query hashes. A hash-only request is resent
+    once with the full text only when it was not executed: the server evicted the hash,
+    rejected the request with an HTTP error, or doesn't support APQ. Other GraphQL errors
+    are returned as-is, so a mutation is never applied twice. APQ is dropped for the
+    session if unsupported, or if a hash-only request is rejected before one has worked.
+    """
+    global _apq_confirmed
     auth = _get_auth_header()
     if not auth:
         error("Not authenticated. Run `lisa login` or set LINEAR_API_KEY.")
         return None
 
-    data = json.dumps({"query": query, "variables": variables or {}}).encode()
-    req = urllib.request.Request(
-        LINEAR_API_URL,
-        data=data,
-        headers={"Authorization": auth, "Content-Type": "application/json"},
-    )
-    try:
-        with urllib.request.urlopen(
-            req, timeout=30
-        ) as resp:  # nosemgrep: dynamic-urllib-use-detected
-            result = json.loads(resp.read())
-            if "errors" in result:
-                error(f"Linear GraphQL error: {result['errors']}")
-                return None
-            return result.get("data")  # type: ignore[no-any-return]
-    except urllib.error.HTTPError as e:
-        error(f"Linear API HTTP {e.code}: {e.reason}")
+    headers = {
+        "Authorization": auth,
+        "Content-Type": "application/json",
+        "Accept-Encoding": "gzip",  # ticket payloads with descriptions compress well
+    }
+    with _apq_lock:
+        apq = _apq_enabled
+        digest = _query_hashes.get(query) if apq else None
+    send_text = digest is None
+    while True:
+        body: dict = {"variables": variables or {}}
+        if send_text:
+            body["query"] = query
+        if apq:
+            digest = digest or hashlib.sha256(query.encode()).hexdigest()
+            body["extensions"] = {"persistedQuery": {"version": 1, "sha256Hash": digest}}
+        status, reason, result = _send_graphql(body, headers)
+        if status == 0:
+            return None
+        apq_error = _persisted_query_error(result) if apq and result else None
+        # An HTTP error status means the hash-only request was rejected before execution
+        rejected = not send_text and result is None
+        with _apq_lock:
+            confirmed = _apq_confirmed
+        if apq_error == "not_supported" or (rejected and not confirmed):
+            _disable_apq()  # Unsupported, or never shown to work here
+            apq = False
+        if apq_error == "not_supported" or rejected or (apq_error == "not_found" and not send_text):
+            send_text = True  # Not executed: resend with the text
+            continue
+        break
+
+    if result is None:
+        error(f"Linear API HTTP {status}: {reason}")
         return None
-    except urllib.error.URLError as e:
-        error(f"Linear API connection error: {e.reason}")
-        return None
-    except Exception as e:
-        error(f"Linear API error: {e}")
+    if apq and digest and apq_error is None:
+        with _apq_lock:
+            if _apq_enabled:
+                _query_hashes[query] = digest
+                if not send_text and "errors" not in result:
+                    _apq_confirmed = True
+    if "errors" in result:
+        error(f"Linear GraphQL error: {result['errors']}")
         return None
+    return result.get("data")
 
 
-def fetch_ticket(ticket_id: str, verbose: bool = False) -> Optional[dict]:
-    """Fetch ticket and subtasks via Linear GraphQL API."""
-    query = """
-    query($id: String!) {
-      issue(id: $id) {
+# Selection set shared by single and batched ticket queries
+_TICKET_FIELDS = """
         id
         identifier
         title
@@ -83,16 +217,30 @@ def fetch_ticket(ticket_id: str, verbose: bool = False) -> Optional[dict]:
             }
           }
         }
-      }
-    }
-    """
-    data = linear_api(query, {"id": ticket_id})
-    if not data or not data.get("issue"):
-        return None
+"""
 
-    issue = data["issue"]
+# Dry-run only displays the ticket and its subtask order: skip URLs, project and states
+_TICKET_FIELDS_LIGHT = """
+        identifier
+        title
+        description
+        children {
+          nodes {
+            identifier
+            title
+            inverseRelations {
+              nodes {
+                type
+                issue { identifier }
+              }
+            }
+          }
+        }
+"""
 
-    # Transform subtasks
+
+def _parse_ticket(issue: dict, verbose: bool = False) -> dict:
+    """Transform a raw GraphQL issue node into lisa's ticket dict."""
     subtasks = []
     for child in issue.get("children", {}).get("nodes", []):
         blocked_by = []
@@ -103,7 +251,7 @@ def fetch_ticket(ticket_id: str, verbose: bool = False) -> Optional[dict]:
         subtasks.append(
             {
                 "id": child["identifier"],
-                "uuid": child["id"],
+                "uuid": child.get("id", ""),
                 "title": child["title"],
                 "state": child.get("state", {}).get("name", "Unknown"),
                 "blockedBy": blocked_by,
@@ -112,7 +260,7 @@ def fetch_ticket(ticket_id: str, verbose: bool = False) -> Optional[dict]:
 
     result = {
         "id": issue["identifier"],
-        "uuid": issue["id"],
+        "uuid": issue.get("id", ""),
         "title": issue["title"],
         "description": issue.get("description", ""),
         "url": issue.get("url", ""),
@@ -124,6 +272,61 @@ def fetch_ticket(ticket_id: str, verbose: bool = False) -> Optional[dict]:
     return result
 
 
+def fetch_ticket(ticket_id: str, verbose: bool = False, light: bool = False) -> Optional[dict]:
+    """Fetch ticket and subtasks via Linear GraphQL API.
+
+    With light=True only identifiers, titles, description and subtask blockers are
+    requested; uuid, url, project_id and subtask states come back empty/"Unknown".
+    """
+    selection = _TICKET_FIELDS_LIGHT if light else _TICKET_FIELDS
+    query = f"""
+    query($id: String!) {{
+      issue(id: $id) {{{selection}      }}
+    }}
+    """
+    data = linear_api(query, {"id": ticket_id})
+    if not data or not data.get("issue"):
+        return None
+    return _parse_ticket(data["issue"], verbose)
+
+
+def fetch_tickets(
+    ticket_ids: list[str], verbose: bool = False, light: bool = False
+) -> dict[str, Optional[dict]]:
+    """Fetch several tickets in one GraphQL request using aliased issue queries.
+
+    Returns {ticket_id: ticket or None}. If the batched request fails (e.g. one
+    ID doesn't exist, which fails the whole query), falls back to fetching each
+    ticket individually so valid tickets are still returned. `light` is passed
+    through to fetch_ticket's field selection.
+    """
+    if len(ticket_ids) <= 1:
+        return {tid: fetch_ticket(tid, verbose, light) for tid in ticket_ids}
+
+    selection = _TICKET_FIELDS_LIGHT if light else _TICKET_FIELDS
+    params = ", ".join(f"$id{i}: String!" for i in range(len(ticket_ids)))
+    fields = "\n".join(
+        f"      t{i}: issue(id: $id{i}) {{{selection}      }}" for i in range(len(ticket_ids))
+    )
+    query = f"""
+    query({params}) {{
+{fields}
+    }}
+    """
+    data = linear_api(query, {f"id{i}": tid for i, tid in enumerate(ticket_ids)})
+    if data is None:
+        # Independent requests: overlap their round-trips on the connection pool
+        with ThreadPoolExecutor(max_workers=min(len(ticket_ids), _POOL_SIZE)) as pool:
+            fetched = pool.map(lambda tid: fetch_ticket(tid, verbose, light), ticket_ids)
+        return dict(zip(ticket_ids, fetched))
+
+    tickets: dict[str, Optional[dict]] = {}
+    for i, tid in enumerate(ticket_ids):
+        issue = data.get(f"t{i}")
+        tickets[tid] = _parse_ticket(issue, verbose) if issue else None
+    return tickets
+
+
 def fetch_teams() -> Optional[list]:
     """Fetch all teams from Linear. Returns list of {key, name}, empty list if none, or None on error."""
     query = """
@@ -138,26 +341,77 @@ def fetch_teams() -> Optional[list]:
     return teams.get("nodes") or []
 
 
-def fetch_subtask_details(subtask_id: str) -> Optional[dict]:
-    """Fetch subtask title and description from Linear.
+# Aliased issue selections per request; keeps batched queries under Linear's complexity limit
+_SUBTASK_BATCH = 25
 
-    Returns {id, title, description} or None.
-    """
-    query = """
-    query($id: String!) {
-      issue(id: $id) {
+_SUBTASK_FIELDS = """
         identifier
         title
         description
-      }
-    }
-    """
-    data = linear_api(query, {"id": subtask_id})
-    if not data or not data.get("issue"):
-        return None
-    issue = data["issue"]
+"""
+
+
+def _parse_subtask(issue: dict) -> dict:
     return {
         "id": issue["identifier"],
         "title": issue["title"],
         "description": issue.get("description", ""),
     }
+
+
+def _fetch_subtask_batch(subtask_ids: list[str]) -> dict[str, Optional[dict]]:
+    """Fetch up to _SUBTASK_BATCH subtasks in one request (plain query for a single ID)."""
+    if len(subtask_ids) == 1:
+        query = f"""
+    query($id: String!) {{
+      issue(id: $id) {{{_SUBTASK_FIELDS}      }}
+    }}
+    """
+        data = linear_api(query, {"id": subtask_ids[0]})
+        issue = data.get("issue") if data else None
+        return {subtask_ids[0]: _parse_subtask(issue) if issue else None}
+
+    params = ", ".join(f"$id{i}: String!" for i in range(len(subtask_ids)))
+    fields = "\n".join(
+        f"      s{i}: issue(id: $id{i}) {{{_SUBTASK_FIELDS}      }}"
+        for i in range(len(subtask_ids))
+    )
+    query = f"""
+    query({params}) {{
+{fields}
+    }}
+    """
+    data = linear_api(query, {f"id{i}": sid for i, sid in enumerate(subtask_ids)})
+    if data is None:
+        # One bad ID fails the whole query; retry individually so the rest still resolve
+        results: dict[str, Optional[dict]] = {}
+        with ThreadPoolExecutor(max_workers=min(len(subtask_ids), _POOL_SIZE)) as pool:
+            for single in pool.map(lambda sid: _fetch_subtask_batch([sid]), subtask_ids):
+                results.update(single)
+        return results
+
+    results = {}
+    for i, sid in enumerate(subtask_ids):
+        issue = data.get(f"s{i}")
+        results[sid] = _parse_subtask(issue) if issue else None
+    return results
+
+
+def fetch_subtask_details_many(subtask_ids: list[str]) -> dict[str, Optional[dict]]:
+    """Fetch title and description for several subtasks using aliased issue queries.
+
+    Returns {subtask_id: {id, title, description} or None}, one request per
+    _SUBTASK_BATCH IDs.
+    """
+    results: dict[str, Optional[dict]] = {}
+    for start in range(0, len(subtask_ids), _SUBTASK_BATCH):
+        results.update(_fetch_subtask_batch(subtask_ids[start : start + _SUBTASK_BATCH]))
+    return results
+
+
+def fetch_subtask_details(subtask_id: str) -> Optional[dict]:
+    """Fetch subtask title and description from Linear.
+
+    Returns {id, title, description} or None.
+    """
+    return fetch_subtask_details_many([subtask_id]).get(subtask_id)
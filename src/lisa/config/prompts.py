@@ -4,15 +4,16 @@ Priority chain: bundled defaults < ~/.config/lisa/prompts.yaml < .lisa/prompts.y
 Deep merge: dicts merge recursively, lists/scalars replace.
 """
 
-import importlib.resources
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Any
 
-import yaml
+from lisa.config.utils import deep_merge, load_cached_yaml, load_yaml
 
-from lisa.config.utils import deep_merge, load_yaml
-
-_prompts: Optional[dict] = None
+# Filled on first access and refilled in place on reload, so PROMPTS stays valid
+_prompts: dict[str, Any] = {}
+PROMPTS: Mapping[str, Any] = MappingProxyType(_prompts)
 _loaded_sources: list[str] = []
 
 GLOBAL_CONFIG = Path.home() / ".config" / "lisa" / "prompts.yaml"
@@ -21,16 +22,16 @@ PROJECT_CONFIG = Path(".lisa") / "prompts.yaml"
 
 def _load_defaults() -> dict:
     """Load bundled default prompts."""
+    import importlib.resources
+
     try:
         files = importlib.resources.files("lisa")
         prompts_path = files / "prompts" / "default.yaml"
-        content = prompts_path.read_text()
-        return yaml.safe_load(content)  # type: ignore[no-any-return]
+        return load_cached_yaml(prompts_path)  # type: ignore[no-any-return]
     except (FileNotFoundError, TypeError):
         dev_path = Path(__file__).parent.parent.parent.parent / "prompts" / "default.yaml"
         if dev_path.exists():
-            with open(dev_path) as f:
-                return yaml.safe_load(f)  # type: ignore[no-any-return]
+            return load_cached_yaml(dev_path)  # type: ignore[no-any-return]
         raise FileNotFoundError("Could not find prompts file")
 
 
@@ -55,21 +56,27 @@ def load_prompts() -> dict:
     return result
 
 
-def get_prompts() -> dict:
-    """Get cached prompts (loads on first access)."""
-    global _prompts
-    if _prompts is None:
-        _prompts = load_prompts()
-    return _prompts
+def get_prompts() -> Mapping[str, Any]:
+    """Get cached prompts as a read-only view (loads on first access)."""
+    if not _prompts:
+        _prompts.update(load_prompts())
+    return PROMPTS
 
 
-def reload_prompts() -> dict:
-    """Force reload prompts."""
-    global _prompts
-    _prompts = load_prompts()
-    return _prompts
+def reload_prompts() -> Mapping[str, Any]:
+    """Force reload prompts. Views returned earlier see the new values."""
+    fresh = load_prompts()
+    _prompts.clear()
+    _prompts.update(fresh)
+    return PROMPTS
 
 
 def get_loaded_sources() -> list[str]:
-    """Return list of config sources that were loaded (for logging)."""
+    """Return list of config sources that were loaded (for logging).
+
+    Loads and caches via get_prompts() on first access, so callers don't need to
+    trigger loading themselves.
+    """
+    if not _loaded_sources:
+        get_prompts()
     return _loaded_sources
@@ -1,10 +1,9 @@
 """JSON schema loading and management."""
 
-import importlib.resources
 from pathlib import Path
 from typing import Optional
 
-import yaml
+from lisa.config.utils import load_cached_yaml, safe_load
 
 _schemas: Optional[dict] = None
 
@@ -20,20 +19,20 @@ def load_schemas(path: Optional[Path] = None) -> dict:
     """
     if path and path.exists():
         with open(path) as f:
-            return yaml.safe_load(f)  # type: ignore[no-any-return]
+            return safe_load(f)  # type: ignore[no-any-return]
 
     # Load bundled defaults
+    import importlib.resources
+
     try:
         files = importlib.resources.files("lisa")
         schemas_path = files / "schemas" / "default.yaml"
-        content = schemas_path.read_text()
-        return yaml.safe_load(content)  # type: ignore[no-any-return]
+        return load_cached_yaml(schemas_path)  # type: ignore[no-any-return]
     except (FileNotFoundError, TypeError):
         # Fallback to relative path during development
         dev_path = Path(__file__).parent.parent.parent.parent / "schemas" / "default.yaml"
         if dev_path.exists():
-            with open(dev_path) as f:
-                return yaml.safe_load(f)  # type: ignore[no-any-return]
+            return load_cached_yaml(dev_path)  # type: ignore[no-any-return]
         raise FileNotFoundError("Could not find schemas file")
 
 
@@ -4,13 +4,10 @@ Priority chain: bundled defaults < ~/.config/lisa/config.yaml < .lisa/config.yam
 Deep merge: dicts merge recursively, lists/scalars replace.
 """
 
-import importlib.resources
 from pathlib import Path
 from typing import Optional
 
-import yaml
-
-from lisa.config.utils import deep_merge, load_yaml
+from lisa.config.utils import deep_merge, load_cached_yaml, load_yaml
 
 _config: Optional[dict] = None
 _loaded_sources: list[str] = []
@@ -21,16 +18,16 @@ PROJECT_CONFIG = Path(".lisa") / "config.yaml"
 
 def _load_defaults() -> dict:
     """Load bundled default config."""
+    import importlib.resources
+
     try:
         files = importlib.resources.files("lisa")
         config_path = files / "defaults" / "config.yaml"
-        content = config_path.read_text()
-        return yaml.safe_load(content)  # type: ignore[no-any-return]
+        return load_cached_yaml(config_path)  # type: ignore[no-any-return]
     except (FileNotFoundError, TypeError):
         dev_path = Path(__file__).parent.parent / "defaults" / "config.yaml"
         if dev_path.exists():
-            with open(dev_path) as f:
-                return yaml.safe_load(f)  # type: ignore[no-any-return]
+            return load_cached_yaml(dev_path)  # type: ignore[no-any-return]
         raise FileNotFoundError("Could not find defaults/config.yaml")
 
 
@@ -71,5 +68,11 @@ def reload_config() -> dict:
 
 
 def get_config_loaded_sources() -> list[str]:
-    """Return list of config sources that were loaded (for logging)."""
+    """Return list of config sources that were loaded (for logging).
+
+    Loads and caches via get_config() on first access, so callers don't need to
+    trigger loading themselves.
+    """
+    if not _loaded_sources:
+        get_config()
     return _loaded_sources
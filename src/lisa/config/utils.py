@@ -1,26 +1,149 @@
 """Shared utilities for config loading."""
 
+import functools
+import hashlib
+import json
+import os
 from pathlib import Path
-from typing import Optional
+from typing import IO, TYPE_CHECKING, Any, Optional, Union, overload
 
-import yaml
+if TYPE_CHECKING:
+    from importlib.resources.abc import Traversable
+
+
+@functools.lru_cache(maxsize=1)
+def _safe_loader() -> type:
+    """Pick the YAML loader on first parse, so importing config modules doesn't load PyYAML."""
+    # libyaml's C parser is several times faster than the pure-Python one; PyYAML wheels ship it
+    try:
+        from yaml import CSafeLoader
+
+        return CSafeLoader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader
+
+        return SafeLoader
+
+
+def safe_load(stream: Union[str, bytes, IO]) -> Any:
+    """Parse YAML like yaml.safe_load, using the C loader when available."""
+    import yaml
+
+    return yaml.load(stream, Loader=_safe_loader())
+
+
+@functools.lru_cache(maxsize=1)
+def _safe_dumper() -> type:
+    """Pick the YAML dumper on first use; the libyaml emitter when PyYAML ships it."""
+    try:
+        from yaml import CSafeDumper
+
+        return CSafeDumper
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeDumper
+
+        return SafeDumper
+
+
+@overload
+def safe_dump(data: Any, stream: None = None, **kwargs: Any) -> str: ...
+
+
+@overload
+def safe_dump(data: Any, stream: IO, **kwargs: Any) -> None: ...
+
+
+def safe_dump(data: Any, stream: Optional[IO] = None, **kwargs: Any) -> Optional[str]:
+    """Serialize like yaml.safe_dump, using the C emitter when available.
+
+    Returns the YAML string when no stream is given.
+    """
+    import yaml
+
+    return yaml.dump(data, stream, Dumper=_safe_dumper(), **kwargs)
+
+
+def cache_dir(name: str) -> Path:
+    """Per-purpose directory under lisa's user cache ($XDG_CACHE_HOME/lisa/<name>)."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "lisa" / name
+
+
+def _yaml_cache_dir() -> Path:
+    """Directory for JSON copies of parsed bundled YAML."""
+    return cache_dir("yaml")
+
+
+def load_cached_yaml(path: Union["Traversable", Path]) -> Any:
+    """Parse a YAML file, reusing a JSON copy of the result from a previous run when valid.
+
+    Cache entries are keyed on the file's path, mtime and size; an edit, or an upgrade
+    that reinstalls the bundled files, triggers a fresh parse. JSON rather than pickle,
+    so a tampered cache file can't run code; any unreadable or mismatched entry is a
+    miss, and data JSON can't represent exactly (e.g. dates) is never cached.
+    """
+    try:
+        st = os.stat(str(path))
+    except OSError:
+        return safe_load(path.read_bytes())  # Not a plain file (e.g. zipped package)
+
+    key: list = [str(path), st.st_mtime_ns, st.st_size]
+    cache_file = _yaml_cache_dir() / f"{hashlib.sha256(str(path).encode()).hexdigest()[:16]}.json"
+    try:
+        with open(cache_file, "rb") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        entry = None  # Missing or corrupt cache: reparse below
+    if isinstance(entry, dict) and entry.get("key") == key and "data" in entry:
+        return entry["data"]
+
+    data = safe_load(path.read_bytes())
+    try:
+        payload = json.dumps({"key": key, "data": data})
+    except (TypeError, ValueError):
+        return data  # Not JSON-serializable (e.g. dates)
+    if json.loads(payload)["data"] != data:
+        return data  # Lossy in JSON (e.g. non-string keys): don't cache
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(payload)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # Read-only home etc.; caching is best effort
+    return data
 
 
 def deep_merge(base: dict, override: dict) -> dict:
-    """Recursively merge override into base. Dicts merge, lists/scalars replace."""
+    """Recursively merge override into base. Dicts merge, lists/scalars replace.
+
+    Neither input is mutated: only the dicts along an override's path are copied, and
+    an empty override returns base itself.
+    """
+    if not override:
+        return base
     merged = base.copy()
-    for key, val in override.items():
-        if key in merged and isinstance(merged[key], dict) and isinstance(val, dict):
-            merged[key] = deep_merge(merged[key], val)
-        else:
-            merged[key] = val
+    _merge_into(merged, override)
     return merged
 
 
+def _merge_into(dst: dict, src: dict) -> None:
+    """Merge src into dst in place, copying nested dicts of dst before writing to them."""
+    for key, val in src.items():
+        current = dst.get(key)
+        if isinstance(current, dict) and isinstance(val, dict):
+            current = dst[key] = current.copy()
+            _merge_into(current, val)
+        else:
+            dst[key] = val
+
+
 def load_yaml(path: Path) -> Optional[dict]:
     """Load YAML file, return None if missing or empty."""
-    if not path.exists():
+    try:
+        f = open(path, "rb")  # libyaml decodes the bytes itself
+    except (FileNotFoundError, NotADirectoryError):
         return None
-    with open(path) as f:
-        data = yaml.safe_load(f)
+    with f:
+        data = safe_load(f)
     return data if isinstance(data, dict) else None
@@ -6,7 +6,9 @@ from lisa.git.branch import (
     find_next_suffix,
     get_base_slug,
     get_current_branch,
+    invalidate_branch_cache,
     list_branches_matching,
+    scan_ticket_branches,
 )
 from lisa.git.commit import (
     format_assumptions_trailer,
@@ -16,14 +18,20 @@ from lisa.git.commit import (
     git_commit,
     summarize_for_commit,
 )
+from lisa.git.process import git_env, run_git
 from lisa.git.worktree import create_session_worktree, remove_worktree
 
 __all__ = [
+    # Process
+    "run_git",
+    "git_env",
     # Branch
     "get_current_branch",
     "list_branches_matching",
+    "invalidate_branch_cache",
     "get_base_slug",
     "find_next_suffix",
+    "scan_ticket_branches",
     "determine_branch_name",
     "create_or_get_branch",
     # Commit
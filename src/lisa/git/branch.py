@@ -1,19 +1,75 @@
 """Branch management operations."""
 
+import fnmatch
+import functools
+import hashlib
 import json
+import os
 import re
 import subprocess
+import time
+from pathlib import Path
 from typing import Optional
 
-from lisa.clients.claude import claude
-from lisa.config.prompts import get_prompts
-from lisa.config.schemas import get_schemas
+from lisa.config.utils import cache_dir
+from lisa.git.process import run_git
 from lisa.ui.output import error, log, success
 
 
+def _git_dir() -> Optional[str]:
+    """Find the git directory for the cwd without spawning git (None if unsure).
+
+    Follows the `gitdir:` pointer in a worktree's .git file. Returns None when
+    GIT_DIR/GIT_WORK_TREE are set or no repository is found, so callers fall back to git.
+    """
+    if "GIT_DIR" in os.environ or "GIT_WORK_TREE" in os.environ:
+        return None
+    path = os.getcwd()
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            try:
+                with open(dot_git) as f:
+                    content = f.read().strip()
+            except OSError:
+                return None
+            if not content.startswith("gitdir:"):
+                return None
+            return os.path.normpath(os.path.join(path, content[len("gitdir:") :].strip()))
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _read_head_branch() -> Optional[str]:
+    """Read the current branch from HEAD in-process. "" if detached, None if unknown."""
+    git_dir = _git_dir()
+    if git_dir is None:
+        return None
+    try:
+        with open(os.path.join(git_dir, "HEAD")) as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+    if head.startswith("ref: refs/heads/"):
+        return head[len("ref: refs/heads/") :]
+    if head.startswith("ref:"):
+        return None  # Symbolic ref outside refs/heads: let git decide
+    return ""  # Detached HEAD holds a commit SHA
+
+
 def get_current_branch() -> str:
-    """Get current git branch name."""
-    result = subprocess.run(["git", "branch", "--show-current"], capture_output=True, text=True)
+    """Get current git branch name ("" when detached).
+
+    Reads .git/HEAD directly; only shells out to git when the layout isn't recognised.
+    """
+    branch = _read_head_branch()
+    if branch is not None:
+        return branch
+    result = run_git("branch", "--show-current", read_only=True)
     return result.stdout.strip() if result.returncode == 0 else ""
 
 
@@ -25,37 +81,85 @@ def get_default_branch() -> str:
     Returns empty string if no default branch found.
     """
     # Try to get the default branch from origin/HEAD
-    result = subprocess.run(
-        ["git", "symbolic-ref", "refs/remotes/origin/HEAD"],
-        capture_output=True,
-        text=True,
-    )
+    result = run_git("symbolic-ref", "refs/remotes/origin/HEAD", read_only=True)
     if result.returncode == 0:
         ref = result.stdout.strip()
         if ref.startswith("refs/remotes/origin/"):
             return ref[len("refs/remotes/origin/") :]
 
     # Fallback: check if main or master exists locally
+    branches = set(_local_branches())
     for candidate in ["main", "master", "trunk"]:
-        result = subprocess.run(
-            ["git", "rev-parse", "--verify", candidate],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode == 0:
+        if candidate in branches:
             return candidate
 
     return ""
 
 
+def _read_local_branches() -> Optional[list[str]]:
+    """Read local branch names from packed-refs and refs/heads/ without spawning git.
+
+    Returns None for layouts this doesn't understand (no repo found, reftable storage).
+    """
+    git_dir = _git_dir()
+    if git_dir is None:
+        return None
+    common_dir = git_dir
+    try:
+        # Linked worktrees keep shared refs in the main repository's git dir
+        with open(os.path.join(git_dir, "commondir")) as f:
+            common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except OSError:
+        pass
+    heads = os.path.join(common_dir, "refs", "heads")
+    if not os.path.isdir(heads) or os.path.exists(os.path.join(common_dir, "reftable")):
+        return None
+
+    names = set()
+    try:
+        with open(os.path.join(common_dir, "packed-refs")) as f:
+            for line in f:
+                # "<sha> refs/heads/<name>"; skip the header and "^<sha>" peeled lines
+                _, _, ref = line.rstrip("\n").partition(" ")
+                if ref.startswith("refs/heads/"):
+                    names.add(ref[len("refs/heads/") :])
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return None
+    for root, _, files in os.walk(heads):
+        rel = os.path.relpath(root, heads)
+        for name in files:
+            if not name.endswith(".lock"):
+                names.add(name if rel == "." else f"{rel}/{name}".replace(os.sep, "/"))
+    return list(names)
+
+
+@functools.lru_cache(maxsize=None)
+def _local_branches() -> tuple[str, ...]:
+    """All local branch names, read once and memoized.
+
+    Refs are read from disk when the repository layout is recognised, otherwise with
+    `git for-each-ref`. Call invalidate_branch_cache() after creating, renaming or
+    deleting a branch.
+    """
+    names = _read_local_branches()
+    if names is not None:
+        return tuple(names)
+    result = run_git("for-each-ref", "--format=%(refname:short)", "refs/heads/", read_only=True)
+    if result.returncode != 0:
+        return ()
+    return tuple(result.stdout.split())
+
+
+def invalidate_branch_cache() -> None:
+    """Forget the memoized branch list so the next lookup re-reads refs."""
+    _local_branches.cache_clear()
+
+
 def list_branches_matching(pattern: str) -> list[str]:
     """List git branches matching a pattern (e.g., 'eng-71-*')."""
-    result = subprocess.run(["git", "branch", "--list", pattern], capture_output=True, text=True)
-    if result.returncode != 0:
-        return []
-    # Parse branch names (strip whitespace, * for current, + for worktree)
-    branches = [b.strip().lstrip("*+ ") for b in result.stdout.strip().split("\n") if b.strip()]
-    return sorted(branches)
+    return sorted(fnmatch.filter(_local_branches(), pattern))
 
 
 def get_base_slug(branch: str, prefix: str) -> str:
@@ -70,27 +174,99 @@ def get_base_slug(branch: str, prefix: str) -> str:
         return branch
 
     # Check if ends with -N (numeric suffix)
-    match = re.match(r"^(.+)-(\d+)$", slug_part)
-    if match:
-        return f"{prefix}-{match.group(1)}"
+    base_part, _, tail = slug_part.rpartition("-")
+    if base_part and tail.isdecimal():
+        return f"{prefix}-{base_part}"
     return branch
 
 
 def find_next_suffix(branches: list[str], base: str) -> int:
     """Find next available numeric suffix for base branch name."""
-    max_suffix = 1
-    for b in branches:
-        if b == base:
-            max_suffix = max(max_suffix, 1)
-        elif b.startswith(f"{base}-"):
-            suffix_part = b[len(base) + 1 :]
-            if suffix_part.isdigit():
-                max_suffix = max(max_suffix, int(suffix_part))
-    return max_suffix + 1
+    base_prefix = f"{base}-"
+    start = len(base_prefix)
+    max_suffix = max(
+        (int(b[start:]) for b in branches if b.startswith(base_prefix) and b[start:].isdecimal()),
+        default=1,
+    )
+    return max(max_suffix, 1) + 1
+
+
+def scan_ticket_branches(prefix: str, base: Optional[str] = None) -> Optional[tuple[str, int]]:
+    """Find a ticket's base branch and its highest numeric suffix in one pass.
+
+    Equivalent to get_base_slug() on the first of list_branches_matching(f"{prefix}-*")
+    (or the given base) followed by find_next_suffix() - 1. Returns None when the ticket
+    has no branches.
+    """
+    head = f"{prefix}-"
+    start = len(head)
+    first: Optional[str] = None
+    max_suffixes: dict[str, int] = {}
+    for branch in _local_branches():
+        if not branch.startswith(head):
+            continue
+        if first is None or branch < first:
+            first = branch
+        base_part, _, tail = branch[start:].rpartition("-")
+        if base_part and tail.isdecimal():
+            branch_base = branch[: start + len(base_part)]
+            max_suffixes[branch_base] = max(max_suffixes.get(branch_base, 0), int(tail))
+    if first is None:
+        return None
+    base = base or get_base_slug(first, prefix)
+    # The unsuffixed base branch counts as 1
+    return base, max(max_suffixes.get(base, 1), 1)
+
+
+# Re-runs of a ticket reuse its slug instead of asking Haiku again
+_SLUG_CACHE_TTL = 30 * 24 * 3600
+
+
+def _slug_cache_file(title: str, description: str, max_len: int) -> Path:
+    key = json.dumps([title, description[:500] if description else "", max_len])
+    return cache_dir("slugs") / f"{hashlib.sha256(key.encode()).hexdigest()[:16]}.txt"
+
+
+def _cached_slug(cache_file: Path) -> Optional[str]:
+    try:
+        if time.time() - cache_file.stat().st_mtime > _SLUG_CACHE_TTL:
+            return None
+        return cache_file.read_text().strip() or None
+    except OSError:
+        return None
+
+
+def _store_slug(cache_file: Path, slug: str) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(slug)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # Caching is best effort
 
 
 def generate_slug(title: str, description: str, max_len: int) -> str:
-    """Use Haiku to generate a short branch slug from title and description."""
+    """Use Haiku to generate a short branch slug from title and description.
+
+    Results are cached on disk for 30 days, keyed on title, description and max_len.
+    """
+    cache_file = _slug_cache_file(title, description, max_len)
+    cached = _cached_slug(cache_file)
+    if cached:
+        return cached
+    slug = _generate_slug(title, description, max_len)
+    if slug != "work":  # Don't pin the fallback
+        _store_slug(cache_file, slug)
+    return slug
+
+
+def _generate_slug(title: str, description: str, max_len: int) -> str:
+    # Model client and prompt config are only needed here, not for branch lookups
+    from lisa.clients.claude import claude
+    from lisa.config.prompts import get_prompts
+    from lisa.config.schemas import get_schemas
+
     prompts = get_prompts()
     schemas = get_schemas()
 
@@ -124,18 +300,17 @@ def determine_branch_name(ticket_id: str, title: str, description: str) -> tuple
         return current, True
 
     # Find existing branches for this ticket
-    existing = list_branches_matching(f"{prefix}-*")
+    existing = scan_ticket_branches(prefix)
 
-    if not existing:
+    if existing is None:
         # No branches yet - generate slug
         max_slug_len = 24 - len(prefix) - 1
         slug = generate_slug(title, description, max_slug_len)
         branch_name = f"{prefix}-{slug}" if slug else prefix
     else:
-        # Branches exist - find base and increment
-        base = get_base_slug(existing[0], prefix)
-        suffix = find_next_suffix(existing, base)
-        branch_name = f"{base}-{suffix}"
+        # Branches exist - increment past the highest suffix
+        base, max_suffix = existing
+        branch_name = f"{base}-{max_suffix + 1}"
 
     return branch_name, False
 
@@ -162,20 +337,19 @@ def create_or_get_branch(
         return current
 
     # Find existing branches for this ticket
-    existing = list_branches_matching(f"{prefix}-*")
+    existing = scan_ticket_branches(prefix)
 
-    if not existing:
+    if existing is None:
         # No branches yet - generate slug
         max_slug_len = 24 - len(prefix) - 1
         slug = generate_slug(title, description, max_slug_len)
         branch_name = f"{prefix}-{slug}" if slug else prefix
         log(f"No existing branches, creating {branch_name}")
     else:
-        # Branches exist - find base and increment
-        base = get_base_slug(existing[0], prefix)
-        suffix = find_next_suffix(existing, base)
-        branch_name = f"{base}-{suffix}"
-        log(f"Found {len(existing)} existing branches, creating {branch_name}")
+        # Branches exist - increment past the highest suffix
+        base, max_suffix = existing
+        branch_name = f"{base}-{max_suffix + 1}"
+        log(f"Found existing branches up to suffix {max_suffix}, creating {branch_name}")
 
     # Create the branch
     if spice:
@@ -187,11 +361,10 @@ def create_or_get_branch(
             return None
         success(f"Created spice branch {branch_name}")
     else:
-        result = subprocess.run(
-            ["git", "checkout", "-b", branch_name], capture_output=True, text=True
-        )
+        result = run_git("checkout", "-b", branch_name)
         if result.returncode != 0:
             error(f"git checkout -b failed: {result.stderr}")
             return None
         success(f"Created branch {branch_name}")
+    invalidate_branch_cache()
     return branch_name
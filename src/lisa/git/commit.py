@@ -1,12 +1,14 @@
 """Git commit operations with trailers."""
 
+import os
 import re
+import shutil
 import subprocess
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
 
-from lisa.clients.claude import claude, work_claude
 from lisa.constants import MAX_HOOK_FIX_ATTEMPTS
-from lisa.models.core import Assumption
+from lisa.git.process import git_env, run_git
 from lisa.ui.output import (
     error,
     error_with_conclusion,
@@ -16,52 +18,78 @@ from lisa.ui.output import (
     warn_with_conclusion,
 )
 
+if TYPE_CHECKING:
+    from lisa.models.core import Assumption
+
+# Trailer values must stay on one line
+_NEWLINE_TABLE = str.maketrans({"\n": " ", "\r": ""})
+
 
 def get_changed_files() -> list[str]:
     """Get list of files with uncommitted changes (modified + untracked)."""
-    result = subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True)
-    if result.returncode != 0 or not result.stdout.strip():
+    # -z: NUL-separated entries with unquoted paths, so no unescaping or " -> " parsing
+    result = run_git("status", "--porcelain", "-z", read_only=True)
+    if result.returncode != 0 or not result.stdout:
         return []
     files = []
-    for line in result.stdout.strip().split("\n"):
-        if line.strip():
-            # Format: "XY filename" or "XY filename -> newname"
-            # Skip the 2-char status, then strip any leading spaces
-            rest = line[2:].lstrip()  # Handle variable spacing after status
-            filename = rest.split(" -> ")[-1]  # Handle renames
-            files.append(filename)
+    entries = iter(result.stdout.split("\0"))
+    for entry in entries:
+        if len(entry) < 4:
+            continue  # Trailing empty field
+        # Format: "XY path"; a rename/copy in either column is followed by a source-path entry
+        files.append(entry[3:])
+        if "R" in entry[:2] or "C" in entry[:2]:
+            next(entries, None)
     return files
 
 
 def get_diff_stat() -> str:
     """Get compact one-line diff stat for display (e.g. '3 files (+45/-12)')."""
-    stat = subprocess.run(["git", "diff", "--shortstat", "HEAD"], capture_output=True, text=True)
+    stat = run_git("diff", "--shortstat", "HEAD", read_only=True)
     if stat.returncode == 0 and stat.stdout.strip():
         return stat.stdout.strip()
     # Fallback: check for untracked files
-    status = subprocess.run(["git", "status", "--short"], capture_output=True, text=True)
+    status = run_git("status", "--short", read_only=True)
     if status.returncode == 0 and status.stdout.strip():
         count = len(status.stdout.strip().split("\n"))
         return f"{count} new file{'s' if count != 1 else ''}"
     return "no changes"
 
 
+def _read_head(cmd: list[str], limit: int = 1024) -> str:
+    """Return at most the first limit bytes of a command's stdout, stopping it early.
+
+    Keeps memory flat on huge diffs: git is terminated instead of being drained.
+    """
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=git_env(read_only=True)
+    ) as proc:
+        assert proc.stdout is not None
+        data = proc.stdout.read(limit)
+        proc.terminate()  # No-op if git already finished
+    return data.decode(errors="replace")
+
+
 def get_diff_summary() -> str:
     """Get diff content for Haiku to summarize."""
-    # Get diff stat and actual diff for context
-    stat = subprocess.run(["git", "diff", "--stat", "HEAD"], capture_output=True, text=True)
-    diff = subprocess.run(["git", "diff", "HEAD"], capture_output=True, text=True)
-    # Also check for new files
-    status = subprocess.run(["git", "status", "--short"], capture_output=True, text=True)
+    # Diff stat, actual diff and status (for new files) are independent: run them concurrently.
+    # Only a prefix of each is used, so each is read up to a small cap.
+    commands = (
+        ["git", "diff", "--no-color", "--no-ext-diff", "--stat", "HEAD"],
+        ["git", "diff", "--no-color", "--no-ext-diff", "-U1", "HEAD"],
+        ["git", "status", "--short"],
+    )
+    with ThreadPoolExecutor(max_workers=len(commands)) as pool:
+        stat, diff, status = pool.map(_read_head, commands)
 
     context = ""
-    if stat.stdout.strip():
-        context += stat.stdout.strip()[:300] + "\n"
-    if diff.stdout.strip():
-        context += diff.stdout.strip()[:700]
-    if not context and status.stdout.strip():
+    if stat.strip():
+        context += stat.strip()[:300] + "\n"
+    if diff.strip():
+        context += diff.strip()[:700]
+    if not context and status.strip():
         # Fallback for untracked files
-        context = "New files:\n" + status.stdout.strip()[:500]
+        context = "New files:\n" + status.strip()[:500]
     return context or "no changes"
 
 
@@ -75,6 +103,8 @@ Max 50 chars total. Be concise, no fluff.
 Step: {full_desc}
 
 Reply with ONLY the type: summary, nothing else."""
+    from lisa.clients.claude import claude
+
     return claude(prompt, model="haiku", allowed_tools="").strip()
 
 
@@ -92,7 +122,7 @@ def _extract_commit_type(title: str) -> tuple[str, str]:
     return "feat", title
 
 
-def format_assumptions_trailer(assumptions: list[Assumption]) -> str:
+def format_assumptions_trailer(assumptions: list["Assumption"]) -> str:
     """Format assumptions for git commit trailer (statements only, no rationale)."""
     if not assumptions:
         return ""
@@ -104,14 +134,33 @@ def format_assumptions_trailer(assumptions: list[Assumption]) -> str:
 
 def _get_staged_files() -> list[str]:
     """Return list of staged file paths from git diff --cached --name-only."""
-    result = subprocess.run(
-        ["git", "diff", "--cached", "--name-only"], capture_output=True, text=True
-    )
+    result = run_git("diff", "--cached", "--name-only", read_only=True)
     if result.returncode != 0 or not result.stdout.strip():
         return []
     return [f.strip() for f in result.stdout.strip().split("\n") if f.strip()]
 
 
+def _pre_commit_available() -> bool:
+    """Whether the project uses the pre-commit framework and its CLI is installed."""
+    return os.path.isfile(".pre-commit-config.yaml") and shutil.which("pre-commit") is not None
+
+
+def _attempt_deterministic_hook_fix(files: list[str]) -> None:
+    """Run the project's pre-commit hooks over files so auto-fixing hooks rewrite them."""
+    log("Running pre-commit auto-fixes")
+    subprocess.run(["pre-commit", "run", "--files", *files], capture_output=True, text=True)
+
+
+# Summary line printed by `git commit`: "[main abc1234] msg", "[main (root-commit) abc1234] msg"
+_COMMIT_SUMMARY_RE = re.compile(r"^\[[^\]\n]* ([0-9a-f]{4,})\] ", re.MULTILINE)
+
+
+def _commit_sha(output: str) -> Optional[str]:
+    """Extract the abbreviated SHA from `git commit` output, or None if not found."""
+    m = _COMMIT_SUMMARY_RE.search(output)
+    return m.group(1) if m else None
+
+
 def git_commit(
     commit_ticket_id: str,
     iteration: int,
@@ -120,7 +169,7 @@ def git_commit(
     iter_state: Optional[dict] = None,
     push: bool = False,
     files_to_add: Optional[list[str]] = None,
-    assumptions: Optional[list[Assumption]] = None,
+    assumptions: Optional[list["Assumption"]] = None,
     allow_no_verify: bool = True,
     max_hook_fix_attempts: int = MAX_HOOK_FIX_ATTEMPTS,
     model: Optional[str] = None,
@@ -132,62 +181,78 @@ def git_commit(
 
     Uses Lisa-* trailers (new format) for state tracking.
     """
-    result = subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True)
-    if result.returncode != 0:
-        error(f"git status failed: {result.stderr}")
-        return False
-    if not result.stdout.strip():
-        log("No changes to commit")
-        return True
-
     # Add specific files or all
     if files_to_add:
-        result = subprocess.run(["git", "add", "--"] + files_to_add, capture_output=True, text=True)
+        result = run_git("add", "--", *files_to_add)
     else:
-        result = subprocess.run(["git", "add", "-A"], capture_output=True, text=True)
+        result = run_git("add", "-A")
     if result.returncode != 0:
         error(f"git add failed: {result.stderr}")
         return False
 
+    # Anything staged? Compares index to HEAD only, unlike a full worktree `git status`.
+    # Exit 0 means no difference; errors (e.g. no HEAD yet) fall through to the commit.
+    result = run_git("diff", "--cached", "--quiet", read_only=True)
+    if result.returncode == 0:
+        log("No changes to commit")
+        return True
+
     # Build commit message with metadata (use Lisa-* trailers now)
     commit_type, clean_title = _extract_commit_type(task_title)
-    msg = f"{commit_type}(lisa): [{commit_ticket_id}] {clean_title}"
+    paragraphs = [f"{commit_type}(lisa): [{commit_ticket_id}] {clean_title}"]
     if task_body:
-        msg += f"\n\n{task_body}"
+        paragraphs.append(task_body)
+    trailers: list[str] = []
     if iter_state:
         status = "PASS" if not iter_state.get("test_errors") else "FAIL"
         # Sanitize trailers: replace newlines, limit length
         test_error = iter_state["test_errors"][0] if iter_state.get("test_errors") else "none"
-        test_error = test_error.replace("\n", " ").replace("\r", "")[:500]
         review_issues = (
             "; ".join(iter_state.get("review_issues", []))
             if iter_state.get("review_issues")
             else "none"
         )
-        review_issues = review_issues.replace("\n", " ").replace("\r", "")[:500]
-        msg += f"\n\nLisa-Iteration: {iteration}"
-        msg += f"\nLisa-Status: {status}"
-        msg += f"\nLisa-Test-Error: {test_error}"
-        msg += f"\nLisa-Review-Issues: {review_issues}"
+        trailers.append(
+            f"Lisa-Iteration: {iteration}\n"
+            f"Lisa-Status: {status}\n"
+            f"Lisa-Test-Error: {test_error.translate(_NEWLINE_TABLE)[:500]}\n"
+            f"Lisa-Review-Issues: {review_issues.translate(_NEWLINE_TABLE)[:500]}"
+        )
 
     # Add assumptions trailer if present
     if assumptions:
         assumptions_summary = format_assumptions_trailer(assumptions)
         if assumptions_summary:
-            msg += f"\nLisa-Assumptions: {assumptions_summary}"
+            trailers.append(f"Lisa-Assumptions: {assumptions_summary}")
+
+    msg = "\n\n".join(paragraphs)
+    if trailers:
+        # The iteration block opens the trailer paragraph; assumptions attach to whatever precedes
+        msg += ("\n\n" if iter_state else "\n") + "\n".join(trailers)
 
-    result = subprocess.run(["git", "commit", "-m", msg], capture_output=True, text=True)
+    result = run_git("commit", "-m", msg)
     if result.returncode != 0:
         hook_output = result.stderr.strip()
+        autofix = _pre_commit_available()
+        staged_files: list[str] = []
+        if autofix or (model and max_hook_fix_attempts > 0):
+            # The staged set only changes through our own re-add of these same paths,
+            # so it is read once for all attempts
+            staged_files = _get_staged_files() or files_to_add or []
+
+        # Formatter hooks usually fix their own failures: one deterministic pass first
+        if autofix and staged_files:
+            _attempt_deterministic_hook_fix(staged_files)
+            run_git("add", "--", *staged_files)
+            result = run_git("commit", "-m", msg)
+            hook_output = result.stderr.strip()
 
         # Try fix loop if model is available
-        if model and max_hook_fix_attempts > 0:
-            for attempt in range(1, max_hook_fix_attempts + 1):
-                staged_files = _get_staged_files()
-                if not staged_files:
-                    staged_files = files_to_add or []
-                files_list = "\n".join(staged_files)
+        if result.returncode != 0 and model and max_hook_fix_attempts > 0:
+            from lisa.clients.claude import work_claude
 
+            files_list = "\n".join(staged_files)
+            for attempt in range(1, max_hook_fix_attempts + 1):
                 warn(f"Pre-commit hook failed (fix attempt {attempt}/{max_hook_fix_attempts})")
 
                 fix_prompt = (
@@ -197,18 +262,17 @@ def git_commit(
                     f"Read the failing files, fix ONLY hook/lint/format issues. "
                     f"Do NOT change functionality. Do NOT run git commit."
                 )
-                work_claude(fix_prompt, model, yolo, fallback_tools, effort="low")
+                # Cheap first try; later attempts get more effort
+                effort = "low" if attempt == 1 else "medium"
+                work_claude(fix_prompt, model, yolo, fallback_tools, effort=effort)
 
-                # Re-stage the fixed files
+                # Re-stage the fixed files every time: one cheap git call, and stat stamps
+                # can miss a same-size rewrite on coarse-mtime filesystems
                 if staged_files:
-                    subprocess.run(
-                        ["git", "add", "--"] + staged_files, capture_output=True, text=True
-                    )
+                    run_git("add", "--", *staged_files)
 
                 # Retry commit
-                result = subprocess.run(
-                    ["git", "commit", "-m", msg], capture_output=True, text=True
-                )
+                result = run_git("commit", "-m", msg)
                 if result.returncode == 0:
                     break
                 hook_output = result.stderr.strip()
@@ -225,18 +289,16 @@ def git_commit(
             msg_lines = msg.split("\n", 1)
             msg_lines[0] += " [no verify]"
             msg = "\n".join(msg_lines)
-            result = subprocess.run(
-                ["git", "commit", "--no-verify", "-m", msg], capture_output=True, text=True
-            )
+            result = run_git("commit", "--no-verify", "-m", msg)
             if result.returncode != 0:
                 error(f"git commit failed: {result.stderr}")
                 return False
 
-    # Get short SHA for display
-    sha_result = subprocess.run(
-        ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
-    )
-    short_sha = sha_result.stdout.strip() if sha_result.returncode == 0 else "?"
+    # Short SHA for display, from the commit's own summary line when present
+    short_sha = _commit_sha(result.stdout)
+    if short_sha is None:
+        sha_result = run_git("rev-parse", "--short", "HEAD", read_only=True)
+        short_sha = sha_result.stdout.strip() if sha_result.returncode == 0 else "?"
     success_with_conclusion(f"Committed ({commit_ticket_id})", short_sha, raw=True)
 
     if push:
@@ -251,7 +313,7 @@ def git_commit(
 
             success("Submitted via git-spice")
         else:
-            result = subprocess.run(["git", "push"], capture_output=True, text=True)
+            result = run_git("push")
             if result.returncode != 0:
                 error(f"git push failed: {result.stderr}")
                 return False
@@ -0,0 +1,24 @@
+"""Shared runner for git subprocesses."""
+
+import functools
+import os
+import subprocess
+
+
+@functools.lru_cache(maxsize=2)
+def git_env(read_only: bool = False) -> dict[str, str]:
+    """Environment for git children, built once per mode from the current environment.
+
+    Optional locks are skipped so status/diff never contend for index.lock with a concurrent
+    commit, and a pager is never spawned. Read-only queries also run under the C locale,
+    sparing git's locale setup; commands that run hooks keep the user's locale.
+    """
+    env = {**os.environ, "GIT_OPTIONAL_LOCKS": "0", "GIT_PAGER": "cat"}
+    if read_only:
+        env["LC_ALL"] = "C"
+    return env
+
+
+def run_git(*args: str, read_only: bool = False) -> subprocess.CompletedProcess[str]:
+    """Run `git <args>` with captured text output and the shared environment."""
+    return subprocess.run(["git", *args], capture_output=True, text=True, env=git_env(read_only))
@@ -1,30 +1,42 @@
 """Git worktree management."""
 
 import os
+import secrets
 import shutil
-import subprocess
+import stat
+import sys
+import threading
 from typing import Optional
 
+from lisa.git.process import run_git
 from lisa.ui.output import error, log, success, warn
 
 
 def create_session_worktree(session_name: str) -> Optional[str]:
     """Create detached worktree for multi-ticket session. Returns path or None."""
     worktree_path = f"/tmp/lisa/{session_name}"
+    add_args = ["worktree", "add", "--detach", worktree_path, "HEAD"]
 
-    # Remove stale worktree if exists
+    # Stale worktree: rename it aside and delete it in the background. `add --force`
+    # then replaces its (now missing) registration, so creation doesn't wait on the delete.
     if os.path.exists(worktree_path):
-        log(f"Removing stale worktree at {worktree_path}")
-        if not remove_worktree(worktree_path):
-            error(f"Failed to clean up stale worktree at {worktree_path}")
-            return None
+        stale_path = f"{worktree_path}.stale-{secrets.token_hex(4)}"
+        try:
+            os.replace(worktree_path, stale_path)
+        except OSError:
+            log(f"Removing stale worktree at {worktree_path}")
+            if not remove_worktree(worktree_path):
+                error(f"Failed to clean up stale worktree at {worktree_path}")
+                return None
+        else:
+            log(f"Moved stale worktree aside to {stale_path}")
+            threading.Thread(
+                target=_discard_stale_worktree, args=(stale_path,), daemon=True
+            ).start()
+            add_args.insert(2, "--force")
 
     # Create detached worktree at HEAD
-    result = subprocess.run(
-        ["git", "worktree", "add", "--detach", worktree_path, "HEAD"],
-        capture_output=True,
-        text=True,
-    )
+    result = run_git(*add_args)
     if result.returncode != 0:
         error(f"git worktree add failed: {result.stderr}")
         return None
@@ -34,6 +46,79 @@ def create_session_worktree(session_name: str) -> Optional[str]:
     return worktree_path
 
 
+# rmtree callbacks that delete an entry; retried once after the parent is made writable
+_DELETE_FUNCS = (os.unlink, os.remove, os.rmdir)
+# rmtree callbacks that open or list a directory; fixed by making the directory accessible
+_LISTING_FUNCS = (os.open, os.scandir, os.listdir)
+
+
+def _make_writable(path: str) -> None:
+    try:
+        os.chmod(path, stat.S_IRWXU)
+    except OSError:
+        pass
+
+
+def _force_remove(
+    root: str, func, path: str, exc: BaseException, retry_listing: bool = True
+) -> None:
+    """rmtree error handler for the tree at root; re-raises exc when it can't help.
+
+    Permissions are only changed on paths inside root, never on root's parent. A failed
+    delete is retried after its parent is made writable; a directory that couldn't be
+    opened or listed is made accessible and removed by a fresh rmtree (once). The failed
+    callback itself is not replayed for opens, so no file descriptor is leaked.
+    """
+
+    def inside(p: str) -> bool:
+        return os.path.commonpath([root, p]) == root
+
+    parent = os.path.dirname(path)
+    if func in _DELETE_FUNCS and inside(parent):
+        _make_writable(parent)
+        func(path)
+    elif (
+        func in _LISTING_FUNCS
+        and retry_listing
+        and inside(path)
+        and os.path.isdir(path)
+        and not os.path.islink(path)
+    ):
+        _make_writable(path)
+        if inside(parent):
+            _make_writable(parent)
+        _rmtree_under(root, path, retry_listing=False)
+    else:
+        raise exc
+
+
+def _rmtree_under(root: str, path: str, retry_listing: bool) -> None:
+    def handler(func, p: str, exc: object) -> None:
+        # onexc passes the exception, onerror an exc_info tuple
+        err = exc if isinstance(exc, BaseException) else exc[1]  # type: ignore[index]
+        _force_remove(root, func, p, err, retry_listing)
+
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=handler)
+    else:
+        shutil.rmtree(path, onerror=handler)
+
+
+def _rmtree(path: str) -> None:
+    """shutil.rmtree that also clears read-only files and directories (raises OSError)."""
+    root = os.path.abspath(path)
+    _rmtree_under(root, root, retry_listing=True)
+
+
+def _discard_stale_worktree(stale_path: str) -> None:
+    """Background cleanup for a worktree moved aside: delete it and prune git's metadata."""
+    try:
+        _rmtree(stale_path)
+    except OSError:
+        pass  # Left under /tmp; nothing depends on it anymore
+    run_git("worktree", "prune")
+
+
 def remove_worktree(worktree_path: str) -> bool:
     """Remove worktree and its directory with aggressive fallback cleanup."""
     if not worktree_path or not worktree_path.startswith("/tmp/lisa/"):
@@ -42,11 +127,7 @@ def remove_worktree(worktree_path: str) -> bool:
     log(f"Removing worktree at {worktree_path}")
 
     # Step 1: Try git worktree remove --force
-    result = subprocess.run(
-        ["git", "worktree", "remove", worktree_path, "--force"],
-        capture_output=True,
-        text=True,
-    )
+    result = run_git("worktree", "remove", worktree_path, "--force")
 
     if result.returncode == 0:
         return True
@@ -54,33 +135,25 @@ def remove_worktree(worktree_path: str) -> bool:
     # Step 2: Fallback - forcibly remove directory
     warn(f"git worktree remove failed: {result.stderr}")
 
-    directory_removed = True
-    if os.path.exists(worktree_path):
-        log(f"Forcing directory cleanup: {worktree_path}")
-        try:
-            shutil.rmtree(worktree_path, ignore_errors=False)
-        except OSError as e:
-            error(f"Failed to remove worktree directory: {e}")
-            directory_removed = False
+    log(f"Forcing directory cleanup: {worktree_path}")
+    try:
+        _rmtree(worktree_path)
+        directory_removed = True
+    except FileNotFoundError:
+        directory_removed = True  # Already gone
+    except OSError as e:
+        error(f"Failed to remove worktree directory: {e}")
+        directory_removed = False
 
     # Step 3: Clean up git metadata regardless of directory removal
     # Get repository root to find .git/worktrees
-    repo_root_result = subprocess.run(
-        ["git", "rev-parse", "--show-toplevel"],
-        capture_output=True,
-        text=True,
-    )
+    repo_root_result = run_git("rev-parse", "--show-toplevel", read_only=True)
 
     if repo_root_result.returncode == 0:
         repo_root = repo_root_result.stdout.strip()
         worktree_name = os.path.basename(worktree_path)
         metadata_path = os.path.join(repo_root, ".git", "worktrees", worktree_name)
-
-        if os.path.exists(metadata_path):
-            log(f"Removing orphaned worktree metadata: {metadata_path}")
-            try:
-                shutil.rmtree(metadata_path)
-            except OSError as e:
-                warn(f"Failed to remove worktree metadata: {e}")
+        # Best effort: orphaned metadata is also dropped by the next `git worktree prune`
+        shutil.rmtree(metadata_path, ignore_errors=True)
 
     return directory_removed
@@ -1,38 +1,25 @@
 """lisa init — interactive project setup for Lisa."""
 
-import importlib.resources
+import functools
+import hashlib
+import io
 import json
 import os
-import shlex
-import subprocess
 import sys
-import tempfile
 from pathlib import Path
-from typing import Optional
-
-import yaml
+from typing import TYPE_CHECKING, Optional, TypeGuard
 
+from lisa.config.utils import cache_dir, safe_dump, safe_load
 from lisa.ui.output import BLUE, GRAY, GREEN, NC, YELLOW, error, log, success, warn
 
+if TYPE_CHECKING:
+    from importlib.resources.abc import Traversable
+
 LISA_DIR = Path(".lisa")
 CONFIG_FILE = LISA_DIR / "config.yaml"
 SKILLS_DIR = Path(".claude") / "skills"
 
-_MIN_FALLBACK_TOOLS = {
-    "Read",
-    "Edit",
-    "Write",
-    "Grep",
-    "Glob",
-    "Skill",
-    "Bash(git:*)",
-    "Bash(cd:*)",
-    "Bash(ls:*)",
-    "Bash(mkdir:*)",
-    "Bash(rm:*)",
-}
-
-_MIN_FALLBACK_TOOLS_ORDERED = [
+_MIN_FALLBACK_TOOLS_ORDERED = (
     "Read",
     "Edit",
     "Write",
@@ -44,14 +31,16 @@ _MIN_FALLBACK_TOOLS_ORDERED = [
     "Bash(ls:*)",
     "Bash(mkdir:*)",
     "Bash(rm:*)",
-]
+)
 
 
 def _ensure_min_fallback_tools(config: dict) -> dict:
-    """Merge minimum required tools into fallback_tools, preserving extras."""
-    current = set(config.get("fallback_tools", "").split())
-    extras = sorted(current - _MIN_FALLBACK_TOOLS)
-    config["fallback_tools"] = " ".join(_MIN_FALLBACK_TOOLS_ORDERED + extras)
+    """Merge minimum required tools into fallback_tools, preserving extras in their order."""
+    # dict.fromkeys dedupes in one pass; tools already present keep their first position
+    merged = dict.fromkeys(
+        (*_MIN_FALLBACK_TOOLS_ORDERED, *config.get("fallback_tools", "").split())
+    )
+    config["fallback_tools"] = " ".join(merged)
     return config
 
 
@@ -133,8 +122,11 @@ def _detect_ticket_codes(linear_authenticated: bool, yes: bool = False) -> list:
 
             selected = []
             for part in answer.split(","):
+                stripped = part.strip()
+                if not stripped:
+                    continue  # Trailing or doubled comma
                 try:
-                    idx = int(part.strip()) - 1
+                    idx = int(stripped) - 1
                     if 0 <= idx < len(teams):
                         selected.append(teams[idx]["key"])
                 except ValueError:
@@ -154,7 +146,7 @@ def _detect_ticket_codes(linear_authenticated: bool, yes: bool = False) -> list:
         print()
         return ["ENG"]
     if codes_input:
-        return [c.strip().upper() for c in codes_input.split(",") if c.strip()]
+        return [code for code in (c.strip().upper() for c in codes_input.split(",")) if code]
     return ["ENG"]
 
 
@@ -171,61 +163,67 @@ def _read_file(path: str, max_chars: int = 5000) -> Optional[str]:
 # --- Claude-based config detection ---
 
 
-def _gather_project_files() -> str:
+_PROJECT_FILES = (
+    "README.md",
+    "readme.md",
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "requirements.txt",
+    "package.json",
+    "tsconfig.json",
+    "build.gradle.kts",
+    "build.gradle",
+    "settings.gradle.kts",
+    "pom.xml",
+    "Cargo.toml",
+    "go.mod",
+    "Makefile",
+    "Dockerfile",
+    "docker-compose.yml",
+    ".eslintrc.json",
+    ".eslintrc.js",
+    "eslint.config.js",
+    "ruff.toml",
+    ".ruff.toml",
+    "pnpm-lock.yaml",
+    "yarn.lock",
+    "package-lock.json",
+    "bun.lockb",
+    "bun.lock",
+)
+
+
+def _project_entries() -> set[str]:
+    """Names in the current directory, from one directory read instead of a stat per file."""
+    try:
+        with os.scandir(".") as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+
+def _gather_project_files(names: Optional[set[str]] = None) -> str:
     """List project files that exist, for context in Claude prompt."""
-    files_to_check = [
-        "README.md",
-        "readme.md",
-        "pyproject.toml",
-        "setup.py",
-        "setup.cfg",
-        "requirements.txt",
-        "package.json",
-        "tsconfig.json",
-        "build.gradle.kts",
-        "build.gradle",
-        "settings.gradle.kts",
-        "pom.xml",
-        "Cargo.toml",
-        "go.mod",
-        "Makefile",
-        "Dockerfile",
-        "docker-compose.yml",
-        ".eslintrc.json",
-        ".eslintrc.js",
-        "eslint.config.js",
-        "ruff.toml",
-        ".ruff.toml",
-        "pnpm-lock.yaml",
-        "yarn.lock",
-        "package-lock.json",
-        "bun.lockb",
-        "bun.lock",
-    ]
-    found = [f for f in files_to_check if Path(f).exists()]
+    if names is None:
+        names = _project_entries()
+    found = [f for f in _PROJECT_FILES if f in names]
     return ", ".join(found) if found else "none detected"
 
 
-def _claude_detect_config() -> Optional[dict]:
-    """Use Claude to generate config.yaml by exploring the project."""
-    from lisa.clients.claude import claude
-    from lisa.config.schemas import get_schemas
+def _read_readme(names: set[str], max_chars: int = 3000) -> Optional[str]:
+    """README excerpt, only touching the file the directory listing says exists."""
+    for name in ("README.md", "readme.md"):
+        if name in names:
+            readme = _read_file(name, max_chars=max_chars)
+            if readme:
+                return readme
+    return None
 
-    schemas = get_schemas()
-    schema = schemas.get("init_config")
-    if not schema:
-        error("Missing 'init_config' schema — lisa installation may be corrupted")
-        return None
 
-    found_files = _gather_project_files()
-    readme = _read_file("README.md", max_chars=3000) or _read_file("readme.md", max_chars=3000)
-    readme_section = f"\n\n## README.md (excerpt)\n{readme}" if readme else ""
-
-    prompt = f"""Analyze this project and generate a Lisa CI config.
-
-## Project files found
-{found_files}
-{readme_section}
+# Static detection prompt; only the file list and README excerpt vary per project. They go
+# last so the instructions form a prefix that is identical across projects (prompt caching).
+_DETECT_PROMPT = """Analyze this project and generate a Lisa CI config.
 
 ## What to generate
 A config with these sections:
@@ -261,7 +259,86 @@ Then add build tool permissions like Bash(./gradlew:*), Bash(pnpm:*), Bash(cargo
 - Only include commands for tools that are actually configured
 - For monorepos, detect sub-projects
 - Keep commands concise and correct
-- tests array should not be empty — at minimum detect a test runner"""
+- tests array should not be empty — at minimum detect a test runner
+
+## Project files found
+{found_files}
+{readme_section}"""
+
+
+def _init_cache_file(prompt: str, schema: dict, found: list[str]) -> Path:
+    """Cache entry for a detection run, keyed on the prompt, schema and project file stats."""
+    stats: list = []
+    for name in found:
+        try:
+            st = os.stat(name)
+            stats.append([name, st.st_size, st.st_mtime_ns])
+        except OSError:
+            stats.append([name, None, None])
+    key = json.dumps(
+        {"cwd": os.getcwd(), "prompt": prompt, "schema": schema, "files": stats}, sort_keys=True
+    )
+    return cache_dir("init") / f"{hashlib.sha256(key.encode()).hexdigest()[:16]}.json"
+
+
+def _is_usable_config(data: object) -> TypeGuard[dict]:
+    """Final guard on a detected config; the init_config schema already enforces the rest.
+
+    Covers the cases --json-schema cannot: claude() falling back to plain text output,
+    or a stale cache entry.
+    """
+    return isinstance(data, dict) and bool(data.get("tests"))
+
+
+def _cached_init_config(cache_file: Path) -> Optional[dict]:
+    try:
+        data = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        return None
+    return data if _is_usable_config(data) else None
+
+
+def _store_init_config(cache_file: Path, data: dict) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # Caching is best effort
+
+
+def _claude_detect_config() -> Optional[dict]:
+    """Use Claude to generate config.yaml by exploring the project."""
+    names = _project_entries()
+    if names.isdisjoint(_PROJECT_FILES):
+        # Nothing for Claude to go on (no manifests, lockfiles or README): skip the probe
+        log("No project files detected, skipping Claude stack detection")
+        return None
+
+    from lisa.config.schemas import get_schemas
+
+    schemas = get_schemas()
+    schema = schemas.get("init_config")
+    if not schema:
+        error("Missing 'init_config' schema — lisa installation may be corrupted")
+        return None
+    found_files = _gather_project_files(names)
+    readme = _read_readme(names)
+    readme_section = f"\n\n## README.md (excerpt)\n{readme}" if readme else ""
+
+    prompt = _DETECT_PROMPT.format(found_files=found_files, readme_section=readme_section)
+
+    # Re-inits of an unchanged project reuse the previous answer (LISA_INIT_NOCACHE=1 opts out)
+    cache_file = None
+    if not os.environ.get("LISA_INIT_NOCACHE"):
+        cache_file = _init_cache_file(prompt, schema, [f for f in _PROJECT_FILES if f in names])
+        cached = _cached_init_config(cache_file)
+        if cached:
+            log("Reusing stack detection from a previous init (LISA_INIT_NOCACHE=1 to redo)")
+            return cached
+
+    from lisa.clients.claude import claude
 
     try:
         result = claude(
@@ -284,50 +361,96 @@ Then add build tool permissions like Bash(./gradlew:*), Bash(pnpm:*), Bash(cargo
         warn("Claude returned invalid JSON")
         return None
 
-    if not isinstance(data, dict):
-        warn(f"Claude returned unexpected type: {type(data).__name__}")
-        return None
-    if not data.get("tests"):
-        warn("Claude returned config with no test commands")
+    if not _is_usable_config(data):
+        warn("Claude returned no usable config (expected an object with test commands)")
         return None
+    if cache_file is not None:
+        _store_init_config(cache_file, data)
     return data
 
 
 # --- Config preview and editing ---
 
 
+# Block style, keys in schema order: the written file reads like a hand-edited config
+_YAML_STYLE: dict = {"default_flow_style": False, "sort_keys": False, "width": 120}
+
+
 def _config_to_yaml(config: dict) -> str:
     """Serialize config to YAML with readable formatting."""
-    return yaml.dump(config, default_flow_style=False, sort_keys=False, width=120)
+    return safe_dump(config, None, **_YAML_STYLE)
+
+
+_CONFIG_HEADER = (
+    "# Lisa stack configuration\n"
+    "# See: https://github.com/evenly-energy/lisa#configuration\n"
+    "# Override chain: bundled defaults < ~/.config/lisa/config.yaml < .lisa/config.yaml\n\n"
+)
+
+
+def _write_config(config: dict) -> None:
+    """Write CONFIG_FILE atomically: serialize in memory, write a temp file, rename over.
+
+    A crash or full disk mid-write leaves the previous config intact. Raises OSError.
+    """
+    content = _CONFIG_HEADER + _config_to_yaml(config)
+    LISA_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = CONFIG_FILE.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        tmp.write_text(content)
+        os.replace(tmp, CONFIG_FILE)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
 def _print_config_preview(config: dict) -> None:
     """Pretty-print config to terminal."""
-    yaml_str = _config_to_yaml(config)
-    print(f"\n{BLUE}{'─' * 50}{NC}")
-    print(f"{GREEN}Generated .lisa/config.yaml:{NC}\n")
-    for line in yaml_str.splitlines():
-        if line.startswith("  ") or line.startswith("- "):
-            print(f"  {line}")
+    rule = f"{BLUE}{'─' * 50}{NC}"
+    parts = [f"\n{rule}\n", f"{GREEN}Generated .lisa/config.yaml:{NC}\n\n"]
+    # Dump into a buffer and walk it line by line, skipping the full string and its splitlines copy
+    buf = io.StringIO()
+    safe_dump(config, buf, **_YAML_STYLE)
+    buf.seek(0)
+    for line in buf:
+        line = line.rstrip("\n")
+        # Nested lines and list items plain, top-level keys highlighted
+        if line[:2] in ("  ", "- "):
+            parts.append(f"  {line}\n")
         else:
-            print(f"  {YELLOW}{line}{NC}")
-    print(f"\n{BLUE}{'─' * 50}{NC}")
+            parts.append(f"  {YELLOW}{line}{NC}\n")
+    parts.append(f"\n{rule}\n")
+    # One write for the whole preview instead of a print per line
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
 
 
 def _open_in_editor(content: str) -> Optional[str]:
     """Open content in $EDITOR. Returns edited content or None on failure."""
+    import shlex
+    import subprocess
+    import tempfile
+
     editor = os.environ.get("EDITOR", os.environ.get("VISUAL", "vi"))
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-        f.write(content)
-        tmp_path = f.name
+    # mkstemp opens O_EXCL, mode 0600 and close-on-exec; the fd is closed before the editor runs
+    fd, tmp_path = tempfile.mkstemp(suffix=".yaml")
+    try:
+        data = content.encode()
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
 
     try:
-        result = subprocess.run(shlex.split(editor) + [tmp_path])
+        result = subprocess.run(shlex.split(editor) + [tmp_path], close_fds=True)
         if result.returncode != 0:
             error(f"Editor '{editor}' exited with code {result.returncode}")
             return None
-        return Path(tmp_path).read_text()
+        return Path(tmp_path).read_bytes().decode()
+    except UnicodeDecodeError as e:
+        error(f"Edited config is not valid UTF-8: {e}")
+        return None
     except (OSError, FileNotFoundError):
         error(f"Could not open editor '{editor}'. Set $EDITOR env var.")
         return None
@@ -341,12 +464,19 @@ def _open_in_editor(content: str) -> Optional[str]:
 # --- Skill template loading ---
 
 
+@functools.lru_cache(maxsize=1)
+def _skills_root() -> "Traversable":
+    """Bundled defaults/skills/ directory, resolved through the resource finder once."""
+    import importlib.resources
+
+    return importlib.resources.files("lisa") / "defaults" / "skills"
+
+
+@functools.lru_cache(maxsize=16)
 def _load_skill_template(name: str) -> Optional[str]:
-    """Load a bundled skill template from defaults/skills/."""
+    """Load a bundled skill template from defaults/skills/ (memoized per name)."""
     try:
-        files = importlib.resources.files("lisa")
-        path = files / "defaults" / "skills" / f"{name}.md"
-        return path.read_text()
+        return (_skills_root() / f"{name}.md").read_text()
     except (FileNotFoundError, TypeError):
         dev_path = Path(__file__).parent / "defaults" / "skills" / f"{name}.md"
         if dev_path.exists():
@@ -377,23 +507,37 @@ def _install_skill(name: str, content: str, yes: bool = False) -> bool:
     skill_dir = SKILLS_DIR / name
     skill_file = skill_dir / "SKILL.md"
 
-    if skill_file.exists():
-        if yes:
-            log(f"  Overwriting existing skill '{name}' (--yes)")
-        else:
-            warn(f"Skill '{name}' already exists at {skill_file}")
-            try:
-                answer = input("  Overwrite? [y/N] ").strip().lower()
-            except (EOFError, KeyboardInterrupt):
-                print()
-                return False
-            if answer not in ("y", "yes"):
-                return False
-
+    # Exclusive create: a fresh install is one open, and an existing file surfaces as an error
     try:
         skill_dir.mkdir(parents=True, exist_ok=True)
-        skill_file.write_text(content)
+        with open(skill_file, "x") as f:
+            f.write(content)
+        return True
+    except FileExistsError:
+        pass
+    except OSError as e:
+        error(f"Failed to write skill '{name}': {e}")
+        return False
+
+    if yes:
+        log(f"  Overwriting existing skill '{name}' (--yes)")
+    else:
+        warn(f"Skill '{name}' already exists at {skill_file}")
+        try:
+            answer = input("  Overwrite? [y/N] ").strip().lower()
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return False
+        if answer not in ("y", "yes"):
+            return False
+
+    # Replace via a temp file so an interrupted overwrite never leaves a truncated skill
+    tmp = skill_file.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        tmp.write_text(content)
+        os.replace(tmp, skill_file)
     except OSError as e:
+        tmp.unlink(missing_ok=True)
         error(f"Failed to write skill '{name}': {e}")
         return False
     return True
@@ -482,10 +626,6 @@ def run_init(yes: bool = False) -> None:
 
     config = _ensure_min_fallback_tools(config)
 
-    if not config.get("tests"):
-        warn("Could not auto-detect test commands")
-        log("You can add them manually after init")
-
     # Show preview
     _print_config_preview(config)
 
@@ -507,8 +647,10 @@ def run_init(yes: bool = False) -> None:
             error("Editor failed, aborting")
             sys.exit(1)
         # Validate the edited YAML
+        import yaml
+
         try:
-            config = yaml.safe_load(edited)
+            config = safe_load(edited)
             if not isinstance(config, dict):
                 raise ValueError("Config must be a YAML mapping")
         except (yaml.YAMLError, ValueError) as e:
@@ -530,14 +672,7 @@ def run_init(yes: bool = False) -> None:
 
     # Write config
     try:
-        LISA_DIR.mkdir(parents=True, exist_ok=True)
-        with open(CONFIG_FILE, "w") as f:
-            f.write("# Lisa stack configuration\n")
-            f.write("# See: https://github.com/evenly-energy/lisa#configuration\n")
-            f.write(
-                "# Override chain: bundled defaults < ~/.config/lisa/config.yaml < .lisa/config.yaml\n\n"
-            )
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False, width=120)
+        _write_config(config)
     except OSError as e:
         error(f"Failed to write {CONFIG_FILE}: {e}")
         sys.exit(1)
@@ -548,11 +683,7 @@ def run_init(yes: bool = False) -> None:
 
     available_skills = _get_available_skills(ticket_codes)
     for skill_name, skill_info in available_skills.items():
-        skill_file = SKILLS_DIR / skill_name / "SKILL.md"
-        if skill_file.exists():
-            log(f"  {skill_name}: already installed at {skill_file}")
-            continue
-
+        # No exists() probe: _install_skill's exclusive create detects an installed skill
         print(f"  {YELLOW}{skill_name}{NC}: {skill_info['description']}")
         if not yes:
             try:
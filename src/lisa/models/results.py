@@ -32,7 +32,7 @@ class ReviewResult:
     issues: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenUsage:
     """Token usage from a claude call."""
 
@@ -55,6 +55,15 @@ class TokenUsage:
             self.cost_usd + other.cost_usd,
         )
 
+    def __iadd__(self, other: "TokenUsage") -> "TokenUsage":
+        """Accumulate in place (the tracker's running totals), avoiding a new object per call."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.cache_creation_tokens += other.cache_creation_tokens
+        self.cost_usd += other.cost_usd
+        return self
+
 
 @dataclass
 class VerifyResult:
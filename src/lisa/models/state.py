@@ -118,6 +118,9 @@ class WorkContext:
     final_review_summary: Optional[str] = None
     final_review_issues: Optional[str] = None
 
+    # Subtask details keyed by identifier, prefetched in one batch for all plan steps
+    subtask_details: dict[str, Optional[dict]] = field(default_factory=dict)
+
     @property
     def iteration(self) -> int:
         """Current absolute iteration number."""
@@ -8,7 +8,7 @@ import time
 from typing import Callable, Optional
 
 from lisa.clients.claude import claude, token_tracker, work_claude
-from lisa.clients.linear import fetch_subtask_details
+from lisa.clients.linear import fetch_subtask_details_many
 from lisa.config.prompts import get_prompts
 from lisa.config.schemas import get_schemas
 from lisa.config.settings import get_config
@@ -183,7 +183,15 @@ def handle_execute_work(ctx: WorkContext) -> WorkState:
     # Fetch subtask context if step is associated with a different ticket
     subtask_context = ""
     if ctx.commit_ticket and ctx.commit_ticket != ctx.ticket_id:
-        subtask = fetch_subtask_details(ctx.commit_ticket)
+        if ctx.commit_ticket not in ctx.subtask_details:
+            # Fetch every uncached step ticket at once so later steps don't each round-trip
+            pending = {ctx.commit_ticket}
+            pending.update(
+                t for step in ctx.plan_steps if (t := step.get("ticket")) and t != ctx.ticket_id
+            )
+            pending.difference_update(ctx.subtask_details)
+            ctx.subtask_details.update(fetch_subtask_details_many(sorted(pending)))
+        subtask = ctx.subtask_details.get(ctx.commit_ticket)
         if subtask:
             subtask_context = f"""
 ## Subtask: {subtask["id"]} - {subtask["title"]}
@@ -1,5 +1,6 @@
 """Terminal output helpers with colors and hyperlinks."""
 
+from collections.abc import Mapping
 from typing import Any, Callable, Optional
 
 # Colors
@@ -13,7 +14,7 @@ NC = "\033[0m"
 
 # Module-level references set at runtime to avoid circular imports
 _claude_fn: Optional[Callable[..., str]] = None
-_prompts: Optional[dict[str, Any]] = None
+_prompts: Optional[Mapping[str, Any]] = None
 _schemas: Optional[dict[str, Any]] = None
 
 
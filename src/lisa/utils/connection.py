@@ -0,0 +1,71 @@
+"""Keep-alive HTTPS connections to Linear, shared by the OAuth and GraphQL clients."""
+
+import base64
+import http.client
+from typing import Optional, Union
+from urllib.parse import unquote, urlsplit
+
+
+class StaleConnectionError(ConnectionError):
+    """A kept-alive connection was already closed by the server when the request was sent."""
+
+
+def _https_proxy(host: str) -> Optional[str]:
+    """Return the configured HTTPS proxy URL for host, or None (honors no_proxy)."""
+    # Deferred: only needed when a connection is opened
+    import urllib.request
+
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    return proxy
+
+
+def https_connection(host: str, timeout: float = 30) -> http.client.HTTPSConnection:
+    """Open an HTTPSConnection to host, tunnelling through HTTPS_PROXY when one is set."""
+    proxy = _https_proxy(host)
+    if proxy is None:
+        return http.client.HTTPSConnection(host, timeout=timeout)
+
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    conn = http.client.HTTPSConnection(parts.hostname or "", parts.port or 80, timeout=timeout)
+    headers = {}
+    if parts.username:
+        creds = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(creds.encode()).decode()
+    conn.set_tunnel(host, 443, headers=headers)
+    return conn
+
+
+def send_request(
+    conn: http.client.HTTPSConnection,
+    method: str,
+    path: str,
+    body: Union[str, bytes],
+    headers: dict[str, str],
+) -> tuple[http.client.HTTPResponse, bytes]:
+    """Send one request and read the whole response. Closes conn on any failure.
+
+    Raises StaleConnectionError only when the failure shows the server had dropped the
+    connection before handling the request (reset while sending, or closed without a
+    response), so callers can safely resend on a fresh connection. Anything else, such
+    as a timeout after the request went out, is re-raised as-is: the server may already
+    have acted on it.
+    """
+    try:
+        conn.request(method, path, body=body, headers=headers)
+    except (BrokenPipeError, ConnectionResetError) as e:
+        conn.close()
+        raise StaleConnectionError(str(e)) from e
+    except (http.client.HTTPException, OSError):
+        conn.close()
+        raise
+    try:
+        resp = conn.getresponse()
+        return resp, resp.read()
+    except http.client.RemoteDisconnected as e:
+        conn.close()
+        raise StaleConnectionError(str(e)) from e
+    except (http.client.HTTPException, OSError):
+        conn.close()
+        raise
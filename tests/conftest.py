@@ -1,6 +1,8 @@
 """Shared test fixtures."""
 
+import json
 import subprocess
+import sys
 import time
 
 import pytest
@@ -9,6 +11,33 @@ from lisa.models.core import Assumption, ExplorationFindings
 from lisa.models.state import RunConfig, WorkContext
 
 
+@pytest.fixture(autouse=True)
+def isolated_yaml_cache(tmp_path_factory, monkeypatch):
+    """Keep the parsed-YAML JSON cache out of the real ~/.cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.getbasetemp() / "xdg-cache"))
+
+
+@pytest.fixture
+def modules_loaded_after_import():
+    """Import a module in a fresh interpreter; report which candidates it pulled in.
+
+    Returns a helper (module, candidates, then="") -> list of the candidate module names
+    present in sys.modules afterwards. `then` is extra code run after the import.
+    """
+
+    def check(module: str, candidates: tuple[str, ...], then: str = "") -> list[str]:
+        code = (
+            f"import json, sys, {module}\n{then}\n"
+            f"print(json.dumps([m for m in {candidates!r} if m in sys.modules]))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        return json.loads(result.stdout.splitlines()[-1])
+
+    return check
+
+
 @pytest.fixture
 def sample_assumptions():
     return [
@@ -69,11 +98,13 @@ def reset_token_tracker():
     from lisa.clients.claude import token_tracker
     from lisa.models.results import TokenUsage
 
-    token_tracker.iteration = TokenUsage()
-    token_tracker.total = TokenUsage()
+    token_tracker._pending.clear()
+    token_tracker._iteration = TokenUsage()
+    token_tracker._total = TokenUsage()
     yield
-    token_tracker.iteration = TokenUsage()
-    token_tracker.total = TokenUsage()
+    token_tracker._pending.clear()
+    token_tracker._iteration = TokenUsage()
+    token_tracker._total = TokenUsage()
 
 
 @pytest.fixture
@@ -135,10 +166,10 @@ def sample_work_context(sample_run_config, sample_plan_steps):
 def reset_prompts_cache():
     import lisa.config.prompts as prompts
 
-    prompts._prompts = None
+    prompts._prompts.clear()
     prompts._loaded_sources = []
     yield
-    prompts._prompts = None
+    prompts._prompts.clear()
     prompts._loaded_sources = []
 
 
@@ -1,9 +1,9 @@
 """Tests for lisa.auth."""
 
 import json
-import urllib.error
 from unittest.mock import MagicMock
 
+import pytest
 import time_machine
 
 from lisa.auth import (
@@ -20,18 +20,50 @@ from lisa.auth import (
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_connection(monkeypatch):
+    import lisa.auth as auth_mod
+
+    monkeypatch.setattr(auth_mod, "_conn", None)
+    monkeypatch.setattr(auth_mod, "_token_cache", None)
+
+
+def _mock_connection(mocker, data=None, status=200, side_effect=None):
+    """Patch HTTPSConnection so token requests return `data` as JSON."""
+    conn = mocker.MagicMock()
+    resp = conn.getresponse.return_value
+    resp.status = status
+    resp.reason = "OK" if status < 400 else "Bad Request"
+    resp.read.return_value = json.dumps(data or {}).encode()
+    if side_effect is not None:
+        conn.request.side_effect = side_effect
+    return mocker.patch("lisa.auth.http.client.HTTPSConnection", return_value=conn)
+
+
 class TestGeneratePkce:
     def test_returns_verifier_and_challenge(self):
         verifier, challenge = _generate_pkce()
         assert len(verifier) > 40
         assert len(challenge) > 20
 
+    def test_verifier_length_within_rfc7636_bounds(self):
+        verifier, _ = _generate_pkce()
+        assert 43 <= len(verifier) <= 128
+
     def test_challenge_is_base64url(self):
         _, challenge = _generate_pkce()
         # base64url chars only, no padding
         assert "=" not in challenge
         assert all(c.isalnum() or c in "-_" for c in challenge)
 
+    def test_challenge_is_s256_of_verifier(self):
+        import base64
+        import hashlib
+
+        verifier, challenge = _generate_pkce()
+        digest = hashlib.sha256(verifier.encode()).digest()
+        assert challenge == base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
     def test_unique_each_call(self):
         v1, _ = _generate_pkce()
         v2, _ = _generate_pkce()
@@ -75,6 +107,89 @@ class TestSaveLoadTokens:
         mode = os.stat(tmp_path / "auth.json").st_mode & 0o777
         assert mode == 0o600
 
+    def test_save_replaces_atomically(self, tmp_path, monkeypatch):
+        import lisa.auth as auth_mod
+
+        token_file = tmp_path / "auth.json"
+        monkeypatch.setattr(auth_mod, "TOKEN_DIR", tmp_path)
+        monkeypatch.setattr(auth_mod, "TOKEN_FILE", token_file)
+        _save_tokens({"access_token": "first"})
+        inode = token_file.stat().st_ino
+        _save_tokens({"access_token": "second"})
+        assert token_file.stat().st_ino != inode
+        assert json.loads(token_file.read_text()) == {"access_token": "second"}
+        assert [p.name for p in tmp_path.iterdir()] == ["auth.json"]
+
+    def test_failed_save_removes_temp_file(self, tmp_path, monkeypatch, mocker):
+        import lisa.auth as auth_mod
+
+        token_file = tmp_path / "auth.json"
+        monkeypatch.setattr(auth_mod, "TOKEN_DIR", tmp_path)
+        monkeypatch.setattr(auth_mod, "TOKEN_FILE", token_file)
+        _save_tokens({"access_token": "first"})
+        mocker.patch("lisa.auth.os.replace", side_effect=OSError("disk full"))
+        with pytest.raises(OSError):
+            _save_tokens({"access_token": "second"})
+        assert [p.name for p in tmp_path.iterdir()] == ["auth.json"]
+        assert json.loads(token_file.read_text()) == {"access_token": "first"}
+
+
+class TestTokenCache:
+    def test_unchanged_file_not_reparsed(self, tmp_path, monkeypatch, mocker):
+        import lisa.auth as auth_mod
+
+        monkeypatch.setattr(auth_mod, "TOKEN_DIR", tmp_path)
+        monkeypatch.setattr(auth_mod, "TOKEN_FILE", tmp_path / "auth.json")
+        _save_tokens({"access_token": "at"})
+        auth_mod._token_cache = None
+        spy = mocker.spy(auth_mod.json, "loads")
+        assert _load_tokens() == {"access_token": "at"}
+        assert _load_tokens() == {"access_token": "at"}
+        assert spy.call_count == 1
+
+    def test_reloads_when_file_changes(self, tmp_path, monkeypatch):
+        import lisa.auth as auth_mod
+
+        token_file = tmp_path / "auth.json"
+        monkeypatch.setattr(auth_mod, "TOKEN_FILE", token_file)
+        token_file.write_text(json.dumps({"access_token": "a"}))
+        assert _load_tokens() == {"access_token": "a"}
+        token_file.write_text(json.dumps({"access_token": "bb"}))
+        assert _load_tokens() == {"access_token": "bb"}
+
+    def test_deleted_file_clears_cache(self, tmp_path, monkeypatch):
+        import lisa.auth as auth_mod
+
+        monkeypatch.setattr(auth_mod, "TOKEN_DIR", tmp_path)
+        monkeypatch.setattr(auth_mod, "TOKEN_FILE", tmp_path / "auth.json")
+        _save_tokens({"access_token": "at"})
+        (tmp_path / "auth.json").unlink()
+        assert _load_tokens() is None
+        assert auth_mod._token_cache is None
+
+    @time_machine.travel("2026-01-01 12:00:00")
+    def test_get_token_skips_reparse_when_unchanged(self, tmp_path, monkeypatch, mocker):
+        import time
+
+        import lisa.auth as auth_mod
+
+        monkeypatch.setattr(auth_mod, "TOKEN_DIR", tmp_path)
+        monkeypatch.setattr(auth_mod, "TOKEN_FILE", tmp_path / "auth.json")
+        _save_tokens({"access_token": "valid", "expires_at": time.time() + 3600})
+        parse = mocker.spy(auth_mod.json, "loads")
+        assert get_token() == "valid"
+        assert get_token() == "valid"
+        parse.assert_not_called()
+
+    def test_clear_tokens_resets_cache(self, tmp_path, monkeypatch):
+        import lisa.auth as auth_mod
+
+        monkeypatch.setattr(auth_mod, "TOKEN_DIR", tmp_path)
+        monkeypatch.setattr(auth_mod, "TOKEN_FILE", tmp_path / "auth.json")
+        _save_tokens({"access_token": "at", "expires_at": 9999999999})
+        clear_tokens()
+        assert get_token() is None
+
 
 class TestGetToken:
     @time_machine.travel("2026-01-01 12:00:00")
@@ -94,6 +209,24 @@ class TestGetToken:
         )
         assert get_token() == "valid"
 
+    @time_machine.travel("2026-01-01 12:00:00")
+    def test_picks_up_token_rewritten_by_another_process(self, tmp_path, monkeypatch):
+        import os
+        import time
+
+        import lisa.auth as auth_mod
+
+        token_file = tmp_path / "auth.json"
+        monkeypatch.setattr(auth_mod, "TOKEN_DIR", tmp_path)
+        monkeypatch.setattr(auth_mod, "TOKEN_FILE", token_file)
+        _save_tokens({"access_token": "first", "expires_at": time.time() + 3600})
+        assert get_token() == "first"
+        token_file.write_text(
+            json.dumps({"access_token": "second", "expires_at": time.time() + 3600})
+        )
+        os.utime(token_file, ns=(1, 1))
+        assert get_token() == "second"
+
     @time_machine.travel("2026-01-01 12:00:00")
     def test_expired_token_refreshes(self, tmp_path, monkeypatch, mocker):
         import time
@@ -112,11 +245,7 @@ class TestGetToken:
 
         # Mock refresh
         refresh_data = {"access_token": "new", "refresh_token": "rt2", "expires_in": 36000}
-        mock_resp = mocker.MagicMock()
-        mock_resp.read.return_value = json.dumps(refresh_data).encode()
-        mock_resp.__enter__ = mocker.MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = mocker.MagicMock(return_value=False)
-        mocker.patch("lisa.auth.urllib.request.urlopen", return_value=mock_resp)
+        _mock_connection(mocker, refresh_data)
 
         assert get_token() == "new"
 
@@ -138,14 +267,35 @@ class TestGetToken:
         )
 
         refresh_data = {"access_token": "refreshed", "expires_in": 36000}
-        mock_resp = mocker.MagicMock()
-        mock_resp.read.return_value = json.dumps(refresh_data).encode()
-        mock_resp.__enter__ = mocker.MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = mocker.MagicMock(return_value=False)
-        mocker.patch("lisa.auth.urllib.request.urlopen", return_value=mock_resp)
+        _mock_connection(mocker, refresh_data)
 
         assert get_token() == "refreshed"
 
+    def test_concurrent_callers_share_one_refresh(self, tmp_path, monkeypatch, mocker):
+        import threading
+        import time
+
+        import lisa.auth as auth_mod
+
+        monkeypatch.setattr(auth_mod, "TOKEN_DIR", tmp_path)
+        monkeypatch.setattr(auth_mod, "TOKEN_FILE", tmp_path / "auth.json")
+        _save_tokens({"access_token": "old", "refresh_token": "rt", "expires_at": time.time() - 1})
+
+        def slow_refresh(refresh_token):
+            time.sleep(0.05)
+            return {"access_token": "new", "expires_in": 36000}
+
+        refresh = mocker.patch("lisa.auth._refresh_access_token", side_effect=slow_refresh)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_token())) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == ["new"] * 5
+        assert refresh.call_count == 1
+
     def test_no_tokens(self, tmp_path, monkeypatch):
         import lisa.auth as auth_mod
 
@@ -167,10 +317,7 @@ class TestGetToken:
                 "expires_at": time.time() - 1,
             }
         )
-        mocker.patch(
-            "lisa.auth.urllib.request.urlopen",
-            side_effect=urllib.error.URLError("timeout"),
-        )
+        _mock_connection(mocker, side_effect=OSError("timeout"))
         assert get_token() is None
 
     @time_machine.travel("2026-01-01 12:00:00")
@@ -193,39 +340,110 @@ class TestGetToken:
 class TestExchangeCode:
     def test_success(self, mocker):
         token_data = {"access_token": "at", "refresh_token": "rt"}
-        mock_resp = mocker.MagicMock()
-        mock_resp.read.return_value = json.dumps(token_data).encode()
-        mock_resp.__enter__ = mocker.MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = mocker.MagicMock(return_value=False)
-        mocker.patch("lisa.auth.urllib.request.urlopen", return_value=mock_resp)
+        _mock_connection(mocker, token_data)
         result = _exchange_code("code123", "verifier123")
         assert result["access_token"] == "at"
 
     def test_failure(self, mocker):
-        mocker.patch(
-            "lisa.auth.urllib.request.urlopen",
-            side_effect=urllib.error.URLError("timeout"),
-        )
+        _mock_connection(mocker, side_effect=OSError("timeout"))
         assert _exchange_code("code", "verifier") is None
 
 
 class TestRefreshAccessToken:
     def test_success(self, mocker):
         token_data = {"access_token": "new_at"}
-        mock_resp = mocker.MagicMock()
-        mock_resp.read.return_value = json.dumps(token_data).encode()
-        mock_resp.__enter__ = mocker.MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = mocker.MagicMock(return_value=False)
-        mocker.patch("lisa.auth.urllib.request.urlopen", return_value=mock_resp)
+        _mock_connection(mocker, token_data)
         result = _refresh_access_token("rt")
         assert result["access_token"] == "new_at"
 
     def test_failure(self, mocker):
-        mocker.patch(
-            "lisa.auth.urllib.request.urlopen",
-            side_effect=urllib.error.URLError("err"),
-        )
+        _mock_connection(mocker, side_effect=OSError("err"))
+        assert _refresh_access_token("rt") is None
+
+    def test_http_error_status(self, mocker):
+        _mock_connection(mocker, {"error": "invalid_grant"}, status=400)
+        assert _refresh_access_token("rt") is None
+
+
+class TestPostTokenRequest:
+    def test_reuses_connection(self, mocker):
+        conn_cls = _mock_connection(mocker, {"access_token": "at"})
+        _refresh_access_token("rt")
+        _refresh_access_token("rt")
+        assert conn_cls.call_count == 1
+        assert conn_cls.return_value.request.call_count == 2
+
+    def test_reconnects_on_stale_connection(self, mocker):
+        import lisa.auth as auth_mod
+
+        stale = mocker.MagicMock()
+        stale.request.side_effect = ConnectionResetError("reset")
+        auth_mod._conn = stale
+        conn_cls = _mock_connection(mocker, {"access_token": "fresh"})
+        assert _refresh_access_token("rt") == {"access_token": "fresh"}
+        stale.close.assert_called_once()
+        assert conn_cls.call_count == 1
+
+    def test_timeout_on_reused_connection_not_replayed(self, mocker):
+        import lisa.auth as auth_mod
+
+        stale = mocker.MagicMock()
+        stale.getresponse.side_effect = TimeoutError("timed out")
+        auth_mod._conn = stale
+        conn_cls = _mock_connection(mocker, {"access_token": "fresh"})
+        assert _refresh_access_token("rt") is None
+        stale.request.assert_called_once()
+        conn_cls.assert_not_called()
+        assert auth_mod._conn is None
+
+    def test_close_connection(self, mocker):
+        import lisa.auth as auth_mod
+
+        conn_cls = _mock_connection(mocker, {"access_token": "at"})
+        _refresh_access_token("rt")
+        auth_mod._close_connection()
+        conn_cls.return_value.close.assert_called_once()
+        assert auth_mod._conn is None
+        auth_mod._close_connection()  # No-op when already closed
+
+    def test_prewarm_disabled_by_default(self, monkeypatch, mocker):
+        import lisa.auth as auth_mod
+
+        monkeypatch.delenv("LISA_PREWARM", raising=False)
+        thread = mocker.patch("lisa.auth.threading.Thread")
+        auth_mod._prewarm_connection()
+        thread.assert_not_called()
+
+    def test_prewarm_opt_in(self, monkeypatch, mocker):
+        import lisa.auth as auth_mod
+
+        monkeypatch.setenv("LISA_PREWARM", "1")
+        thread = mocker.patch("lisa.auth.threading.Thread")
+        auth_mod._prewarm_connection()
+        thread.assert_called_once_with(target=auth_mod._warm_connection, daemon=True)
+        thread.return_value.start.assert_called_once()
+
+    def test_warm_connection_pools_socket(self, mocker):
+        import lisa.auth as auth_mod
+
+        conn_cls = _mock_connection(mocker, {"access_token": "at"})
+        auth_mod._warm_connection()
+        conn_cls.return_value.connect.assert_called_once()
+        _refresh_access_token("rt")
+        assert conn_cls.call_count == 1
+
+    def test_warm_connection_failure_ignored(self, mocker):
+        import lisa.auth as auth_mod
+
+        conn_cls = _mock_connection(mocker)
+        conn_cls.return_value.connect.side_effect = OSError("unreachable")
+        auth_mod._warm_connection()
+        assert auth_mod._conn is None
+
+    def test_fresh_connection_failure_not_retried(self, mocker):
+        conn_cls = _mock_connection(mocker, side_effect=OSError("refused"))
         assert _refresh_access_token("rt") is None
+        assert conn_cls.call_count == 1
 
 
 class TestClearTokens:
@@ -268,6 +486,11 @@ class TestCallbackHandler:
         assert _CallbackHandler.error_msg is None
         handler.send_response.assert_called_with(200)
 
+    def test_percent_encoded_values(self):
+        handler = self._make_handler("/callback?code=a%2Fb%3D&state=s%201", expected_state="s 1")
+        handler.do_GET()
+        assert _CallbackHandler.auth_code == "a/b="
+
     def test_error_param(self):
         handler = self._make_handler("/callback?error=access_denied", expected_state="s1")
         handler.do_GET()
@@ -280,12 +503,26 @@ class TestCallbackHandler:
         assert _CallbackHandler.error_msg is not None
         assert "State mismatch" in _CallbackHandler.error_msg
 
+    def test_missing_state(self):
+        handler = self._make_handler("/callback?code=abc", expected_state="expected")
+        handler.do_GET()
+        assert "State mismatch" in _CallbackHandler.error_msg
+        assert _CallbackHandler.auth_code is None
+
+    def test_non_ascii_state_rejected(self):
+        handler = self._make_handler("/callback?code=abc&state=%C3%A6", expected_state="s1")
+        handler.do_GET()
+        assert "State mismatch" in _CallbackHandler.error_msg
+
     def test_missing_code(self):
         handler = self._make_handler("/callback?state=s1", expected_state="s1")
         handler.do_GET()
         assert _CallbackHandler.error_msg is not None
         assert "No authorization code" in _CallbackHandler.error_msg
 
+    def test_disables_nagle(self):
+        assert _CallbackHandler.disable_nagle_algorithm is True
+
     def test_wrong_path(self):
         handler = self._make_handler("/other?code=abc", expected_state="s1")
         handler.do_GET()
@@ -301,9 +538,10 @@ class TestRunCallbackServer:
 
         mock_server.handle_request = handle_request
         mocker.patch("lisa.auth.HTTPServer", return_value=mock_server)
+        mocker.patch("webbrowser.open")
         _CallbackHandler.auth_code = None
         _CallbackHandler.error_msg = None
-        result = _run_callback_server("state123")
+        result = _run_callback_server("state123", "https://auth")
         assert result == "the_code"
 
     def test_error(self, mocker):
@@ -314,20 +552,35 @@ class TestRunCallbackServer:
 
         mock_server.handle_request = handle_request
         mocker.patch("lisa.auth.HTTPServer", return_value=mock_server)
+        mocker.patch("webbrowser.open")
         _CallbackHandler.auth_code = None
         _CallbackHandler.error_msg = None
-        result = _run_callback_server("state123")
+        result = _run_callback_server("state123", "https://auth")
         assert result is None
 
     def test_no_callback(self, mocker):
         mock_server = MagicMock()
         mock_server.handle_request = MagicMock()
         mocker.patch("lisa.auth.HTTPServer", return_value=mock_server)
+        mocker.patch("webbrowser.open")
         _CallbackHandler.auth_code = None
         _CallbackHandler.error_msg = None
-        result = _run_callback_server("state123")
+        result = _run_callback_server("state123", "https://auth")
         assert result is None
 
+    def test_browser_opened_after_server_bound(self, mocker):
+        calls = []
+        mock_server = MagicMock()
+        mock_server.handle_request = lambda: calls.append("handle")
+        mocker.patch(
+            "lisa.auth.HTTPServer",
+            side_effect=lambda *a: calls.append("bind") or mock_server,
+        )
+        mocker.patch("webbrowser.open", side_effect=lambda url: calls.append("browser"))
+        _run_callback_server("state123", "https://auth")
+        assert calls == ["bind", "browser", "handle"]
+        mock_server.server_close.assert_called_once()
+
 
 class TestRunLoginFlow:
     @time_machine.travel("2026-01-01 12:00:00")
@@ -336,7 +589,6 @@ class TestRunLoginFlow:
 
         monkeypatch.setattr(auth_mod, "TOKEN_DIR", tmp_path)
         monkeypatch.setattr(auth_mod, "TOKEN_FILE", tmp_path / "auth.json")
-        mocker.patch("lisa.auth.webbrowser.open")
         mocker.patch("lisa.auth._run_callback_server", return_value="auth_code_123")
         mocker.patch(
             "lisa.auth._exchange_code",
@@ -349,19 +601,30 @@ class TestRunLoginFlow:
         assert saved["access_token"] == "at"
         assert saved["refresh_token"] == "rt"
 
+    def test_auth_url_params(self, mocker):
+        from urllib.parse import parse_qs, urlparse
+
+        server = mocker.patch("lisa.auth._run_callback_server", return_value=None)
+        mocker.patch("lisa.auth._generate_pkce", return_value=("v", "the_challenge"))
+        run_login_flow()
+        state, auth_url = server.call_args[0]
+        params = parse_qs(urlparse(auth_url).query)
+        assert params["client_id"] == ["6491511fa2aaf1debb7ed70af823f113"]
+        assert params["redirect_uri"] == ["http://localhost:19284/callback"]
+        assert params["code_challenge"] == ["the_challenge"]
+        assert params["code_challenge_method"] == ["S256"]
+        assert params["state"] == [state]
+
     def test_no_callback_code(self, mocker):
-        mocker.patch("lisa.auth.webbrowser.open")
         mocker.patch("lisa.auth._run_callback_server", return_value=None)
         assert run_login_flow() is False
 
     def test_exchange_failure(self, mocker):
-        mocker.patch("lisa.auth.webbrowser.open")
         mocker.patch("lisa.auth._run_callback_server", return_value="code")
         mocker.patch("lisa.auth._exchange_code", return_value=None)
         assert run_login_flow() is False
 
     def test_exchange_no_access_token(self, mocker):
-        mocker.patch("lisa.auth.webbrowser.open")
         mocker.patch("lisa.auth._run_callback_server", return_value="code")
         mocker.patch("lisa.auth._exchange_code", return_value={"error": "bad"})
         assert run_login_flow() is False
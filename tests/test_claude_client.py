@@ -10,7 +10,9 @@ class TestClaude:
     def _mock_run(self, mocker, stdout, returncode=0, stderr=""):
         return mocker.patch(
             "lisa.clients.claude.subprocess.run",
-            return_value=subprocess.CompletedProcess([], returncode, stdout=stdout, stderr=stderr),
+            return_value=subprocess.CompletedProcess(
+                [], returncode, stdout=stdout.encode(), stderr=stderr.encode()
+            ),
         )
 
     def test_command_construction(self, mocker, reset_token_tracker):
@@ -50,6 +52,45 @@ class TestClaude:
         claude("hello", model="sonnet", json_schema=schema)
         cmd = mock.call_args[0][0]
         assert "--json-schema" in cmd
+        assert json.loads(cmd[cmd.index("--json-schema") + 1]) == schema
+
+    def test_json_schema_arg_encoded_once(self, mocker, reset_token_tracker):
+        schema = {"type": "object"}
+        self._mock_run(mocker, json.dumps({"result": "ok"}))
+        dumps = mocker.spy(json, "dumps")
+        claude("hello", model="sonnet", json_schema=schema)
+        claude("hello", model="sonnet", json_schema=schema)
+        assert sum(1 for c in dumps.call_args_list if c.args[0] is schema) <= 1
+
+    def test_executable_resolved_once(self, mocker, reset_token_tracker):
+        from lisa.clients.claude import _claude_executable
+
+        _claude_executable.cache_clear()
+        which = mocker.patch("lisa.clients.claude.shutil.which", return_value="/opt/bin/claude")
+        mock = self._mock_run(mocker, json.dumps({"result": "ok"}))
+        claude("hello", model="sonnet")
+        claude("hello", model="sonnet")
+        _claude_executable.cache_clear()
+        assert which.call_count == 1
+        assert mock.call_args.kwargs["executable"] == "/opt/bin/claude"
+        assert mock.call_args[0][0][0] == "claude"
+
+    def test_prompt_sent_as_utf8_bytes(self, mocker, reset_token_tracker):
+        mock = self._mock_run(mocker, json.dumps({"result": "ok"}))
+        claude("héllo", model="sonnet")
+        assert mock.call_args.kwargs["input"] == "héllo".encode()
+        assert "text" not in mock.call_args.kwargs
+
+    def test_non_utf8_output_falls_back(self, mocker, reset_token_tracker):
+        mocker.patch(
+            "lisa.clients.claude.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout=b"\xff\xfe{", stderr=b""),
+        )
+        assert claude("hello", model="sonnet") == "\ufffd\ufffd{"
+
+    def test_whitespace_output_returned_raw(self, mocker, reset_token_tracker):
+        self._mock_run(mocker, "  \n")
+        assert claude("hello", model="sonnet") == "  \n"
 
     def test_result_extraction(self, mocker, reset_token_tracker):
         self._mock_run(mocker, json.dumps({"result": "extracted text"}))
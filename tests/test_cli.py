@@ -1,10 +1,15 @@
 """Tests for lisa.cli."""
 
+import subprocess
 import sys
 
 import pytest
 
 from lisa.cli import (
+    _build_ticket_parser,
+    _rename_preflight_branch,
+    _sniff_mode,
+    _start_update_check,
     log_config,
     parse_args,
     print_review_report,
@@ -14,6 +19,68 @@ from lisa.cli import (
 from lisa.models.state import RunConfig
 
 
+class TestLazyImports:
+    def test_import_cli_skips_heavy_modules(self, modules_loaded_after_import):
+        heavy = ("lisa.phases", "lisa.clients", "lisa.git", "lisa.state")
+        assert modules_loaded_after_import("lisa.cli", heavy) == []
+
+    def test_get_token_path_skips_browser_modules(self, modules_loaded_after_import):
+        assert modules_loaded_after_import("lisa.auth", ("webbrowser",)) == []
+
+
+class TestMainFastPaths:
+    def test_version(self, monkeypatch, capsys):
+        from lisa.cli import main
+
+        monkeypatch.setattr(sys, "argv", ["lisa", "--version"])
+        with pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 0
+        assert capsys.readouterr().out.startswith("lisa ")
+
+    def test_help_handled_by_argparse(self, monkeypatch, capsys):
+        from lisa.cli import main
+
+        monkeypatch.setattr(sys, "argv", ["lisa", "--help"])
+        with pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 0
+        assert "How it works:" in capsys.readouterr().out
+
+
+class TestSniffMode:
+    @pytest.mark.parametrize(
+        ("argv", "expected"),
+        [
+            (["lisa", "login"], "login"),
+            (["lisa", "logout"], "logout"),
+            (["lisa", "init", "-y"], "init"),
+            (["lisa", "upgrade", "0.4.1"], "upgrade"),
+            (["lisa", "--version"], "version"),
+            (["lisa", "-v"], "version"),
+            (["lisa"], "ticket"),
+            (["lisa", "--help"], "ticket"),
+            (["lisa", "ENG-123", "--dry-run"], "ticket"),
+            (["lisa", "--dry-run", "ENG-123"], "ticket"),
+        ],
+    )
+    def test_modes(self, argv, expected):
+        assert _sniff_mode(argv) == expected
+
+
+class TestBuildTicketParser:
+    def test_help_includes_epilog(self):
+        help_text = _build_ticket_parser().format_help()
+        assert "How it works:" in help_text
+        assert "lisa ENG-123 --dry-run" in help_text
+
+    def test_epilog_loaded_only_for_help(self):
+        parser = _build_ticket_parser()
+        assert parser.epilog is None
+        parser.format_help()
+        assert parser.epilog.lstrip().startswith("Commands:")
+
+
 class TestParseArgs:
     def test_single_ticket(self, monkeypatch):
         monkeypatch.setattr(sys, "argv", ["lisa", "ENG-123"])
@@ -126,6 +193,16 @@ class TestParseArgs:
         assert config.debug is True
         assert config.effort == "low"
 
+    def test_version_flag_after_ticket(self, monkeypatch, capsys, mocker):
+        import lisa.cli as cli_mod
+
+        mocker.patch.object(cli_mod, "_get_version", return_value="1.2.3")
+        monkeypatch.setattr(sys, "argv", ["lisa", "ENG-1", "--version"])
+        with pytest.raises(SystemExit) as exc:
+            parse_args()
+        assert exc.value.code == 0
+        assert capsys.readouterr().out == "lisa 1.2.3\n"
+
     def test_no_ticket_exits(self, monkeypatch):
         monkeypatch.setattr(sys, "argv", ["lisa"])
         with pytest.raises(SystemExit):
@@ -150,6 +227,96 @@ class TestValidateEnv:
             validate_env()
 
 
+class TestStartUpdateCheck:
+    def test_warns_when_update_available(self, capsys, mocker):
+        mocker.patch("lisa.cli._get_version", return_value="0.4.0")
+        mocker.patch("lisa.update.check_for_update", return_value="0.5.0")
+        _start_update_check()()
+        assert "0.4.0 -> 0.5.0" in capsys.readouterr().out
+
+    def test_silent_when_check_fails(self, capsys, mocker):
+        mocker.patch("lisa.cli._get_version", return_value="0.4.0")
+        mocker.patch("lisa.update.check_for_update", side_effect=RuntimeError("boom"))
+        _start_update_check()()
+        assert "Update available" not in capsys.readouterr().out
+
+    def test_slow_check_reported_on_later_poll(self, capsys, mocker):
+        import threading
+
+        release = threading.Event()
+
+        def slow_check(_version):
+            release.wait()
+            return "0.5.0"
+
+        mocker.patch("lisa.cli._get_version", return_value="0.4.0")
+        mocker.patch("lisa.update.check_for_update", side_effect=slow_check)
+        report = _start_update_check()
+        report(timeout=0)
+        assert "Update available" not in capsys.readouterr().out
+        release.set()
+        report(timeout=5)
+        report(timeout=5)
+        assert capsys.readouterr().out.count("0.4.0 -> 0.5.0") == 1
+
+    def test_unfinished_check_is_dropped(self, capsys, mocker):
+        import threading
+
+        release = threading.Event()
+        mocker.patch("lisa.cli._get_version", return_value="0.4.0")
+        mocker.patch("lisa.update.check_for_update", side_effect=lambda _v: release.wait())
+        report = _start_update_check()
+        report(timeout=0)
+        report(timeout=0)
+        release.set()
+        assert "Update available" not in capsys.readouterr().out
+
+
+class TestRenamePreflightBranch:
+    @pytest.fixture
+    def git(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+            monkeypatch.setenv(var, "t")
+        for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+            monkeypatch.setenv(var, "t@t")
+
+        def run(*args):
+            result = subprocess.run(
+                ["git", "-c", "commit.gpgsign=false", *args],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            return result.stdout.strip()
+
+        run("init", "-q", "-b", "main")
+        run("commit", "-q", "--allow-empty", "-m", "init")
+        return run
+
+    def test_renames_over_existing_branch(self, git):
+        git("branch", "eng-1-foo")
+        git("checkout", "-q", "-b", "lisa-preflight-1")
+        git("commit", "-q", "--allow-empty", "-m", "preflight")
+        assert _rename_preflight_branch("lisa-preflight-1", "eng-1-foo")
+        assert git("branch", "--show-current") == "eng-1-foo"
+        assert git("rev-parse", "eng-1-foo") == git("rev-parse", "HEAD")
+        assert git("branch", "--list", "lisa-preflight-1") == ""
+
+    def test_fails_when_target_checked_out_elsewhere(self, git, tmp_path):
+        git("branch", "eng-1-foo")
+        git("worktree", "add", "-q", str(tmp_path / "other"), "eng-1-foo")
+        git("checkout", "-q", "-b", "lisa-preflight-1")
+        assert not _rename_preflight_branch("lisa-preflight-1", "eng-1-foo")
+        # Preflight branch is left in place for the caller's fallback and cleanup
+        assert git("branch", "--show-current") == "lisa-preflight-1"
+
+    def test_fails_when_preflight_branch_gone(self, git):
+        git("checkout", "-q", "--detach")
+        assert not _rename_preflight_branch("lisa-preflight-1", "eng-1-foo")
+        assert git("branch", "--list", "eng-1-foo") == ""
+
+
 class TestLogConfig:
     def _mock_config_deps(self, mocker):
         mocker.patch("lisa.config.prompts.get_prompts", return_value={})
@@ -164,6 +331,18 @@ class TestLogConfig:
         assert "ENG-123" in out
         assert "Max iterations" in out
 
+    def test_overrides_deduped_in_order(self, capsys, mocker, sample_run_config):
+        self._mock_config_deps(mocker)
+        mocker.patch(
+            "lisa.config.get_loaded_sources", return_value=["defaults", "b.yaml", "a.yaml"]
+        )
+        mocker.patch(
+            "lisa.config.get_config_loaded_sources",
+            return_value=["defaults", "a.yaml", "c.yaml"],
+        )
+        log_config(sample_run_config)
+        assert "Config overrides: b.yaml, a.yaml, c.yaml" in capsys.readouterr().out
+
     def test_multi_ticket(self, capsys, mocker):
         config = RunConfig(
             ticket_ids=["ENG-1", "ENG-2"],
@@ -200,8 +379,8 @@ class TestLogConfig:
 
 class TestShowDryRunStatus:
     def test_shows_ticket_info(self, capsys, mocker):
-        mocker.patch("lisa.cli.list_branches_matching", return_value=["eng-1-foo"])
-        mocker.patch("lisa.cli.get_current_branch", return_value="eng-1-foo")
+        mocker.patch("lisa.git.branch.list_branches_matching", return_value=["eng-1-foo"])
+        mocker.patch("lisa.git.branch.get_current_branch", return_value="eng-1-foo")
         ticket = {"title": "Fix bug", "description": "Details"}
         plan_steps = [
             {"id": 1, "description": "Step one", "done": True},
@@ -214,6 +393,20 @@ class TestShowDryRunStatus:
         assert "Step one" in out
         assert "1/2 steps done" in out
 
+    def test_steps_files_and_next_step(self, capsys, mocker, sample_plan_steps):
+        mocker.patch("lisa.git.branch.list_branches_matching", return_value=[])
+        mocker.patch("lisa.git.branch.get_current_branch", return_value="")
+        with pytest.raises(SystemExit):
+            show_dry_run_status("ENG-71", {"title": "T"}, sample_plan_steps, 2, 0)
+        out = capsys.readouterr().out
+        assert "1/3 steps done" in out
+        assert "✓ 1 (ENG-71): Setup base config" in out
+        assert "○ 2 (ENG-72): Implement endpoint ← current" in out
+        assert "src/api/handler.py (template: rest_handler)" in out
+        assert "src/api/routes.py (detail: add new route)" in out
+        assert "Next step:\033[0m Implement endpoint" in out
+        assert "Remaining:\033[0m 2 steps" in out
+
 
 class TestPrintReviewReport:
     def test_approved(self, capsys):
@@ -2,6 +2,7 @@
 
 from pathlib import Path
 
+import pytest
 import yaml
 
 import lisa.config.prompts as prompts_mod
@@ -58,14 +59,33 @@ class TestGetPrompts:
         second = get_prompts()
         assert first is second
 
-    def test_returns_dict(self, reset_prompts_cache):
+    def test_returns_read_only_view(self, reset_prompts_cache):
         result = get_prompts()
-        assert isinstance(result, dict)
+        assert result is prompts_mod.PROMPTS
+        assert "work" in result
+        with pytest.raises(TypeError):
+            result["work"] = {}  # type: ignore[index]
 
 
 class TestReloadPrompts:
-    def test_refreshes_cache(self, reset_prompts_cache):
+    def test_refreshes_in_place(self, tmp_path, monkeypatch, reset_prompts_cache):
         first = get_prompts()
+        assert "custom_key" not in first
+        override_file = tmp_path / "prompts.yaml"
+        override_file.write_text(yaml.dump({"custom_key": "x"}))
+        monkeypatch.setattr(prompts_mod, "PROJECT_CONFIG", override_file)
         second = reload_prompts()
-        assert first is not second
-        assert isinstance(second, dict)
+        assert second is first
+        assert first["custom_key"] == "x"
+
+
+class TestGetLoadedSources:
+    def test_loads_on_first_access(self, reset_prompts_cache):
+        assert get_loaded_sources()[0] == "defaults"
+        assert prompts_mod._prompts
+
+    def test_does_not_reload(self, mocker, reset_prompts_cache):
+        get_prompts()
+        load = mocker.patch.object(prompts_mod, "load_prompts")
+        get_loaded_sources()
+        load.assert_not_called()
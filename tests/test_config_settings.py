@@ -74,3 +74,18 @@ class TestGetConfig:
         settings.get_config()
         settings.reload_config()
         assert load_mock.call_count == 2
+
+    def test_reload_refreshes_fallback_tools(self, mocker, reset_config_cache):
+        from lisa.clients.claude import get_fallback_tools
+
+        mocker.patch("lisa.config.settings.load_yaml", return_value=None)
+        mocker.patch.object(settings, "_load_defaults", return_value={"fallback_tools": "Read "})
+        assert get_fallback_tools() == "Read"
+        settings._load_defaults.return_value = {"fallback_tools": "Edit"}
+        assert get_fallback_tools() == "Read"
+        settings.reload_config()
+        assert get_fallback_tools() == "Edit"
+
+    def test_reload_does_not_import_clients(self, modules_loaded_after_import):
+        then = "lisa.config.settings.reload_config()"
+        assert modules_loaded_after_import("lisa.config.settings", ("lisa.clients",), then) == []
@@ -1,6 +1,13 @@
 """Tests for lisa.config.utils."""
 
-from lisa.config.utils import deep_merge, load_yaml
+import hashlib
+import json
+
+import pytest
+import yaml
+
+import lisa.config.utils as utils_mod
+from lisa.config.utils import deep_merge, load_cached_yaml, load_yaml, safe_dump, safe_load
 
 
 class TestDeepMerge:
@@ -49,6 +56,16 @@ class TestDeepMerge:
         deep_merge(base, {"a": {"b": {"d": 2}}})
         assert "d" not in base["a"]["b"]
 
+    def test_untouched_subtrees_shared(self):
+        base = {"a": {"b": 1}, "z": {"y": 2}}
+        result = deep_merge(base, {"a": {"c": 3}})
+        assert result["z"] is base["z"]
+        assert result["a"] is not base["a"]
+
+    def test_empty_override_returns_base(self):
+        base = {"a": 1}
+        assert deep_merge(base, {}) is base
+
 
 class TestLoadYaml:
     def test_valid_yaml(self, tmp_path):
@@ -60,6 +77,15 @@ class TestLoadYaml:
     def test_missing_file(self, tmp_path):
         assert load_yaml(tmp_path / "nope.yaml") is None
 
+    def test_missing_parent_dir(self, tmp_path):
+        (tmp_path / "file").write_text("")
+        assert load_yaml(tmp_path / "file" / "nope.yaml") is None
+
+    def test_utf8_content(self, tmp_path):
+        f = tmp_path / "utf8.yaml"
+        f.write_bytes("greeting: héllo ✓\n".encode())
+        assert load_yaml(f) == {"greeting": "héllo ✓"}
+
     def test_empty_file(self, tmp_path):
         f = tmp_path / "empty.yaml"
         f.write_text("")
@@ -74,3 +100,94 @@ class TestLoadYaml:
         f = tmp_path / "scalar.yaml"
         f.write_text("just a string\n")
         assert load_yaml(f) is None
+
+
+class TestLazyImports:
+    def test_import_config_skips_yaml(self, modules_loaded_after_import):
+        assert modules_loaded_after_import("lisa.config", ("yaml", "importlib.resources")) == []
+
+
+class TestSafeLoad:
+    def test_parses_mapping(self):
+        assert safe_load("a:\n  b: [1, 2]\n") == {"a": {"b": [1, 2]}}
+
+    def test_uses_libyaml_when_available(self):
+        if yaml.__with_libyaml__:
+            assert utils_mod._safe_loader() is yaml.CSafeLoader
+
+    def test_rejects_python_tags(self):
+        with pytest.raises(yaml.YAMLError):
+            safe_load("!!python/object/apply:os.system ['true']")
+
+
+class TestSafeDump:
+    def test_returns_string_without_stream(self):
+        out = safe_dump({"b": 1, "a": [1, 2]}, default_flow_style=False, sort_keys=False)
+        assert out == "b: 1\na:\n- 1\n- 2\n"
+
+    def test_writes_to_stream(self, tmp_path):
+        path = tmp_path / "out.yaml"
+        with open(path, "w") as f:
+            assert safe_dump({"a": 1}, f) is None
+        assert safe_load(path.read_text()) == {"a": 1}
+
+    def test_uses_libyaml_when_available(self):
+        if yaml.__with_libyaml__:
+            assert utils_mod._safe_dumper() is yaml.CSafeDumper
+
+
+def _cache_file(path):
+    return (
+        utils_mod._yaml_cache_dir() / f"{hashlib.sha256(str(path).encode()).hexdigest()[:16]}.json"
+    )
+
+
+class TestLoadCachedYaml:
+    def test_second_load_skips_parse(self, tmp_path, mocker):
+        f = tmp_path / "defaults.yaml"
+        f.write_text("a: 1\n")
+        assert load_cached_yaml(f) == {"a": 1}
+        parse = mocker.patch.object(utils_mod, "safe_load")
+        assert load_cached_yaml(f) == {"a": 1}
+        parse.assert_not_called()
+
+    def test_edit_invalidates(self, tmp_path):
+        import os
+
+        f = tmp_path / "defaults.yaml"
+        f.write_text("a: 1\n")
+        load_cached_yaml(f)
+        f.write_text("a: 22\n")
+        os.utime(f, ns=(1, 1))
+        assert load_cached_yaml(f) == {"a": 22}
+
+    def test_corrupt_cache_reparses(self, tmp_path):
+        f = tmp_path / "defaults.yaml"
+        f.write_text("a: 1\n")
+        load_cached_yaml(f)
+        for entry in utils_mod._yaml_cache_dir().iterdir():
+            entry.write_bytes(b"garbage")
+        assert load_cached_yaml(f) == {"a": 1}
+
+    def test_cache_is_json(self, tmp_path):
+        f = tmp_path / "defaults.yaml"
+        f.write_text("a: [1, x]\n")
+        load_cached_yaml(f)
+        assert json.loads(_cache_file(f).read_text())["data"] == {"a": [1, "x"]}
+
+    def test_lossy_data_not_cached(self, tmp_path):
+        f = tmp_path / "defaults.yaml"
+        f.write_text("1: one\nwhen: 2024-01-01\n")
+        assert load_cached_yaml(f)[1] == "one"
+        assert not _cache_file(f).exists()
+
+    def test_wrong_shape_cache_reparses(self, tmp_path):
+        f = tmp_path / "defaults.yaml"
+        f.write_text("a: 1\n")
+        load_cached_yaml(f)
+        _cache_file(f).write_text("[1, 2]")
+        assert load_cached_yaml(f) == {"a": 1}
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_cached_yaml(tmp_path / "nope.yaml")
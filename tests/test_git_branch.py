@@ -2,7 +2,11 @@
 
 import subprocess
 
+import pytest
+
+import lisa.git.branch as branch_mod
 from lisa.git.branch import (
+    _local_branches,
     create_or_get_branch,
     determine_branch_name,
     find_next_suffix,
@@ -10,10 +14,24 @@ from lisa.git.branch import (
     get_base_slug,
     get_current_branch,
     get_default_branch,
+    invalidate_branch_cache,
     list_branches_matching,
+    scan_ticket_branches,
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_branch_cache():
+    invalidate_branch_cache()
+    yield
+    invalidate_branch_cache()
+
+
+class TestLazyImports:
+    def test_import_git_skips_claude_client(self, modules_loaded_after_import):
+        assert modules_loaded_after_import("lisa.git", ("lisa.clients.claude",)) == []
+
+
 class TestGetBaseSlug:
     def test_numeric_suffix_stripped(self):
         assert get_base_slug("eng-71-trade-mon-3", "eng-71") == "eng-71-trade-mon"
@@ -30,6 +48,12 @@ class TestGetBaseSlug:
     def test_multi_word(self):
         assert get_base_slug("eng-71-add-user-auth-5", "eng-71") == "eng-71-add-user-auth"
 
+    def test_trailing_dash_kept(self):
+        assert get_base_slug("eng-71-foo-", "eng-71") == "eng-71-foo-"
+
+    def test_suffix_only_kept(self):
+        assert get_base_slug("eng-71-3", "eng-71") == "eng-71-3"
+
 
 class TestFindNextSuffix:
     def test_no_existing(self):
@@ -47,7 +71,24 @@ class TestFindNextSuffix:
     def test_non_numeric_ignored(self):
         assert find_next_suffix(["eng-71-foo", "eng-71-foo-bar"], "eng-71-foo") == 2
 
+    def test_non_decimal_digits_ignored(self):
+        assert find_next_suffix(["eng-71-foo-²"], "eng-71-foo") == 2
+
+
+def _make_git_dir(root, head):
+    git_dir = root / ".git"
+    git_dir.mkdir()
+    (git_dir / "HEAD").write_text(head)
+    return git_dir
+
+
+@pytest.fixture
+def no_git_dir(mocker):
+    # Exercise the git fallbacks; the in-process readers have their own tests
+    mocker.patch("lisa.git.branch._git_dir", return_value=None)
+
 
+@pytest.mark.usefixtures("no_git_dir")
 class TestGetCurrentBranch:
     def test_returns_branch(self, mocker):
         mocker.patch(
@@ -71,6 +112,42 @@ class TestGetCurrentBranch:
         assert get_current_branch() == ""
 
 
+class TestReadHeadBranch:
+    def test_branch_from_head(self, tmp_path, monkeypatch, mocker):
+        _make_git_dir(tmp_path, "ref: refs/heads/eng-1-foo\n")
+        (tmp_path / "sub").mkdir()
+        monkeypatch.chdir(tmp_path / "sub")
+        run = mocker.patch("lisa.git.branch.subprocess.run")
+        assert get_current_branch() == "eng-1-foo"
+        run.assert_not_called()
+
+    def test_detached_head(self, tmp_path, monkeypatch):
+        _make_git_dir(tmp_path, "0123456789abcdef0123456789abcdef01234567\n")
+        monkeypatch.chdir(tmp_path)
+        assert get_current_branch() == ""
+
+    def test_worktree_gitdir_file(self, tmp_path, monkeypatch):
+        wt_meta = tmp_path / "repo" / ".git" / "worktrees" / "wt"
+        wt_meta.mkdir(parents=True)
+        (wt_meta / "HEAD").write_text("ref: refs/heads/feature/x\n")
+        worktree = tmp_path / "wt"
+        worktree.mkdir()
+        (worktree / ".git").write_text(f"gitdir: {wt_meta}\n")
+        monkeypatch.chdir(worktree)
+        assert get_current_branch() == "feature/x"
+
+    def test_git_dir_env_falls_back_to_git(self, tmp_path, monkeypatch, mocker):
+        _make_git_dir(tmp_path, "ref: refs/heads/local\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("GIT_DIR", str(tmp_path / ".git"))
+        mocker.patch(
+            "lisa.git.branch.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="from-git\n", stderr=""),
+        )
+        assert get_current_branch() == "from-git"
+
+
+@pytest.mark.usefixtures("no_git_dir")
 class TestGetDefaultBranch:
     def test_from_origin_head(self, mocker):
         mocker.patch(
@@ -86,7 +163,7 @@ class TestGetDefaultBranch:
             "lisa.git.branch.subprocess.run",
             side_effect=[
                 subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # symbolic-ref fails
-                subprocess.CompletedProcess([], 0, stdout="hash\n", stderr=""),  # main exists
+                subprocess.CompletedProcess([], 0, stdout="feat\nmain\n", stderr=""),
             ],
         )
         assert get_default_branch() == "main"
@@ -96,8 +173,7 @@ class TestGetDefaultBranch:
             "lisa.git.branch.subprocess.run",
             side_effect=[
                 subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # symbolic-ref fails
-                subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # main not found
-                subprocess.CompletedProcess([], 0, stdout="hash\n", stderr=""),  # master exists
+                subprocess.CompletedProcess([], 0, stdout="master\n", stderr=""),  # no main
             ],
         )
         assert get_default_branch() == "master"
@@ -110,17 +186,49 @@ class TestGetDefaultBranch:
         assert get_default_branch() == ""
 
 
+@pytest.mark.usefixtures("no_git_dir")
 class TestListBranchesMatching:
     def test_returns_sorted(self, mocker):
         mocker.patch(
             "lisa.git.branch.subprocess.run",
             return_value=subprocess.CompletedProcess(
-                [], 0, stdout="  eng-71-foo\n* eng-71-bar\n", stderr=""
+                [], 0, stdout="eng-71-foo\neng-71-bar\nmain\n", stderr=""
             ),
         )
         result = list_branches_matching("eng-71-*")
         assert result == ["eng-71-bar", "eng-71-foo"]
 
+    def test_reads_refs_once(self, mocker):
+        run = mocker.patch(
+            "lisa.git.branch.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="eng-7-a\n", stderr=""),
+        )
+        list_branches_matching("eng-7-*")
+        assert run.call_count == 1
+        assert run.call_args[0][0][:2] == ["git", "for-each-ref"]
+
+    def test_memoized_across_patterns(self, mocker):
+        run = mocker.patch(
+            "lisa.git.branch.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="eng-1-a\neng-2-b\n", stderr=""),
+        )
+        assert list_branches_matching("eng-1-*") == ["eng-1-a"]
+        assert list_branches_matching("eng-2-*") == ["eng-2-b"]
+        assert run.call_count == 1
+
+    def test_invalidate_rereads(self, mocker):
+        run = mocker.patch(
+            "lisa.git.branch.subprocess.run",
+            side_effect=[
+                subprocess.CompletedProcess([], 0, stdout="eng-1-a\n", stderr=""),
+                subprocess.CompletedProcess([], 0, stdout="eng-1-a\neng-1-a-2\n", stderr=""),
+            ],
+        )
+        assert list_branches_matching("eng-1-*") == ["eng-1-a"]
+        invalidate_branch_cache()
+        assert list_branches_matching("eng-1-*") == ["eng-1-a", "eng-1-a-2"]
+        assert run.call_count == 2
+
     def test_empty(self, mocker):
         mocker.patch(
             "lisa.git.branch.subprocess.run",
@@ -136,44 +244,160 @@ class TestListBranchesMatching:
         assert list_branches_matching("*") == []
 
 
+class TestReadLocalBranches:
+    def test_loose_and_packed_refs(self, tmp_path, monkeypatch, mocker):
+        git_dir = _make_git_dir(tmp_path, "ref: refs/heads/main\n")
+        (git_dir / "refs" / "heads" / "feature").mkdir(parents=True)
+        (git_dir / "refs" / "heads" / "main").write_text("a" * 40 + "\n")
+        (git_dir / "refs" / "heads" / "feature" / "x").write_text("b" * 40 + "\n")
+        (git_dir / "refs" / "heads" / "main.lock").write_text("")
+        (git_dir / "packed-refs").write_text(
+            "# pack-refs with: peeled fully-peeled sorted\n"
+            f"{'c' * 40} refs/heads/eng-1-old\n"
+            f"{'d' * 40} refs/tags/v1\n"
+            f"^{'e' * 40}\n"
+            f"{'a' * 40} refs/heads/main\n"
+        )
+        monkeypatch.chdir(tmp_path)
+        run = mocker.patch("lisa.git.branch.subprocess.run")
+        assert sorted(_local_branches()) == ["eng-1-old", "feature/x", "main"]
+        run.assert_not_called()
+
+    def test_worktree_uses_common_dir(self, tmp_path, monkeypatch):
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        git_dir = _make_git_dir(repo, "ref: refs/heads/main\n")
+        (git_dir / "refs" / "heads").mkdir(parents=True)
+        (git_dir / "refs" / "heads" / "eng-2-a").write_text("a" * 40 + "\n")
+        wt_meta = git_dir / "worktrees" / "wt"
+        wt_meta.mkdir(parents=True)
+        (wt_meta / "HEAD").write_text("ref: refs/heads/eng-2-a\n")
+        (wt_meta / "commondir").write_text("../..\n")
+        worktree = tmp_path / "wt"
+        worktree.mkdir()
+        (worktree / ".git").write_text(f"gitdir: {wt_meta}\n")
+        monkeypatch.chdir(worktree)
+        assert list_branches_matching("eng-2-*") == ["eng-2-a"]
+
+    def test_reftable_falls_back_to_git(self, tmp_path, monkeypatch, mocker):
+        git_dir = _make_git_dir(tmp_path, "ref: refs/heads/.invalid\n")
+        (git_dir / "refs" / "heads").mkdir(parents=True)
+        (git_dir / "reftable").mkdir()
+        monkeypatch.chdir(tmp_path)
+        mocker.patch(
+            "lisa.git.branch.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="from-git\n", stderr=""),
+        )
+        assert _local_branches() == ("from-git",)
+
+
 class TestGenerateSlug:
+    @pytest.fixture(autouse=True)
+    def slug_env(self, tmp_path, monkeypatch, mocker):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        mocker.patch(
+            "lisa.config.prompts.get_prompts",
+            return_value={"slug": {"template": "slug {max_len} {title} {description}"}},
+        )
+        mocker.patch("lisa.config.schemas.get_schemas", return_value={"slug": {"type": "object"}})
+
+    def test_cached_on_disk(self, mocker):
+        claude = mocker.patch("lisa.clients.claude.claude", return_value='{"slug": "add-auth"}')
+        assert generate_slug("Add auth", "Desc", 20) == "add-auth"
+        assert generate_slug("Add auth", "Desc", 20) == "add-auth"
+        assert claude.call_count == 1
+        generate_slug("Add auth", "Other", 20)
+        assert claude.call_count == 2
+
+    def test_expired_entry_regenerated(self, mocker):
+        import os
+
+        claude = mocker.patch("lisa.clients.claude.claude", return_value='{"slug": "add-auth"}')
+        generate_slug("Add auth", "Desc", 20)
+        for entry in (branch_mod.cache_dir("slugs")).iterdir():
+            os.utime(entry, (0, 0))
+        generate_slug("Add auth", "Desc", 20)
+        assert claude.call_count == 2
+
+    def test_fallback_not_cached(self, mocker):
+        claude = mocker.patch("lisa.clients.claude.claude", return_value='{"slug": ""}')
+        assert generate_slug("T", "D", 20) == "work"
+        generate_slug("T", "D", 20)
+        assert claude.call_count == 2
+
     def test_generates_slug(self, mocker):
         import json
 
         mocker.patch(
-            "lisa.git.branch.get_prompts",
+            "lisa.config.prompts.get_prompts",
             return_value={
                 "slug": {"template": "slug {max_len} {title} {description}"},
             },
         )
         mocker.patch(
-            "lisa.git.branch.get_schemas",
+            "lisa.config.schemas.get_schemas",
             return_value={
                 "slug": {"type": "object"},
             },
         )
-        mocker.patch("lisa.git.branch.claude", return_value=json.dumps({"slug": "add-auth"}))
+        mocker.patch("lisa.clients.claude.claude", return_value=json.dumps({"slug": "add-auth"}))
         result = generate_slug("Add authentication", "Details", 20)
         assert result == "add-auth"
 
     def test_json_parse_fallback(self, mocker):
         mocker.patch(
-            "lisa.git.branch.get_prompts",
+            "lisa.config.prompts.get_prompts",
             return_value={
                 "slug": {"template": "slug {max_len} {title} {description}"},
             },
         )
         mocker.patch(
-            "lisa.git.branch.get_schemas",
+            "lisa.config.schemas.get_schemas",
             return_value={
                 "slug": {"type": "object"},
             },
         )
-        mocker.patch("lisa.git.branch.claude", return_value="add-auth-handler")
+        mocker.patch("lisa.clients.claude.claude", return_value="add-auth-handler")
         result = generate_slug("Add auth", "Desc", 20)
         assert result == "add-auth-handler"
 
 
+class TestScanTicketBranches:
+    @pytest.fixture
+    def branches(self, mocker):
+        def set_branches(*names):
+            mocker.patch("lisa.git.branch._local_branches", return_value=names)
+
+        return set_branches
+
+    def test_no_branches(self, branches):
+        branches("main", "eng-10-foo")
+        assert scan_ticket_branches("eng-1") is None
+
+    def test_unsuffixed_base_counts_as_one(self, branches):
+        branches("eng-1-foo")
+        assert scan_ticket_branches("eng-1") == ("eng-1-foo", 1)
+
+    def test_highest_suffix_for_base(self, branches):
+        branches("eng-1-foo-5", "main", "eng-1-foo", "eng-1-foo-2", "eng-1-foo-bar")
+        assert scan_ticket_branches("eng-1") == ("eng-1-foo", 5)
+
+    def test_matches_three_pass_result(self, branches):
+        names = ("eng-1-b-9", "eng-1-a-3", "eng-1-a-x-7", "eng-1-a-0", "eng-1-a")
+        branches(*names)
+        existing = list_branches_matching("eng-1-*")
+        base = get_base_slug(existing[0], "eng-1")
+        assert scan_ticket_branches("eng-1") == (base, find_next_suffix(existing, base) - 1)
+
+    def test_explicit_base_matches_three_pass_result(self, branches):
+        names = ("eng-1-a-3", "eng-1-b-9", "eng-1-b", "eng-1-c")
+        branches(*names)
+        existing = list_branches_matching("eng-1-*")
+        for base in ("eng-1-b", "eng-1-c"):
+            expected = (base, find_next_suffix(existing, base) - 1)
+            assert scan_ticket_branches("eng-1", base) == expected
+
+
 class TestDetermineBranchName:
     def test_already_on_ticket_branch(self, mocker):
         mocker.patch("lisa.git.branch.get_current_branch", return_value="eng-1-foo")
@@ -183,7 +407,7 @@ class TestDetermineBranchName:
 
     def test_no_existing_branches(self, mocker):
         mocker.patch("lisa.git.branch.get_current_branch", return_value="main")
-        mocker.patch("lisa.git.branch.list_branches_matching", return_value=[])
+        mocker.patch("lisa.git.branch._local_branches", return_value=())
         mocker.patch("lisa.git.branch.generate_slug", return_value="add-auth")
         branch, exists = determine_branch_name("ENG-1", "Add auth", "Desc")
         assert branch == "eng-1-add-auth"
@@ -191,7 +415,7 @@ class TestDetermineBranchName:
 
     def test_existing_branches_increments(self, mocker):
         mocker.patch("lisa.git.branch.get_current_branch", return_value="main")
-        mocker.patch("lisa.git.branch.list_branches_matching", return_value=["eng-1-foo"])
+        mocker.patch("lisa.git.branch._local_branches", return_value=("eng-1-foo",))
         branch, exists = determine_branch_name("ENG-1", "Title", "Desc")
         assert branch == "eng-1-foo-2"
         assert exists is False
@@ -205,7 +429,7 @@ class TestCreateOrGetBranch:
 
     def test_creates_new_branch(self, mocker):
         mocker.patch("lisa.git.branch.get_current_branch", return_value="main")
-        mocker.patch("lisa.git.branch.list_branches_matching", return_value=[])
+        mocker.patch("lisa.git.branch._local_branches", return_value=())
         mocker.patch("lisa.git.branch.generate_slug", return_value="add-auth")
         mocker.patch(
             "lisa.git.branch.subprocess.run",
@@ -216,7 +440,7 @@ class TestCreateOrGetBranch:
 
     def test_create_fails(self, mocker):
         mocker.patch("lisa.git.branch.get_current_branch", return_value="main")
-        mocker.patch("lisa.git.branch.list_branches_matching", return_value=[])
+        mocker.patch("lisa.git.branch._local_branches", return_value=())
         mocker.patch("lisa.git.branch.generate_slug", return_value="work")
         mocker.patch(
             "lisa.git.branch.subprocess.run",
@@ -226,7 +450,7 @@ class TestCreateOrGetBranch:
 
     def test_increments_existing(self, mocker):
         mocker.patch("lisa.git.branch.get_current_branch", return_value="main")
-        mocker.patch("lisa.git.branch.list_branches_matching", return_value=["eng-1-foo"])
+        mocker.patch("lisa.git.branch._local_branches", return_value=("eng-1-foo",))
         mocker.patch(
             "lisa.git.branch.subprocess.run",
             return_value=subprocess.CompletedProcess([], 0, stdout="", stderr=""),
@@ -236,7 +460,7 @@ class TestCreateOrGetBranch:
 
     def test_spice_mode(self, mocker):
         mocker.patch("lisa.git.branch.get_current_branch", return_value="main")
-        mocker.patch("lisa.git.branch.list_branches_matching", return_value=[])
+        mocker.patch("lisa.git.branch._local_branches", return_value=())
         mocker.patch("lisa.git.branch.generate_slug", return_value="work")
         mocker.patch(
             "lisa.git.branch.subprocess.run",
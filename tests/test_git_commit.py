@@ -1,8 +1,13 @@
 """Tests for lisa.git.commit helper functions."""
 
 import subprocess
+import sys
+
+import pytest
 
 from lisa.git.commit import (
+    _commit_sha,
+    _read_head,
     format_assumptions_trailer,
     get_changed_files,
     get_diff_summary,
@@ -63,7 +68,7 @@ class TestGetChangedFiles:
         mocker.patch(
             "lisa.git.commit.subprocess.run",
             return_value=subprocess.CompletedProcess(
-                [], 0, stdout=" M src/foo.py\n M src/bar.py\n", stderr=""
+                [], 0, stdout=" M src/foo.py\0 M src/bar.py\0", stderr=""
             ),
         )
         result = get_changed_files()
@@ -73,7 +78,7 @@ class TestGetChangedFiles:
     def test_untracked_files(self, mocker):
         mocker.patch(
             "lisa.git.commit.subprocess.run",
-            return_value=subprocess.CompletedProcess([], 0, stdout="?? new_file.py\n", stderr=""),
+            return_value=subprocess.CompletedProcess([], 0, stdout="?? new_file.py\0", stderr=""),
         )
         result = get_changed_files()
         assert "new_file.py" in result
@@ -82,14 +87,23 @@ class TestGetChangedFiles:
         mocker.patch(
             "lisa.git.commit.subprocess.run",
             return_value=subprocess.CompletedProcess(
-                [], 0, stdout="R  old.py -> new.py\n", stderr=""
+                [], 0, stdout="R  new.py\0old.py\0 M other.py\0", stderr=""
             ),
         )
         result = get_changed_files()
-        assert "new.py" in result
+        assert result == ["new.py", "other.py"]
+
+    def test_worktree_side_rename(self, mocker):
+        mocker.patch(
+            "lisa.git.commit.subprocess.run",
+            return_value=subprocess.CompletedProcess(
+                [], 0, stdout=" R moved.txt\0c d.txt\0 C copy.txt\0orig.txt\0", stderr=""
+            ),
+        )
+        assert get_changed_files() == ["moved.txt", "copy.txt"]
 
     def test_mixed_status(self, mocker):
-        stdout = " M src/mod.py\n?? new.py\nA  added.py\n"
+        stdout = " M src/mod.py\0?? new.py\0A  added.py\0"
         mocker.patch(
             "lisa.git.commit.subprocess.run",
             return_value=subprocess.CompletedProcess([], 0, stdout=stdout, stderr=""),
@@ -97,53 +111,122 @@ class TestGetChangedFiles:
         result = get_changed_files()
         assert len(result) == 3
 
+    def test_path_with_spaces_unquoted(self, mocker):
+        mocker.patch(
+            "lisa.git.commit.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="?? my file.py\0", stderr=""),
+        )
+        assert get_changed_files() == ["my file.py"]
+
+
+class TestReadHead:
+    def test_returns_full_short_output(self):
+        assert _read_head([sys.executable, "-c", "print('hello')"]).strip() == "hello"
+
+    def test_caps_long_output(self):
+        code = "import sys; sys.stdout.write('x' * 1_000_000)"
+        assert _read_head([sys.executable, "-c", code], limit=100) == "x" * 100
+
+
+def _by_command(outputs):
+    """_read_head side effect answering each git subcommand, whatever the call order."""
+
+    def read(cmd, limit=1024):
+        key = "stat" if "--stat" in cmd else cmd[1]
+        return outputs.get(key, "")
+
+    return read
+
 
 class TestGetDiffSummary:
     def test_with_changes(self, mocker):
         mocker.patch(
-            "lisa.git.commit.subprocess.run",
-            side_effect=[
-                subprocess.CompletedProcess([], 0, stdout="2 files changed", stderr=""),
-                subprocess.CompletedProcess([], 0, stdout="+new line\n-old line", stderr=""),
-                subprocess.CompletedProcess([], 0, stdout="", stderr=""),
-            ],
+            "lisa.git.commit._read_head",
+            side_effect=_by_command({"stat": "2 files changed", "diff": "+new line\n-old line"}),
         )
         result = get_diff_summary()
-        assert "files changed" in result
+        assert result.startswith("2 files changed\n")
+        assert "+new line" in result
 
     def test_no_changes_fallback_to_status(self, mocker):
         mocker.patch(
-            "lisa.git.commit.subprocess.run",
-            side_effect=[
-                subprocess.CompletedProcess([], 0, stdout="", stderr=""),
-                subprocess.CompletedProcess([], 0, stdout="", stderr=""),
-                subprocess.CompletedProcess([], 0, stdout="?? new_file.py", stderr=""),
-            ],
+            "lisa.git.commit._read_head",
+            side_effect=_by_command({"status": "?? new_file.py"}),
         )
         result = get_diff_summary()
         assert "New files" in result
 
+    def test_runs_all_three_commands(self, mocker):
+        read = mocker.patch("lisa.git.commit._read_head", side_effect=_by_command({}))
+        get_diff_summary()
+        assert sorted(c[0][0][1] for c in read.call_args_list) == ["diff", "diff", "status"]
+
     def test_completely_empty(self, mocker):
-        mocker.patch(
-            "lisa.git.commit.subprocess.run",
-            return_value=subprocess.CompletedProcess([], 0, stdout="", stderr=""),
-        )
+        mocker.patch("lisa.git.commit._read_head", return_value="")
         assert get_diff_summary() == "no changes"
 
 
 class TestSummarizeForCommit:
     def test_calls_claude(self, mocker):
-        mocker.patch("lisa.git.commit.claude", return_value="  add auth handler  ")
+        mocker.patch("lisa.clients.claude.claude", return_value="  add auth handler  ")
         result = summarize_for_commit("Add authentication handler to the API endpoint")
         assert result == "add auth handler"
 
 
+class TestCommitSha:
+    @pytest.mark.parametrize(
+        ("output", "expected"),
+        [
+            ("[main abc1234] feat: add\n 1 file changed\n", "abc1234"),
+            ("[main (root-commit) 0f1e2d3] init\n", "0f1e2d3"),
+            ("[detached HEAD 9a8b7c6] wip\n", "9a8b7c6"),
+            ("hook output\n[eng-1-foo 1234abcd] fix\n", "1234abcd"),
+            ("", None),
+            ("[main] not a summary\n", None),
+        ],
+    )
+    def test_parses_summary_line(self, output, expected):
+        assert _commit_sha(output) == expected
+
+    def test_real_commit_output(self, tmp_path):
+        def git(*args):
+            return subprocess.run(
+                [
+                    "git",
+                    "-C",
+                    str(tmp_path),
+                    "-c",
+                    "user.name=t",
+                    "-c",
+                    "user.email=t@t",
+                    "-c",
+                    "commit.gpgsign=false",
+                    *args,
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+
+        git("init", "-q")
+        (tmp_path / "a.txt").write_text("a")
+        git("add", "a.txt")
+        result = git("commit", "-m", "init")
+        head = git("rev-parse", "HEAD").stdout.strip()
+        sha = _commit_sha(result.stdout)
+        assert sha is not None and head.startswith(sha)
+
+
 class TestGitCommit:
+    @pytest.fixture(autouse=True)
+    def no_pre_commit(self, mocker):
+        mocker.patch("lisa.git.commit._pre_commit_available", return_value=False)
+
     def _mock_subprocess(self, mocker, commit_rc=0):
         """Setup subprocess mock for git commit flow."""
         calls = [
-            subprocess.CompletedProcess([], 0, stdout=" M src/a.py\n", stderr=""),  # status
             subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # diff --cached --quiet
             subprocess.CompletedProcess(
                 [], commit_rc, stdout="", stderr="hook failed" if commit_rc else ""
             ),  # commit
@@ -154,6 +237,18 @@ class TestGitCommit:
             )  # rev-parse
         return mocker.patch("lisa.git.commit.subprocess.run", side_effect=calls)
 
+    def test_sha_from_commit_output_skips_rev_parse(self, mocker):
+        run = mocker.patch(
+            "lisa.git.commit.subprocess.run",
+            side_effect=[
+                subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+                subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # diff --cached --quiet
+                subprocess.CompletedProcess([], 0, stdout="[main abc1234] feat\n", stderr=""),
+            ],
+        )
+        assert git_commit("ENG-1", 1, "step 1") is True
+        assert run.call_count == 3
+
     def test_no_changes(self, mocker):
         mocker.patch(
             "lisa.git.commit.subprocess.run",
@@ -169,27 +264,37 @@ class TestGitCommit:
     def test_with_files_to_add(self, mocker):
         mock_run = self._mock_subprocess(mocker)
         git_commit("ENG-1", 1, "step 1", files_to_add=["src/a.py"])
-        # Second call is git add -- src/a.py
-        add_call = mock_run.call_args_list[1]
+        # First call is git add -- src/a.py
+        add_call = mock_run.call_args_list[0]
         assert "src/a.py" in add_call[0][0]
 
     def test_with_iter_state(self, mocker):
-        self._mock_subprocess(mocker)
+        mock_run = self._mock_subprocess(mocker)
         iter_state = {
-            "test_errors": [],
+            "test_errors": ["line one\r\nline two"],
             "review_issues": ["minor style"],
         }
-        git_commit("ENG-1", 1, "step 1", iter_state=iter_state)
+        git_commit("ENG-1", 3, "fix: step 1", task_body="Body", iter_state=iter_state)
+        msg = mock_run.call_args_list[2][0][0][-1]
+        assert msg == (
+            "fix(lisa): [ENG-1] step 1\n\nBody\n\n"
+            "Lisa-Iteration: 3\n"
+            "Lisa-Status: FAIL\n"
+            "Lisa-Test-Error: line one line two\n"
+            "Lisa-Review-Issues: minor style"
+        )
 
     def test_with_assumptions(self, mocker):
-        self._mock_subprocess(mocker)
+        mock_run = self._mock_subprocess(mocker)
         assumptions = [Assumption(id="P.1", selected=True, statement="Use cache")]
         git_commit("ENG-1", 1, "step 1", assumptions=assumptions)
+        msg = mock_run.call_args_list[2][0][0][-1]
+        assert msg == "feat(lisa): [ENG-1] step 1\nLisa-Assumptions: Use cache"
 
     def test_hook_failure_with_fix(self, mocker):
         calls = [
-            subprocess.CompletedProcess([], 0, stdout=" M src/a.py\n", stderr=""),  # status
             subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # diff --cached --quiet
             subprocess.CompletedProcess(
                 [], 1, stdout="", stderr="hook: lint error"
             ),  # commit fails
@@ -202,14 +307,86 @@ class TestGitCommit:
             subprocess.CompletedProcess([], 0, stdout="def5678\n", stderr=""),  # rev-parse
         ]
         mocker.patch("lisa.git.commit.subprocess.run", side_effect=calls)
-        mocker.patch("lisa.git.commit.work_claude", return_value="fixed")
+        mocker.patch("lisa.clients.claude.work_claude", return_value="fixed")
         result = git_commit("ENG-1", 1, "step 1", model="opus")
         assert result is True
 
+    def test_staged_files_read_once_across_attempts(self, mocker):
+        calls = [
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # diff --cached --quiet
+            subprocess.CompletedProcess([], 1, stdout="", stderr="lint"),  # commit fails
+            subprocess.CompletedProcess([], 0, stdout="src/a.py\n", stderr=""),  # diff --cached
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr="lint"),  # commit fails
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # commit
+            subprocess.CompletedProcess([], 0, stdout="abc\n", stderr=""),  # rev-parse
+        ]
+        run = mocker.patch("lisa.git.commit.subprocess.run", side_effect=calls)
+        fix = mocker.patch("lisa.clients.claude.work_claude", return_value="fixed")
+        assert git_commit("ENG-1", 1, "step 1", model="opus") is True
+        assert fix.call_count == 2
+        cached = [c for c in run.call_args_list if "--name-only" in c[0][0]]
+        assert len(cached) == 1
+
+    def test_restages_after_every_fix_attempt(self, mocker):
+        calls = [
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # diff --cached --quiet
+            subprocess.CompletedProcess([], 1, stdout="", stderr="lint"),  # commit fails
+            subprocess.CompletedProcess([], 0, stdout="a.py\n", stderr=""),  # diff --cached
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add (first attempt)
+            subprocess.CompletedProcess([], 1, stdout="", stderr="lint"),  # commit fails
+            # Second attempt re-adds even if the file looks unchanged (same size/mtime)
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 0, stdout="[main abc1234] x\n", stderr=""),
+        ]
+        run = mocker.patch("lisa.git.commit.subprocess.run", side_effect=calls)
+        mocker.patch("lisa.clients.claude.work_claude", return_value="nothing to do")
+        assert git_commit("ENG-1", 1, "step 1", model="opus") is True
+        adds = [c for c in run.call_args_list if c[0][0][:2] == ["git", "add"]]
+        assert len(adds) == 3
+
+    def test_effort_escalates_after_first_attempt(self, mocker):
+        calls = [
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # diff --cached --quiet
+            subprocess.CompletedProcess([], 1, stdout="", stderr="lint"),  # commit fails
+            subprocess.CompletedProcess([], 0, stdout="src/a.py\n", stderr=""),  # diff --cached
+        ] + [
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr="lint"),  # commit fails
+        ] * 2
+        calls.append(subprocess.CompletedProcess([], 0, stdout="", stderr=""))  # --no-verify
+        calls.append(subprocess.CompletedProcess([], 0, stdout="abc\n", stderr=""))  # rev-parse
+        mocker.patch("lisa.git.commit.subprocess.run", side_effect=calls)
+        fix = mocker.patch("lisa.clients.claude.work_claude", return_value="fixed")
+        git_commit("ENG-1", 1, "step 1", model="opus", max_hook_fix_attempts=2)
+        assert [c.kwargs["effort"] for c in fix.call_args_list] == ["low", "medium"]
+
+    def test_pre_commit_autofix_avoids_model(self, mocker):
+        mocker.patch("lisa.git.commit._pre_commit_available", return_value=True)
+        calls = [
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # diff --cached --quiet
+            subprocess.CompletedProcess([], 1, stdout="", stderr="black"),  # commit fails
+            subprocess.CompletedProcess([], 0, stdout="src/a.py\n", stderr=""),  # diff --cached
+            subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # pre-commit run
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # commit
+            subprocess.CompletedProcess([], 0, stdout="abc\n", stderr=""),  # rev-parse
+        ]
+        run = mocker.patch("lisa.git.commit.subprocess.run", side_effect=calls)
+        fix = mocker.patch("lisa.clients.claude.work_claude")
+        assert git_commit("ENG-1", 1, "step 1", model="opus") is True
+        fix.assert_not_called()
+        assert run.call_args_list[4][0][0] == ["pre-commit", "run", "--files", "src/a.py"]
+
     def test_hook_failure_falls_back_to_no_verify(self, mocker):
         calls = [
-            subprocess.CompletedProcess([], 0, stdout=" M src/a.py\n", stderr=""),  # status
             subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # diff --cached --quiet
             subprocess.CompletedProcess([], 1, stdout="", stderr="hook err"),  # commit fails
             # --no-verify
             subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # commit --no-verify
@@ -221,8 +398,8 @@ class TestGitCommit:
 
     def test_commit_failure_no_verify_disabled(self, mocker):
         calls = [
-            subprocess.CompletedProcess([], 0, stdout=" M src/a.py\n", stderr=""),  # status
             subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # diff --cached --quiet
             subprocess.CompletedProcess([], 1, stdout="", stderr="hook err"),  # commit fails
         ]
         mocker.patch("lisa.git.commit.subprocess.run", side_effect=calls)
@@ -231,8 +408,8 @@ class TestGitCommit:
 
     def test_push_on_success(self, mocker):
         calls = [
-            subprocess.CompletedProcess([], 0, stdout=" M src/a.py\n", stderr=""),  # status
             subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # add
+            subprocess.CompletedProcess([], 1, stdout="", stderr=""),  # diff --cached --quiet
             subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # commit
             subprocess.CompletedProcess([], 0, stdout="abc\n", stderr=""),  # rev-parse
             subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # push
@@ -241,9 +418,17 @@ class TestGitCommit:
         result = git_commit("ENG-1", 1, "step 1", push=True)
         assert result is True
 
-    def test_git_status_error(self, mocker):
+    def test_git_add_error(self, mocker):
         mocker.patch(
             "lisa.git.commit.subprocess.run",
             return_value=subprocess.CompletedProcess([], 128, stdout="", stderr="fatal"),
         )
         assert git_commit("ENG-1", 1, "step 1") is False
+
+    def test_no_staged_changes_skips_commit(self, mocker):
+        run = mocker.patch(
+            "lisa.git.commit.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="", stderr=""),
+        )
+        assert git_commit("ENG-1", 1, "step 1", files_to_add=["src/a.py"]) is True
+        assert [c[0][0][:2] for c in run.call_args_list] == [["git", "add"], ["git", "diff"]]
@@ -0,0 +1,53 @@
+"""Tests for lisa.git.process."""
+
+import subprocess
+
+import pytest
+
+from lisa.git.process import git_env, run_git
+
+
+@pytest.fixture(autouse=True)
+def fresh_env(monkeypatch):
+    monkeypatch.delenv("LC_ALL", raising=False)
+    git_env.cache_clear()
+    yield
+    git_env.cache_clear()
+
+
+class TestGitEnv:
+    def test_skips_optional_locks_and_pager(self):
+        env = git_env()
+        assert env["GIT_OPTIONAL_LOCKS"] == "0"
+        assert env["GIT_PAGER"] == "cat"
+
+    def test_c_locale_only_for_read_only(self):
+        assert "LC_ALL" not in git_env()
+        assert git_env(read_only=True)["LC_ALL"] == "C"
+
+    def test_inherits_environment(self, monkeypatch):
+        monkeypatch.setenv("LISA_TEST_VAR", "1")
+        git_env.cache_clear()
+        assert git_env()["LISA_TEST_VAR"] == "1"
+
+    def test_built_once(self):
+        assert git_env(read_only=True) is git_env(read_only=True)
+
+
+class TestRunGit:
+    def test_runs_git_with_shared_env(self, mocker):
+        run = mocker.patch(
+            "lisa.git.process.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="main\n", stderr=""),
+        )
+        result = run_git("branch", "--show-current", read_only=True)
+        assert result.stdout == "main\n"
+        run.assert_called_once_with(
+            ["git", "branch", "--show-current"],
+            capture_output=True,
+            text=True,
+            env=git_env(read_only=True),
+        )
+
+    def test_real_git_version(self):
+        assert run_git("--version", read_only=True).stdout.startswith("git version")
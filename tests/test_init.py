@@ -1,12 +1,37 @@
 """Tests for lisa.init pure helper functions."""
 
+import json
+import os
+import shlex
+import sys
+
+import pytest
+
+import lisa.init as init_mod
 from lisa.init import (
+    _DETECT_PROMPT,
+    _claude_detect_config,
     _config_to_yaml,
+    _detect_ticket_codes,
     _ensure_min_fallback_tools,
     _gather_project_files,
+    _install_skill,
+    _load_skill_template,
+    _open_in_editor,
     _print_config_preview,
+    _project_entries,
     _read_file,
+    _read_readme,
+    _write_config,
+    run_init,
 )
+from lisa.ui.output import NC, YELLOW
+
+
+class TestLazyImports:
+    def test_import_init_skips_conditional_modules(self, modules_loaded_after_import):
+        candidates = ("yaml", "subprocess", "shlex", "tempfile", "importlib.resources")
+        assert modules_loaded_after_import("lisa.init", candidates) == []
 
 
 class TestEnsureMinFallbackTools:
@@ -37,30 +62,25 @@ class TestEnsureMinFallbackTools:
         tools = result["fallback_tools"].split()
         assert tools.count("Read") == 1
 
-    def test_extras_sorted(self):
-        config = {"fallback_tools": "Bash(pnpm:*) Bash(cargo:*)"}
+    def test_min_tools_first_then_extras_in_order(self):
+        config = {"fallback_tools": "Bash(pnpm:*) Read Bash(cargo:*) Bash(pnpm:*)"}
         result = _ensure_min_fallback_tools(config)
         tools = result["fallback_tools"].split()
-        # Extras should be sorted alphabetically after the min tools
-        extras = [
-            t
-            for t in tools
-            if t
-            not in {
-                "Read",
-                "Edit",
-                "Write",
-                "Grep",
-                "Glob",
-                "Skill",
-                "Bash(git:*)",
-                "Bash(cd:*)",
-                "Bash(ls:*)",
-                "Bash(mkdir:*)",
-                "Bash(rm:*)",
-            }
-        ]
-        assert extras == sorted(extras)
+        assert tools[:3] == ["Read", "Edit", "Write"]
+        assert tools[-2:] == ["Bash(pnpm:*)", "Bash(cargo:*)"]
+        assert len(tools) == 13
+
+
+class TestDetectTicketCodes:
+    def test_manual_prefixes_normalized(self, mocker):
+        mocker.patch("builtins.input", return_value=" eng, fe ,,be,")
+        assert _detect_ticket_codes(False) == ["ENG", "FE", "BE"]
+
+    def test_team_selection_ignores_empty_parts(self, mocker):
+        teams = [{"key": "ENG", "name": "Eng"}, {"key": "FE", "name": "Front"}]
+        mocker.patch("lisa.clients.linear.fetch_teams", return_value=teams)
+        mocker.patch("builtins.input", return_value="2, ,x,")
+        assert _detect_ticket_codes(True) == ["FE"]
 
 
 class TestConfigToYaml:
@@ -79,6 +99,30 @@ class TestConfigToYaml:
         assert tests_pos < format_pos < fallback_pos
 
 
+class TestWriteConfig:
+    @pytest.fixture(autouse=True)
+    def lisa_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(init_mod, "LISA_DIR", tmp_path / ".lisa")
+        monkeypatch.setattr(init_mod, "CONFIG_FILE", tmp_path / ".lisa" / "config.yaml")
+        return tmp_path / ".lisa"
+
+    def test_writes_header_and_yaml(self, lisa_dir):
+        _write_config({"tests": [{"name": "Tests", "run": "pytest"}]})
+        text = (lisa_dir / "config.yaml").read_text()
+        assert text.startswith("# Lisa stack configuration\n")
+        assert "tests:\n- name: Tests\n  run: pytest\n" in text
+        assert [p.name for p in lisa_dir.iterdir()] == ["config.yaml"]
+
+    def test_failed_write_keeps_previous_config(self, lisa_dir, mocker):
+        lisa_dir.mkdir()
+        (lisa_dir / "config.yaml").write_text("old")
+        mocker.patch("lisa.init.os.replace", side_effect=OSError("disk full"))
+        with pytest.raises(OSError):
+            _write_config({"tests": []})
+        assert (lisa_dir / "config.yaml").read_text() == "old"
+        assert [p.name for p in lisa_dir.iterdir()] == ["config.yaml"]
+
+
 class TestPrintConfigPreview:
     def test_outputs_yaml(self, capsys):
         config = {"tests": [{"name": "pytest", "run": "pytest"}]}
@@ -87,6 +131,13 @@ class TestPrintConfigPreview:
         assert "config.yaml" in out
         assert "pytest" in out
 
+    def test_highlights_top_level_keys_only(self, capsys):
+        _print_config_preview({"tests": [{"name": "pytest"}], "fallback_tools": "Read"})
+        lines = capsys.readouterr().out.splitlines()
+        assert f"  {YELLOW}tests:{NC}" in lines
+        assert "  - name: pytest" in lines
+        assert f"  {YELLOW}fallback_tools: Read{NC}" in lines
+
 
 class TestReadFile:
     def test_reads(self, tmp_path):
@@ -106,6 +157,105 @@ class TestReadFile:
         assert result is None
 
 
+class TestOpenInEditor:
+    def test_returns_edited_content_and_cleans_up(self, monkeypatch, tmp_path):
+        seen = tmp_path / "seen.txt"
+        script = (
+            "import sys; p = sys.argv[1]; "
+            f"open({str(seen)!r}, 'w').write(p); "
+            "open(p, 'a').write('b: 2\\n')"
+        )
+        monkeypatch.setenv("EDITOR", f"{shlex.quote(sys.executable)} -c {shlex.quote(script)}")
+        assert _open_in_editor("a: 1\n") == "a: 1\nb: 2\n"
+        assert not os.path.exists(seen.read_text())
+
+    def test_editor_failure(self, monkeypatch):
+        monkeypatch.setenv("EDITOR", f"{shlex.quote(sys.executable)} -c 'raise SystemExit(3)'")
+        assert _open_in_editor("a: 1\n") is None
+
+    def test_non_utf8_edit_is_reported(self, monkeypatch, capsys):
+        script = "import sys; open(sys.argv[1], 'ab').write(bytes([0xff]))"
+        monkeypatch.setenv("EDITOR", f"{shlex.quote(sys.executable)} -c {shlex.quote(script)}")
+        assert _open_in_editor("a: 1\n") is None
+        assert "not valid UTF-8" in capsys.readouterr().out
+
+
+class TestInstallSkill:
+    @pytest.fixture(autouse=True)
+    def skills_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(init_mod, "SKILLS_DIR", tmp_path / "skills")
+        return tmp_path / "skills"
+
+    def test_fresh_install(self, skills_dir):
+        assert _install_skill("demo", "content") is True
+        assert (skills_dir / "demo" / "SKILL.md").read_text() == "content"
+
+    def test_existing_declined(self, skills_dir, mocker):
+        (skills_dir / "demo").mkdir(parents=True)
+        (skills_dir / "demo" / "SKILL.md").write_text("old")
+        mocker.patch("builtins.input", return_value="n")
+        assert _install_skill("demo", "new") is False
+        assert (skills_dir / "demo" / "SKILL.md").read_text() == "old"
+
+    def test_existing_overwritten_with_yes(self, skills_dir):
+        (skills_dir / "demo").mkdir(parents=True)
+        (skills_dir / "demo" / "SKILL.md").write_text("old")
+        assert _install_skill("demo", "new", yes=True) is True
+        assert (skills_dir / "demo" / "SKILL.md").read_text() == "new"
+        assert [p.name for p in (skills_dir / "demo").iterdir()] == ["SKILL.md"]
+
+    def test_failed_overwrite_keeps_existing(self, skills_dir, mocker):
+        (skills_dir / "demo").mkdir(parents=True)
+        (skills_dir / "demo" / "SKILL.md").write_text("old")
+        mocker.patch("lisa.init.os.replace", side_effect=OSError("disk full"))
+        assert _install_skill("demo", "new", yes=True) is False
+        assert (skills_dir / "demo" / "SKILL.md").read_text() == "old"
+        assert [p.name for p in (skills_dir / "demo").iterdir()] == ["SKILL.md"]
+
+
+class TestRunInitSkills:
+    @pytest.fixture(autouse=True)
+    def init_env(self, tmp_path, monkeypatch, mocker):
+        monkeypatch.setattr(init_mod, "LISA_DIR", tmp_path / ".lisa")
+        monkeypatch.setattr(init_mod, "CONFIG_FILE", tmp_path / ".lisa" / "config.yaml")
+        monkeypatch.setattr(init_mod, "SKILLS_DIR", tmp_path / "skills")
+        mocker.patch("lisa.init._try_linear_auth", return_value=False)
+        mocker.patch("lisa.init._detect_ticket_codes", return_value=["ENG"])
+        mocker.patch("lisa.init._claude_detect_config", return_value={"tests": [{"run": "t"}]})
+        mocker.patch("lisa.init._print_howto")
+        mocker.patch(
+            "lisa.init._get_available_skills",
+            return_value={"demo": {"description": "Demo", "content": "new"}},
+        )
+        skill = tmp_path / "skills" / "demo" / "SKILL.md"
+        skill.parent.mkdir(parents=True)
+        skill.write_text("old")
+        return skill
+
+    def test_yes_overwrites_existing_skill(self, init_env):
+        run_init(yes=True)
+        assert init_env.read_text() == "new"
+        assert [p.name for p in init_env.parent.iterdir()] == ["SKILL.md"]
+
+    def test_declined_overwrite_keeps_existing_skill(self, init_env, mocker):
+        # Write config, install the skill, then decline the overwrite prompt
+        mocker.patch("builtins.input", side_effect=["", "", "n"])
+        run_init()
+        assert init_env.read_text() == "old"
+
+
+class TestLoadSkillTemplate:
+    def test_loads_bundled_template(self):
+        template = _load_skill_template("review-ticket")
+        assert template and "{ticket_prefix}" in template
+
+    def test_memoized(self):
+        assert _load_skill_template("review-ticket") is _load_skill_template("review-ticket")
+
+    def test_missing_template(self):
+        assert _load_skill_template("no-such-skill") is None
+
+
 class TestGatherProjectFiles:
     def test_detects_files(self, tmp_path, monkeypatch):
         (tmp_path / "pyproject.toml").write_text("[project]")
@@ -119,3 +269,100 @@ class TestGatherProjectFiles:
         monkeypatch.chdir(tmp_path)
         result = _gather_project_files()
         assert result == "none detected"
+
+    def test_keeps_candidate_order(self):
+        names = {"go.mod", "Makefile", "package.json", "unrelated.txt"}
+        assert _gather_project_files(names) == "package.json, go.mod, Makefile"
+
+
+class TestReadReadme:
+    def test_reads_listed_readme(self, tmp_path, monkeypatch):
+        (tmp_path / "readme.md").write_text("# Lower")
+        monkeypatch.chdir(tmp_path)
+        assert _read_readme(_project_entries()) == "# Lower"
+
+    def test_skips_unlisted_files(self, mocker):
+        read = mocker.patch("lisa.init._read_file")
+        assert _read_readme({"pyproject.toml"}) is None
+        read.assert_not_called()
+
+
+class TestDetectPrompt:
+    def test_renders_placeholders_and_literal_braces(self):
+        prompt = _DETECT_PROMPT.format(found_files="pyproject.toml", readme_section="")
+        assert "## Project files found\npyproject.toml\n" in prompt
+        assert '-k "{test}"' in prompt
+
+    def test_project_details_come_last(self):
+        a = _DETECT_PROMPT.format(found_files="go.mod", readme_section="\n\n## README.md")
+        b = _DETECT_PROMPT.format(found_files="package.json", readme_section="")
+        prefix = _DETECT_PROMPT.format(found_files="\0", readme_section="").split("\0")[0]
+        assert a.startswith(prefix) and b.startswith(prefix)
+        assert prefix.rstrip().endswith("## Project files found")
+        assert "## Rules" in prefix
+
+
+class TestClaudeDetectConfig:
+    def test_skips_claude_without_project_files(self, tmp_path, monkeypatch, mocker):
+        (tmp_path / "notes.txt").write_text("hi")
+        monkeypatch.chdir(tmp_path)
+        claude = mocker.patch("lisa.clients.claude.claude")
+        assert _claude_detect_config() is None
+        claude.assert_not_called()
+
+    def test_skip_does_not_load_client(self, tmp_path, modules_loaded_after_import):
+        then = f"import os; os.chdir({str(tmp_path)!r}); lisa.init._claude_detect_config()"
+        loaded = modules_loaded_after_import("lisa.init", ("lisa.clients.claude", "yaml"), then)
+        assert loaded == []
+
+    def test_returns_detected_config(self, tmp_path, monkeypatch, mocker):
+        (tmp_path / "pyproject.toml").write_text("[project]")
+        monkeypatch.chdir(tmp_path)
+        config = {"tests": [{"name": "Tests", "run": "pytest"}]}
+        claude = mocker.patch("lisa.clients.claude.claude", return_value=json.dumps(config))
+        assert _claude_detect_config() == config
+        assert "pyproject.toml" in claude.call_args[0][0]
+
+    def test_reuses_cached_config_for_unchanged_project(self, tmp_path, monkeypatch, mocker):
+        (tmp_path / "pyproject.toml").write_text("[project]")
+        monkeypatch.chdir(tmp_path)
+        config = {"tests": [{"name": "Tests", "run": "pytest"}]}
+        claude = mocker.patch("lisa.clients.claude.claude", return_value=json.dumps(config))
+        assert _claude_detect_config() == config
+        assert _claude_detect_config() == config
+        assert claude.call_count == 1
+
+    def test_project_change_invalidates_cache(self, tmp_path, monkeypatch, mocker):
+        (tmp_path / "pyproject.toml").write_text("[project]")
+        monkeypatch.chdir(tmp_path)
+        config = {"tests": [{"name": "Tests", "run": "pytest"}]}
+        claude = mocker.patch("lisa.clients.claude.claude", return_value=json.dumps(config))
+        _claude_detect_config()
+        (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'")
+        _claude_detect_config()
+        assert claude.call_count == 2
+
+    def test_nocache_env_forces_fresh_probe(self, tmp_path, monkeypatch, mocker):
+        (tmp_path / "pyproject.toml").write_text("[project]")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("LISA_INIT_NOCACHE", "1")
+        config = {"tests": [{"name": "Tests", "run": "pytest"}]}
+        claude = mocker.patch("lisa.clients.claude.claude", return_value=json.dumps(config))
+        _claude_detect_config()
+        _claude_detect_config()
+        assert claude.call_count == 2
+
+    def test_failed_detection_not_cached(self, tmp_path, monkeypatch, mocker):
+        (tmp_path / "pyproject.toml").write_text("[project]")
+        monkeypatch.chdir(tmp_path)
+        claude = mocker.patch("lisa.clients.claude.claude", return_value=json.dumps({"tests": []}))
+        assert _claude_detect_config() is None
+        assert _claude_detect_config() is None
+        assert claude.call_count == 2
+
+    @pytest.mark.parametrize("result", ['"plain text"', "[]", '{"tests": []}'])
+    def test_rejects_unusable_result(self, tmp_path, monkeypatch, mocker, result):
+        (tmp_path / "pyproject.toml").write_text("[project]")
+        monkeypatch.chdir(tmp_path)
+        mocker.patch("lisa.clients.claude.claude", return_value=result)
+        assert _claude_detect_config() is None
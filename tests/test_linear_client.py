@@ -1,16 +1,52 @@
 """Tests for lisa.clients.linear."""
 
 import json
-import urllib.error
 
+import pytest
+
+import lisa.clients.linear as linear_mod
 from lisa.clients.linear import (
     _get_auth_header,
     fetch_subtask_details,
+    fetch_subtask_details_many,
     fetch_ticket,
+    fetch_tickets,
     linear_api,
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_connection(monkeypatch):
+    monkeypatch.setattr(linear_mod, "_idle", [])
+    monkeypatch.setattr(linear_mod, "_query_hashes", {})
+    monkeypatch.setattr(linear_mod, "_apq_enabled", True)
+    monkeypatch.setattr(linear_mod, "_apq_confirmed", False)
+
+
+def _mock_connection(mocker, data=None, status=200, side_effect=None):
+    """Patch HTTPSConnection so GraphQL requests return `data` as JSON."""
+    conn = mocker.MagicMock()
+    resp = conn.getresponse.return_value
+    resp.status = status
+    resp.reason = "OK" if status < 400 else "Unauthorized"
+    resp.read.return_value = json.dumps(data or {}).encode()
+    if side_effect is not None:
+        conn.request.side_effect = side_effect
+    return mocker.patch("lisa.clients.linear.http.client.HTTPSConnection", return_value=conn)
+
+
+def _issue(identifier, uuid="uuid"):
+    return {
+        "id": uuid,
+        "identifier": identifier,
+        "title": f"Title {identifier}",
+        "description": "",
+        "url": "",
+        "project": {},
+        "children": {"nodes": []},
+    }
+
+
 class TestGetAuthHeader:
     def test_env_var_takes_priority(self, monkeypatch, mocker):
         monkeypatch.setenv("LINEAR_API_KEY", "lin_api_key_123")
@@ -36,41 +72,202 @@ class TestLinearApi:
 
     def test_success(self, monkeypatch, mocker):
         monkeypatch.setenv("LINEAR_API_KEY", "key")
-        response_data = {"data": {"issue": {"id": "123"}}}
-        mock_resp = mocker.MagicMock()
-        mock_resp.read.return_value = json.dumps(response_data).encode()
-        mock_resp.__enter__ = mocker.MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = mocker.MagicMock(return_value=False)
-        mocker.patch("lisa.clients.linear.urllib.request.urlopen", return_value=mock_resp)
+        conn_cls = _mock_connection(mocker, {"data": {"issue": {"id": "123"}}})
         result = linear_api("query {}")
         assert result == {"issue": {"id": "123"}}
+        method, path = conn_cls.return_value.request.call_args[0]
+        assert (method, path) == ("POST", "/graphql")
+
+    def test_gzip_response_decoded(self, monkeypatch, mocker):
+        import gzip
+
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        conn_cls = _mock_connection(mocker)
+        resp = conn_cls.return_value.getresponse.return_value
+        resp.read.return_value = gzip.compress(b'{"data": {"ok": true}}')
+        resp.getheader.side_effect = lambda name, default=None: (
+            "gzip" if name == "Content-Encoding" else default
+        )
+        assert linear_api("query {}") == {"ok": True}
+        headers = conn_cls.return_value.request.call_args.kwargs["headers"]
+        assert headers["Accept-Encoding"] == "gzip"
+
+    def test_corrupt_gzip_is_an_error(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        conn_cls = _mock_connection(mocker)
+        resp = conn_cls.return_value.getresponse.return_value
+        resp.read.return_value = b"not gzip"
+        resp.getheader.return_value = "gzip"
+        assert linear_api("query {}") is None
 
     def test_graphql_error(self, monkeypatch, mocker):
         monkeypatch.setenv("LINEAR_API_KEY", "key")
-        response_data = {"errors": [{"message": "bad"}]}
-        mock_resp = mocker.MagicMock()
-        mock_resp.read.return_value = json.dumps(response_data).encode()
-        mock_resp.__enter__ = mocker.MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = mocker.MagicMock(return_value=False)
-        mocker.patch("lisa.clients.linear.urllib.request.urlopen", return_value=mock_resp)
+        _mock_connection(mocker, {"errors": [{"message": "bad"}]})
         assert linear_api("query {}") is None
 
     def test_http_error(self, monkeypatch, mocker):
         monkeypatch.setenv("LINEAR_API_KEY", "key")
-        mocker.patch(
-            "lisa.clients.linear.urllib.request.urlopen",
-            side_effect=urllib.error.HTTPError(None, 401, "Unauthorized", {}, None),
-        )
+        _mock_connection(mocker, {}, status=401)
         assert linear_api("query {}") is None
 
-    def test_url_error(self, monkeypatch, mocker):
+    def test_connection_error(self, monkeypatch, mocker):
         monkeypatch.setenv("LINEAR_API_KEY", "key")
-        mocker.patch(
-            "lisa.clients.linear.urllib.request.urlopen",
-            side_effect=urllib.error.URLError("timeout"),
-        )
+        _mock_connection(mocker, side_effect=TimeoutError("timeout"))
         assert linear_api("query {}") is None
 
+    def test_reuses_connection(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        conn_cls = _mock_connection(mocker, {"data": {}})
+        linear_api("query {}")
+        linear_api("query {}")
+        assert conn_cls.call_count == 1
+        assert conn_cls.return_value.request.call_count == 2
+
+    def test_reconnects_on_stale_connection(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        stale = mocker.MagicMock()
+        stale.request.side_effect = ConnectionResetError("reset")
+        linear_mod._idle.append(stale)
+        conn_cls = _mock_connection(mocker, {"data": {"ok": True}})
+        assert linear_api("query {}") == {"ok": True}
+        stale.close.assert_called_once()
+        assert conn_cls.call_count == 1
+
+    def test_timeout_on_reused_connection_not_replayed(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        stale = mocker.MagicMock()
+        stale.getresponse.side_effect = TimeoutError("timed out")
+        linear_mod._idle.append(stale)
+        conn_cls = _mock_connection(mocker, {"data": {"ok": True}})
+        assert linear_api("mutation { a }") is None
+        stale.request.assert_called_once()
+        stale.close.assert_called_once()
+        conn_cls.assert_not_called()
+
+    def test_concurrent_calls_use_separate_connections(self, monkeypatch, mocker):
+        import threading
+
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        barrier = threading.Barrier(2, timeout=5)
+        conns = []
+
+        def make_conn(*args, **kwargs):
+            conn = mocker.MagicMock()
+            conn.request.side_effect = lambda *a, **kw: barrier.wait()
+            resp = conn.getresponse.return_value
+            resp.status, resp.reason = 200, "OK"
+            resp.read.return_value = b'{"data": {}}'
+            conns.append(conn)
+            return conn
+
+        mocker.patch("lisa.clients.linear.http.client.HTTPSConnection", side_effect=make_conn)
+        threads = [threading.Thread(target=linear_api, args=("query {}",)) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(conns) == 2
+        assert len(linear_mod._idle) == 2
+
+    def test_close_connection(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        conn_cls = _mock_connection(mocker, {"data": {}})
+        linear_api("query {}")
+        linear_mod._close_connection()
+        conn_cls.return_value.close.assert_called_once()
+        assert linear_mod._idle == []
+
+
+def _sent_bodies(conn_cls):
+    return [json.loads(c.kwargs["body"]) for c in conn_cls.return_value.request.call_args_list]
+
+
+class TestPersistedQueries:
+    def test_repeat_query_sends_hash_only(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        conn_cls = _mock_connection(mocker, {"data": {"ok": True}})
+        assert linear_api("query { a }") == {"ok": True}
+        assert linear_api("query { a }") == {"ok": True}
+        first, second = _sent_bodies(conn_cls)
+        assert first["query"] == "query { a }"
+        assert "query" not in second
+        digest = second["extensions"]["persistedQuery"]["sha256Hash"]
+        assert digest == first["extensions"]["persistedQuery"]["sha256Hash"]
+
+    def test_evicted_hash_resends_text(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        conn_cls = _mock_connection(mocker)
+        resp = conn_cls.return_value.getresponse.return_value
+        linear_mod._query_hashes["query { a }"] = "abc"
+        not_found = {"errors": [{"message": "PersistedQueryNotFound"}]}
+        resp.read.side_effect = [json.dumps(not_found).encode(), b'{"data": {"ok": true}}']
+        assert linear_api("query { a }") == {"ok": True}
+        bodies = _sent_bodies(conn_cls)
+        assert "query" not in bodies[0]
+        assert bodies[1]["query"] == "query { a }"
+
+    def test_unsupported_disables_apq(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        conn_cls = _mock_connection(mocker)
+        resp = conn_cls.return_value.getresponse.return_value
+        unsupported = {"errors": [{"extensions": {"code": "PERSISTED_QUERY_NOT_SUPPORTED"}}]}
+        resp.read.side_effect = [json.dumps(unsupported).encode(), b'{"data": {"ok": true}}']
+        assert linear_api("query { a }") == {"ok": True}
+        assert "extensions" not in _sent_bodies(conn_cls)[1]
+        assert linear_mod._apq_enabled is False
+        assert linear_mod._query_hashes == {}
+
+    def test_hash_only_http_error_falls_back_to_text(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        conn_cls = _mock_connection(mocker)
+        resp = conn_cls.return_value.getresponse.return_value
+        ok = b'{"data": {"ok": true}}'
+        statuses = iter([200, 400, 200, 200])
+
+        def read():
+            resp.status = next(statuses)
+            return ok if resp.status == 200 else b'{"errors": [{"message": "bad"}]}'
+
+        resp.read.side_effect = read
+        assert linear_api("query { a }") == {"ok": True}
+        assert linear_api("query { a }") == {"ok": True}
+        assert linear_api("query { a }") == {"ok": True}
+        bodies = _sent_bodies(conn_cls)
+        assert "query" not in bodies[1]
+        assert bodies[2]["query"] == bodies[3]["query"] == "query { a }"
+        assert "extensions" not in bodies[3]
+        assert linear_mod._apq_enabled is False
+
+    def test_hash_only_mutation_error_not_resent(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        conn_cls = _mock_connection(mocker)
+        resp = conn_cls.return_value.getresponse.return_value
+        mutation = "mutation { commentCreate }"
+        linear_mod._query_hashes[mutation] = "abc"
+        failed = {"errors": [{"message": "Argument validation error"}]}
+        resp.read.return_value = json.dumps(failed).encode()
+        assert linear_api(mutation) is None
+        assert len(_sent_bodies(conn_cls)) == 1
+        assert linear_mod._apq_enabled is True
+
+    def test_confirmed_apq_kept_on_http_error(self, monkeypatch, mocker):
+        monkeypatch.setenv("LINEAR_API_KEY", "key")
+        conn_cls = _mock_connection(mocker)
+        resp = conn_cls.return_value.getresponse.return_value
+        statuses = iter([200, 200, 400, 200])
+
+        def read():
+            resp.status = next(statuses)
+            return b'{"data": {}}' if resp.status == 200 else b"{}"
+
+        resp.read.side_effect = read
+        assert linear_api("query { a }") == {}
+        assert linear_api("query { a }") == {}
+        assert linear_mod._apq_confirmed is True
+        assert linear_api("query { a }") == {}
+        assert _sent_bodies(conn_cls)[3]["query"] == "query { a }"
+        assert linear_mod._apq_enabled is True
+
 
 class TestFetchTicket:
     def test_success(self, mocker):
@@ -112,6 +309,28 @@ class TestFetchTicket:
         mocker.patch("lisa.clients.linear.linear_api", return_value=None)
         assert fetch_ticket("NOPE") is None
 
+    def test_light_selection(self, mocker):
+        api = mocker.patch(
+            "lisa.clients.linear.linear_api",
+            return_value={
+                "issue": {
+                    "identifier": "ENG-123",
+                    "title": "Fix",
+                    "description": "Details",
+                    "children": {
+                        "nodes": [{"identifier": "ENG-124", "title": "Sub", "inverseRelations": {}}]
+                    },
+                }
+            },
+        )
+        result = fetch_ticket("ENG-123", light=True)
+        query = api.call_args[0][0]
+        assert "url" not in query
+        assert "state" not in query
+        assert result["uuid"] == ""
+        assert result["description"] == "Details"
+        assert result["subtasks"][0]["state"] == "Unknown"
+
     def test_no_subtasks(self, mocker):
         mocker.patch(
             "lisa.clients.linear.linear_api",
@@ -131,6 +350,59 @@ class TestFetchTicket:
         assert result["subtasks"] == []
 
 
+class TestFetchTickets:
+    def test_single_request_with_aliases(self, mocker):
+        api = mocker.patch(
+            "lisa.clients.linear.linear_api",
+            return_value={"t0": _issue("ENG-1", "u1"), "t1": _issue("ENG-2", "u2")},
+        )
+        result = fetch_tickets(["ENG-1", "ENG-2"])
+        assert api.call_count == 1
+        query, variables = api.call_args[0]
+        assert "t0: issue(id: $id0)" in query
+        assert "t1: issue(id: $id1)" in query
+        assert variables == {"id0": "ENG-1", "id1": "ENG-2"}
+        assert result["ENG-1"]["uuid"] == "u1"
+        assert result["ENG-2"]["uuid"] == "u2"
+
+    def test_missing_alias_is_none(self, mocker):
+        mocker.patch(
+            "lisa.clients.linear.linear_api",
+            return_value={"t0": _issue("ENG-1"), "t1": None},
+        )
+        result = fetch_tickets(["ENG-1", "ENG-2"])
+        assert result["ENG-1"]["id"] == "ENG-1"
+        assert result["ENG-2"] is None
+
+    def test_batch_failure_falls_back_per_ticket(self, mocker):
+        def api(query, variables):
+            # Batched query fails; per-ticket fallbacks run concurrently in any order
+            if variables == {"id": "ENG-1"}:
+                return {"issue": _issue("ENG-1")}
+            return None
+
+        mocker.patch("lisa.clients.linear.linear_api", side_effect=api)
+        result = fetch_tickets(["ENG-1", "NOPE"])
+        assert result["ENG-1"]["id"] == "ENG-1"
+        assert result["NOPE"] is None
+
+    def test_light_batch(self, mocker):
+        api = mocker.patch(
+            "lisa.clients.linear.linear_api",
+            return_value={"t0": _issue("ENG-1"), "t1": _issue("ENG-2")},
+        )
+        fetch_tickets(["ENG-1", "ENG-2"], light=True)
+        assert "project" not in api.call_args[0][0]
+
+    def test_single_ticket_uses_plain_query(self, mocker):
+        api = mocker.patch(
+            "lisa.clients.linear.linear_api", return_value={"issue": _issue("ENG-1")}
+        )
+        result = fetch_tickets(["ENG-1"])
+        assert api.call_args[0][1] == {"id": "ENG-1"}
+        assert result["ENG-1"]["id"] == "ENG-1"
+
+
 class TestFetchSubtaskDetails:
     def test_success(self, mocker):
         mocker.patch(
@@ -150,3 +422,40 @@ class TestFetchSubtaskDetails:
     def test_not_found(self, mocker):
         mocker.patch("lisa.clients.linear.linear_api", return_value=None)
         assert fetch_subtask_details("NOPE") is None
+
+
+class TestFetchSubtaskDetailsMany:
+    def test_single_request_with_aliases(self, mocker):
+        api = mocker.patch(
+            "lisa.clients.linear.linear_api",
+            return_value={
+                "s0": {"identifier": "ENG-2", "title": "Two", "description": "d"},
+                "s1": None,
+            },
+        )
+        result = fetch_subtask_details_many(["ENG-2", "ENG-3"])
+        assert api.call_count == 1
+        query, variables = api.call_args[0]
+        assert "s1: issue(id: $id1)" in query
+        assert variables == {"id0": "ENG-2", "id1": "ENG-3"}
+        assert result["ENG-2"]["title"] == "Two"
+        assert result["ENG-3"] is None
+
+    def test_chunks_large_batches(self, mocker):
+        api = mocker.patch("lisa.clients.linear.linear_api", return_value={})
+        ids = [f"ENG-{i}" for i in range(30)]
+        result = fetch_subtask_details_many(ids)
+        assert api.call_count == 2
+        assert len(api.call_args_list[0][0][1]) == 25
+        assert set(result) == set(ids)
+
+    def test_batch_failure_falls_back_per_subtask(self, mocker):
+        def api(query, variables):
+            if variables == {"id": "ENG-2"}:
+                return {"issue": {"identifier": "ENG-2", "title": "Two"}}
+            return None
+
+        mocker.patch("lisa.clients.linear.linear_api", side_effect=api)
+        result = fetch_subtask_details_many(["ENG-2", "NOPE"])
+        assert result["ENG-2"]["description"] == ""
+        assert result["NOPE"] is None
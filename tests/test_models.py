@@ -110,6 +110,18 @@ class TestTokenUsage:
         assert c.output_tokens == 150
         assert c.cost_usd == pytest.approx(0.03)
 
+    def test_iadd_mutates_in_place(self):
+        a = TokenUsage(input_tokens=100, cache_read_tokens=5, cost_usd=0.01)
+        original = a
+        a += TokenUsage(input_tokens=1, cache_read_tokens=2, cost_usd=0.02)
+        assert a is original
+        assert a.input_tokens == 101
+        assert a.cache_read_tokens == 7
+        assert a.cost_usd == pytest.approx(0.03)
+
+    def test_slots(self):
+        assert not hasattr(TokenUsage(), "__dict__")
+
     def test_identity_add(self):
         a = TokenUsage(input_tokens=100, output_tokens=50)
         b = TokenUsage()
@@ -46,3 +46,26 @@ class TestTokenTracker:
         tt.add(TokenUsage(cost_usd=0.01))
         tt.add(TokenUsage(cost_usd=0.02))
         assert tt.total.cost_usd == pytest.approx(0.03)
+
+    def test_concurrent_adds_not_lost(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        tt = TokenTracker()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: tt.add(TokenUsage(input_tokens=1)), range(2000)))
+        assert tt.total.input_tokens == 2000
+
+    def test_add_is_deferred_until_read(self):
+        tt = TokenTracker()
+        tt.add(TokenUsage(input_tokens=1))
+        tt.add(TokenUsage(input_tokens=2))
+        assert len(tt._pending) == 2
+        assert tt.total.input_tokens == 3
+        assert not tt._pending
+
+    def test_reset_iteration_flushes_pending_into_total(self):
+        tt = TokenTracker()
+        tt.add(TokenUsage(output_tokens=5))
+        tt.reset_iteration()
+        assert tt.iteration.total == 0
+        assert tt.total.output_tokens == 5
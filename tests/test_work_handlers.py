@@ -126,6 +126,50 @@ class TestHandleExecuteWork:
         prompt = mock_wc.call_args[0][0]
         assert "AssertionError" in prompt
 
+    def test_prefetches_subtasks_for_all_steps(self, mocker):
+        mocker.patch(
+            "lisa.phases.work.get_prompts",
+            return_value={
+                "work": {
+                    "template": "{ticket_id}{title}{description}{exploration_context}"
+                    "{files_context}{subtask_context}{prior_context}{iteration_context}"
+                    "{plan_checklist}{current_step}{step_desc}"
+                },
+            },
+        )
+        mocker.patch("lisa.phases.work.get_schemas", return_value={"work": {}})
+        mocker.patch("lisa.phases.work.get_changed_files", return_value=[])
+        mocker.patch("lisa.phases.work.fetch_git_state", return_value={})
+        mock_wc = mocker.patch(
+            "lisa.phases.work.work_claude",
+            return_value=json.dumps({"step_done": None, "assumptions": []}),
+        )
+        mocker.patch("lisa.phases.work.LiveTimer")
+        fetch = mocker.patch(
+            "lisa.phases.work.fetch_subtask_details_many",
+            return_value={
+                "ENG-2": {"id": "ENG-2", "title": "Sub two", "description": "d2"},
+                "ENG-3": {"id": "ENG-3", "title": "Sub three", "description": "d3"},
+            },
+        )
+
+        ctx = _make_ctx(
+            plan_steps=[
+                {"id": 1, "description": "Step one", "done": False, "ticket": "ENG-2"},
+                {"id": 2, "description": "Step two", "done": False, "ticket": "ENG-3"},
+                {"id": 3, "description": "Step three", "done": False, "ticket": "ENG-1"},
+            ],
+            commit_ticket="ENG-2",
+        )
+        handle_execute_work(ctx)
+        fetch.assert_called_once_with(["ENG-2", "ENG-3"])
+        assert "Sub two" in mock_wc.call_args[0][0]
+
+        ctx.commit_ticket = "ENG-3"
+        handle_execute_work(ctx)
+        assert fetch.call_count == 1
+        assert "Sub three" in mock_wc.call_args[0][0]
+
 
 class TestHandleVerifyStep:
     def test_skip_verify(self, mocker):
@@ -1,33 +1,71 @@
 """Tests for lisa.git.worktree."""
 
+import os
+import stat
 import subprocess
 
-from lisa.git.worktree import create_session_worktree, remove_worktree
+import pytest
+
+from lisa.git.worktree import (
+    _force_remove,
+    _rmtree,
+    create_session_worktree,
+    remove_worktree,
+)
 
 
 class TestCreateSessionWorktree:
     def test_creates_worktree(self, mocker):
         mocker.patch("lisa.git.worktree.os.path.exists", return_value=False)
-        mocker.patch(
-            "lisa.git.worktree.subprocess.run",
+        run = mocker.patch(
+            "lisa.git.process.subprocess.run",
             return_value=subprocess.CompletedProcess([], 0, stdout="", stderr=""),
         )
         result = create_session_worktree("test-session")
         assert result == "/tmp/lisa/test-session"
+        assert run.call_args[0][0] == [
+            "git",
+            "worktree",
+            "add",
+            "--detach",
+            "/tmp/lisa/test-session",
+            "HEAD",
+        ]
+
+    def test_stale_worktree_moved_aside(self, mocker):
+        mocker.patch("lisa.git.worktree.os.path.exists", return_value=True)
+        replace = mocker.patch("lisa.git.worktree.os.replace")
+        thread = mocker.patch("lisa.git.worktree.threading.Thread")
+        remove = mocker.patch("lisa.git.worktree.remove_worktree")
+        run = mocker.patch(
+            "lisa.git.process.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="", stderr=""),
+        )
+        assert create_session_worktree("test-session") == "/tmp/lisa/test-session"
+        stale = replace.call_args[0][1]
+        assert stale.startswith("/tmp/lisa/test-session.stale-")
+        assert thread.call_args.kwargs["args"] == (stale,)
+        thread.return_value.start.assert_called_once()
+        remove.assert_not_called()
+        assert "--force" in run.call_args[0][0]
 
-    def test_removes_stale_worktree(self, mocker):
+    def test_removes_stale_worktree_when_rename_fails(self, mocker):
         mocker.patch("lisa.git.worktree.os.path.exists", side_effect=[True, False])
+        mocker.patch("lisa.git.worktree.os.replace", side_effect=OSError("busy"))
+        thread = mocker.patch("lisa.git.worktree.threading.Thread")
         mock_remove = mocker.patch("lisa.git.worktree.remove_worktree", return_value=True)
         mocker.patch(
-            "lisa.git.worktree.subprocess.run",
+            "lisa.git.process.subprocess.run",
             return_value=subprocess.CompletedProcess([], 0, stdout="", stderr=""),
         )
         result = create_session_worktree("test-session")
         assert result is not None
         mock_remove.assert_called_once()
+        thread.assert_not_called()
 
     def test_stale_cleanup_fails(self, mocker):
         mocker.patch("lisa.git.worktree.os.path.exists", return_value=True)
+        mocker.patch("lisa.git.worktree.os.replace", side_effect=OSError("busy"))
         mocker.patch("lisa.git.worktree.remove_worktree", return_value=False)
         result = create_session_worktree("test-session")
         assert result is None
@@ -35,7 +73,7 @@ class TestCreateSessionWorktree:
     def test_git_worktree_add_fails(self, mocker):
         mocker.patch("lisa.git.worktree.os.path.exists", return_value=False)
         mocker.patch(
-            "lisa.git.worktree.subprocess.run",
+            "lisa.git.process.subprocess.run",
             return_value=subprocess.CompletedProcess([], 1, stdout="", stderr="error"),
         )
         result = create_session_worktree("test-session")
@@ -46,12 +84,14 @@ class TestRemoveWorktree:
     def test_safety_check_empty(self):
         assert remove_worktree("") is False
 
-    def test_safety_check_wrong_prefix(self):
+    def test_safety_check_wrong_prefix(self, mocker):
+        run = mocker.patch("lisa.git.process.subprocess.run")
         assert remove_worktree("/home/user/repo") is False
+        run.assert_not_called()
 
     def test_git_remove_succeeds(self, mocker):
         mocker.patch(
-            "lisa.git.worktree.subprocess.run",
+            "lisa.git.process.subprocess.run",
             return_value=subprocess.CompletedProcess([], 0, stdout="", stderr=""),
         )
         assert remove_worktree("/tmp/lisa/session-123") is True
@@ -59,24 +99,88 @@ class TestRemoveWorktree:
     def test_fallback_rmtree(self, mocker):
         # git worktree remove fails, but rmtree + metadata cleanup succeeds
         mocker.patch(
-            "lisa.git.worktree.subprocess.run",
+            "lisa.git.process.subprocess.run",
             side_effect=[
                 subprocess.CompletedProcess([], 1, stdout="", stderr="lock"),  # remove fails
                 subprocess.CompletedProcess([], 0, stdout="/repo", stderr=""),  # rev-parse
             ],
         )
-        mocker.patch("lisa.git.worktree.os.path.exists", side_effect=[True, True])
+        rmtree = mocker.patch("lisa.git.worktree.shutil.rmtree")
+        assert remove_worktree("/tmp/lisa/session-123") is True
+        rmtree.assert_called_with("/repo/.git/worktrees/session-123", ignore_errors=True)
+
+    def test_fallback_directory_already_gone(self, mocker):
+        mocker.patch(
+            "lisa.git.process.subprocess.run",
+            side_effect=[
+                subprocess.CompletedProcess([], 1, stdout="", stderr="not a worktree"),
+                subprocess.CompletedProcess([], 0, stdout="/repo", stderr=""),
+            ],
+        )
+        mocker.patch("lisa.git.worktree._rmtree", side_effect=FileNotFoundError)
         mocker.patch("lisa.git.worktree.shutil.rmtree")
         assert remove_worktree("/tmp/lisa/session-123") is True
 
     def test_fallback_rmtree_oserror(self, mocker):
         mocker.patch(
-            "lisa.git.worktree.subprocess.run",
+            "lisa.git.process.subprocess.run",
             side_effect=[
                 subprocess.CompletedProcess([], 1, stdout="", stderr="err"),
                 subprocess.CompletedProcess([], 0, stdout="/repo", stderr=""),
             ],
         )
-        mocker.patch("lisa.git.worktree.os.path.exists", side_effect=[True, False])
-        mocker.patch("lisa.git.worktree.shutil.rmtree", side_effect=OSError("perm denied"))
+        mocker.patch("lisa.git.worktree._rmtree", side_effect=OSError("perm denied"))
+        rmtree = mocker.patch("lisa.git.worktree.shutil.rmtree")
         assert remove_worktree("/tmp/lisa/session-123") is False
+        rmtree.assert_called_once()
+
+
+class TestRmtree:
+    def test_removes_read_only_tree(self, tmp_path):
+        root = tmp_path / "wt"
+        (root / "sub").mkdir(parents=True)
+        (root / "sub" / "f.txt").write_text("x")
+        os.chmod(root / "sub" / "f.txt", stat.S_IRUSR)
+        os.chmod(root / "sub", stat.S_IRUSR | stat.S_IXUSR)
+        _rmtree(str(root))
+        assert not root.exists()
+
+    def test_delete_retried_after_parent_made_writable(self, tmp_path):
+        root = tmp_path / "wt"
+        (root / "sub").mkdir(parents=True)
+        f = root / "sub" / "f.txt"
+        f.write_text("x")
+        os.chmod(root / "sub", stat.S_IRUSR | stat.S_IXUSR)
+        _force_remove(str(root), os.unlink, str(f), PermissionError())
+        assert not f.exists()
+        assert os.stat(root / "sub").st_mode & stat.S_IWUSR
+
+    def test_never_chmods_outside_root(self, tmp_path):
+        root = tmp_path / "wt"
+        root.mkdir()
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IXUSR)
+        try:
+            with pytest.raises(PermissionError):
+                _force_remove(str(root), os.rmdir, str(root), PermissionError())
+            assert not os.stat(tmp_path).st_mode & stat.S_IWUSR
+        finally:
+            os.chmod(tmp_path, stat.S_IRWXU)
+
+    def test_open_failure_not_replayed(self, tmp_path, mocker):
+        root = tmp_path / "wt"
+        root.mkdir()
+        f = root / "f.txt"
+        f.write_text("x")
+        func = mocker.MagicMock()
+        with pytest.raises(PermissionError):
+            _force_remove(str(root), func, str(f), PermissionError())
+        func.assert_not_called()
+
+    def test_unlistable_dir_removed_with_fresh_rmtree(self, tmp_path, mocker):
+        root = tmp_path / "wt"
+        (root / "sub").mkdir(parents=True)
+        rmtree = mocker.patch("lisa.git.worktree._rmtree_under")
+        _force_remove(str(root), os.open, str(root / "sub"), PermissionError())
+        rmtree.assert_called_once_with(str(root), str(root / "sub"), retry_listing=False)
+        with pytest.raises(PermissionError):
+            _force_remove(str(root), os.open, str(root / "sub"), PermissionError(), False)